@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Any, Dict, List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 _API_DIR = Path(__file__).resolve().parent.parent
 _ENV_FILE = _API_DIR / ".env"
@@ -18,9 +19,41 @@ class Settings(BaseSettings):
     ollama_model: str = "llama3:8b"
     # Context window (tokens). Long Ukrainian prompt + CV + job needs headroom for structured output.
     ollama_num_ctx: int = 24576
+    # Smaller context tiers (tokens): each call uses the smallest tier that fits the estimated prompt + output,
+    # so short CVs reserve less KV cache. ollama_num_ctx is the ceiling. Empty list = always ollama_num_ctx.
+    ollama_num_ctx_tiers: List[int] = [4096, 8192, 16384]
+    # Prompt token estimate: characters per token (Cyrillic is denser than English) and reserved output tokens.
+    ollama_chars_per_token: float = 2.5
+    ollama_output_tokens: int = 3072
+    # Stream structured extraction and parse JSON incrementally; empty/malformed output aborts early to the raw-JSON fallback.
+    ollama_stream_extraction: bool = True
+    # Race the structured call against the raw-JSON fallback instead of running them one after another:
+    # off, auto = only for model tags known to return empty structured output, or always. Both racing
+    # calls share one admission slot but still run two generations on the backend. Compare
+    # cv_extraction_path_total by model to decide, and list tags to exclude in the skip list.
+    ollama_speculative_fallback: str = "off"
+    ollama_speculative_skip_models: List[str] = []
+
+    # Latency-aware routing (llm_router.py). JSON list of routes, e.g.
+    # [{"name": "small", "backend": "ollama", "model": "llama3.2:3b", "max_prompt_chars": 12000},
+    #  {"name": "large", "backend": "ollama", "model": "llama3.1:8b", "base_url": "http://gpu-host:11434"}].
+    # Empty = choose the backend by ENVIRONMENT as before.
+    llm_routes: List[Dict[str, Any]] = []
+    llm_route_window: int = 50
+    # Stats below this many samples are not trusted for health or hedging.
+    llm_route_min_samples: int = 10
+    # Routes failing more often than this are tried last.
+    llm_route_max_error_rate: float = 0.5
+    # Start a second route when the primary runs past its rolling p95; the first usable result wins.
+    llm_hedge_enabled: bool = False
 
     # Max CV characters sent to the LLM (rest is truncated). 0 = no truncation (full CV sent; needs larger context).
     max_cv_chars_for_llm: int = 0
+    # Map-reduce extraction: CVs longer than this (chars) are split at section/paragraph boundaries into
+    # overlapping chunks extracted concurrently with a small context, then merged. 0 = disabled.
+    llm_chunk_threshold_chars: int = 0
+    llm_chunk_chars: int = 6000
+    llm_chunk_overlap_chars: int = 500
 
     max_upload_size_mb: int = 10
 
@@ -32,15 +65,125 @@ class Settings(BaseSettings):
     explainer_top_features: int = 6
     explainer_shap_samples: int = 32
     explainer_lime_samples: int = 32
+    # Dictionary skill matcher (utils/skill_matcher.py): fills skills when the LLM returns none and gives
+    # ranking skills without an LLM call. Optional JSON {"Skill": ["alias", ...]} extends the built-in taxonomy.
+    use_skill_matcher: bool = True
+    skill_taxonomy_path: str = ""
+    # Requirement coverage (requirement_coverage.py): each job requirement line vs each CV skill/experience
+    # line in one embedding batch. Cosine thresholds for covered / partial; also fills matched/missing
+    # competencies when the LLM left both empty.
+    use_requirement_coverage: bool = True
+    coverage_match_threshold: float = 0.6
+    coverage_partial_threshold: float = 0.45
+    coverage_max_requirements: int = 40
+    coverage_max_cv_lines: int = 80
     # Second LLM call after embedding scores: plain-language interpretation for the user.
     use_llm_semantic_narrative: bool = True
     # Weights for embedding cosine components (normalized to sum 1.0 before scoring). See semantic_matcher.py.
     semantic_weights_skills: float = 0.5
     semantic_weights_experience: float = 0.3
     semantic_weights_overall: float = 0.2
+    # sentence_transformers (PyTorch), onnx (ONNX Runtime, see onnx_embedder.py), openai, or sidecar
+    # (shared embedding process, see embedding_sidecar.py).
     embedding_provider: str = "sentence_transformers"
+    # embedding_provider=openai: any OpenAI-compatible POST /embeddings endpoint. Inputs are packed into batches,
+    # sent concurrently, retried with jittered backoff on 429/5xx; in-flight tokens are capped (remote_embedder.py).
+    openai_base_url: str = "https://api.openai.com/v1"
+    openai_embedding_model: str = "text-embedding-3-small"
+    remote_embedding_batch_inputs: int = 256
+    remote_embedding_batch_tokens: int = 100_000
+    remote_embedding_concurrency: int = 4
+    remote_embedding_max_retries: int = 5
+    remote_embedding_backoff_s: float = 0.5
+    remote_embedding_max_inflight_tokens: int = 200_000
+    remote_embedding_timeout_s: float = 30.0
+    # embedding_provider=onnx: directory from `python -m app.services.onnx_embedder --out DIR`;
+    # int8 dynamic quantization by default (False = float32). Threads: 0 = onnxruntime default.
+    onnx_model_dir: str = "models/minilm-onnx"
+    onnx_quantized: bool = True
+    onnx_threads: int = 0
+    # Long blocks are split by the encoder's tokenizer into overlapping windows, embedded in one batch
+    # and pooled, instead of being cut at the model's input length. 0 = the model's max length, -1 = off.
+    embedding_window_tokens: int = 0
+    embedding_window_overlap_tokens: int = 16
+    # Upper bound on windows per block (keeps cost bounded for very long CVs).
+    embedding_max_windows: int = 32
+    # Window pooling: mean, max, or attention (CV windows weighted by similarity to the job vector).
+    embedding_pooling: str = "mean"
+    embedding_attention_temperature: float = 0.05
+    # Cross-request micro-batching: an idle encoder runs a request at once; requests that arrive while it
+    # is busy are pooled into the next call, for up to this many ms after the first (or until
+    # embedding_batch_max_texts). 0 = off.
+    embedding_batch_wait_ms: float = 5.0
+    embedding_batch_max_texts: int = 64
+    # embedding_provider=sidecar: Unix socket of `python -m app.services.embedding_sidecar`. The sidecar (and
+    # the in-process fallback used while it is down) load embedding_sidecar_backend.
+    embedding_sidecar_socket: str = "/tmp/cv-analyzer-embed.sock"
+    embedding_sidecar_backend: str = "sentence_transformers"
+    embedding_sidecar_timeout_s: float = 30.0
+    # After a failed call, encode in-process for this long before trying the socket again.
+    embedding_sidecar_retry_s: float = 10.0
     pdf_font_path: str = ""
 
+    # Background analysis jobs (POST /analyses). Backend: memory (single process) or sqlite (shared file).
+    analysis_queue_backend: str = "memory"
+    analysis_queue_sqlite_path: str = "analysis_jobs.sqlite3"
+    analysis_queue_workers: int = 2
+    # Pending jobs beyond this are rejected with 429 instead of growing the backlog.
+    analysis_queue_max_pending: int = 100
+    analysis_queue_poll_interval_s: float = 1.0
+    analysis_queue_result_ttl_s: float = 3600.0
+    # Workers renew a running job's lease every third of this; a sqlite job not renewed for this long
+    # belongs to a crashed or killed process and is queued again on the next claim.
+    analysis_queue_lease_s: float = 120.0
+
+    # Admission control: concurrent calls per stage (0 = unlimited). Excess calls wait in a bounded
+    # queue; a full queue or a wait longer than the timeout is answered with 429 + Retry-After.
+    admission_ollama_concurrency: int = 2
+    admission_gemini_concurrency: int = 8
+    admission_embeddings_concurrency: int = 4
+    admission_explainer_concurrency: int = 2
+    admission_max_waiting: int = 16
+    admission_wait_timeout_s: float = 30.0
+
+    # POST /rank: max CVs per request and upper bound for the LLM-enriched shortlist (top_k).
+    rank_max_cvs: int = 200
+    rank_max_top_k: int = 10
+    # POST /match-jobs: max vacancies scored against one CV per request.
+    match_jobs_max_jobs: int = 100
+
+    # Candidate vector index (POST /candidates/search). Completed background analyses are indexed when enabled.
+    candidate_index_enabled: bool = False
+    candidate_index_path: str = "candidate_index.npz"
+    # Inserts and deletes are appended to <path>.log; the npz snapshot is rewritten once the log holds
+    # this many records (or a quarter of the index, whichever is larger).
+    candidate_index_compact_ops: int = 1000
+    # IVF partitions for mode=ivf (0 = sqrt(number of candidates)) and how many are scanned per query.
+    candidate_index_ivf_lists: int = 0
+    candidate_index_ivf_probe: int = 4
+
+    # Event-loop lag monitor (cv_event_loop_lag_seconds). A callback holding the loop longer than the
+    # threshold is logged with a stack sample of the loop thread.
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_ms: float = 100.0
+    loop_block_threshold_ms: float = 250.0
+    # Import SHAP / LIME / LLM client libraries at startup instead of inside the first request.
+    preload_optional_modules: bool = True
+
+    # Admin endpoints (/api/v1/admin/*) require this value in the X-Admin-Token header; empty = disabled.
+    admin_token: str = ""
+    # Per-stage memory accounting (RSS and tracemalloc deltas / peak), read at GET /api/v1/admin/memory.
+    # tracemalloc slows allocations noticeably, so keep it off outside investigations.
+    memory_profiling: bool = False
+    memory_trace_frames: int = 1
+    memory_recent_requests: int = 50
+    # On-demand profiling of /analyze (admin token + ?profile=sample|cprofile or X-Profile header).
+    # Profiles are kept in profile_dir (oldest beyond profile_max_stored deleted).
+    profile_dir: str = "profiles"
+    profile_max_stored: int = 50
+    profile_max_concurrent: int = 1
+    profile_sample_interval_ms: float = 5.0
+
     @property
     def max_upload_size_bytes(self) -> int:
         return self.max_upload_size_mb * 1024 * 1024
@@ -1,9 +1,20 @@
+import asyncio
+import importlib
 import logging
+from contextlib import asynccontextmanager
 
 from app.config import settings
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.routers.admin_router import router as admin_router
 from app.routers.cv_router import router
+from app.services.admission import AdmissionRejected
+from app.services.analysis_jobs import shutdown_worker_pool, start_worker_pool
+from app.utils.loop_monitor import start_loop_monitor, stop_loop_monitor
+from app.utils.metrics import REGISTRY
+from app.utils.request_profiler import ProfilingMiddleware
+from app.utils.stage_metrics import StageTimingMiddleware
 
 logging.basicConfig(
     level=logging.DEBUG if settings.environment == "development" else logging.INFO,
@@ -12,7 +23,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="CV Analyzer API", description="API for analyzing CVs")
+
+# Libraries the pipeline imports lazily. A first import from a worker thread mid-request holds the GIL
+# long enough to stall the event loop, so they are loaded once before serving.
+_PRELOAD_MODULES = ("langchain_ollama", "langchain_google_genai", "shap", "lime.lime_tabular", "fpdf")
+
+
+def preload_optional_modules() -> None:
+    for name in _PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if settings.preload_optional_modules:
+        await asyncio.to_thread(preload_optional_modules)
+    if settings.loop_monitor_enabled:
+        await start_loop_monitor(
+            settings.loop_monitor_interval_ms / 1000.0,
+            settings.loop_block_threshold_ms / 1000.0,
+        )
+    start_worker_pool()
+    yield
+    await stop_loop_monitor()
+    await shutdown_worker_pool()
+
+
+app = FastAPI(title="CV Analyzer API", description="API for analyzing CVs", lifespan=lifespan)
 
 if settings.environment == "development":
     app.add_middleware(
@@ -23,7 +63,23 @@ if settings.environment == "development":
         allow_headers=["*"],
     )
 
+# Inside stage timing, so a profiled request's Server-Timing still includes the profiler's overhead.
+app.add_middleware(ProfilingMiddleware)
+# Outermost, so the Server-Timing header also covers CORS and exception handling.
+app.add_middleware(StageTimingMiddleware)
+
 app.include_router(router, prefix="/api/v1", tags=["cv"])
+app.include_router(admin_router, prefix="/api/v1/admin", tags=["admin"])
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(_request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Сервіс перевантажений. Спробуйте пізніше."},
+        headers={"Retry-After": str(exc.retry_after_s)},
+    )
+
 
 @app.get("/")
 def read_root():
@@ -32,4 +88,9 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "environment": settings.environment}
\ No newline at end of file
+    return {"status": "healthy", "environment": settings.environment}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -6,7 +6,18 @@ from .cv_models import (
     CertificateItem,
     EducationItem,
     ProjectItem,
+    RequirementCoverageItem,
     JobRequirementsExtraction,
+    AnalysisJobResponse,
+    RankedCandidate,
+    RankResponse,
+    CandidateSearchRequest,
+    JobMatch,
+    JobMatchResponse,
+    StageMemoryStats,
+    AllocationSite,
+    MemoryReport,
+    ProfileInfo,
 )
 
 __all__ = [
@@ -17,5 +28,16 @@ __all__ = [
     "CertificateItem",
     "EducationItem",
     "ProjectItem",
+    "RequirementCoverageItem",
     "JobRequirementsExtraction",
+    "AnalysisJobResponse",
+    "RankedCandidate",
+    "RankResponse",
+    "CandidateSearchRequest",
+    "JobMatch",
+    "JobMatchResponse",
+    "StageMemoryStats",
+    "AllocationSite",
+    "MemoryReport",
+    "ProfileInfo",
 ]
\ No newline at end of file
@@ -12,6 +12,10 @@ class CVUpload(BaseModel):
 class CVAnalysisRequest(BaseModel):
     job_description: Optional[str] = None
     analysis_type: str = Field(default="full")
+    analysis_mode: Literal["full", "lite"] = Field(
+        default="full",
+        description="lite: rule-based extraction without an LLM call (fast pre-screening).",
+    )
     extract_keywords: bool = True
 
 
@@ -81,6 +85,14 @@ class MatchExplainability(BaseModel):
     )
 
 
+class RequirementCoverageItem(BaseModel):
+    """How well one job requirement line is covered by the closest CV skill / experience line."""
+    requirement: str
+    best_match: Optional[str] = Field(None, description="Closest CV line; omitted when the requirement is missing.")
+    similarity: float = Field(..., ge=0, le=1, description="Cosine similarity to the closest CV line.")
+    status: Literal["covered", "partial", "missing"]
+
+
 class JobRequirementsExtraction(BaseModel):
     """Extracted skills and requirements summary from a job description."""
     skills: List[str] = Field(default_factory=list, description="Required skills/technologies from the job description")
@@ -139,4 +151,101 @@ class CVAnalysisResponse(BaseModel):
         None,
         description="SHAP/LIME attributions for match_score when semantic matching is used.",
     )
+    requirement_coverage: Optional[List[RequirementCoverageItem]] = Field(
+        None,
+        description="Per-requirement embedding coverage of the job description. Present when a job was provided.",
+    )
     error: Optional[str] = None
+
+
+class AnalysisJobResponse(BaseModel):
+    """Status of a background analysis submitted via POST /analyses."""
+    id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    result: Optional[CVAnalysisResponse] = Field(None, description="Present once status is completed.")
+    error: Optional[str] = Field(None, description="Present when status is failed.")
+    created_at: float
+    updated_at: float
+
+
+class RankedCandidate(BaseModel):
+    """One CV in a POST /rank result, ordered by match_score."""
+    candidate_id: str = Field(..., description="Analysis id (for cv_ids) or the uploaded file name.")
+    rank: int = Field(..., ge=1)
+    match_score: Optional[float] = Field(None, ge=0, le=1)
+    semantic_breakdown: Optional[Dict[str, float]] = None
+    analysis: Optional[CVAnalysisResponse] = Field(
+        None,
+        description="Full LLM analysis; only present for the top_k shortlist.",
+    )
+    error: Optional[str] = Field(None, description="Why this CV could not be scored (parse failure, unknown id).")
+
+
+class RankResponse(BaseModel):
+    candidates: List[RankedCandidate]
+    semantic_weights: Dict[str, float]
+
+
+class CandidateSearchRequest(BaseModel):
+    """Query for POST /candidates/search over the candidate vector index."""
+    job_description: str = Field(..., min_length=1)
+    top_k: int = Field(10, ge=1, le=1000)
+    mode: Literal["exact", "ivf"] = Field(
+        "exact",
+        description="exact: float32 brute force; ivf: partitioned (approximate) scan.",
+    )
+
+
+class JobMatch(BaseModel):
+    """One vacancy in a POST /match-jobs result, ordered by match_score."""
+    job_id: str = Field(..., description="The job's URL, or job-<n> for the n-th plain-text description (1-based).")
+    rank: int = Field(..., ge=1)
+    match_score: Optional[float] = Field(None, ge=0, le=1)
+    semantic_breakdown: Optional[Dict[str, float]] = None
+    error: Optional[str] = Field(None, description="Why this job could not be scored (e.g. URL fetch failed).")
+
+
+class JobMatchResponse(BaseModel):
+    cv_analysis: CVAnalysisResponse = Field(..., description="CV extraction, done once for all jobs (no job-specific fields).")
+    jobs: List[JobMatch]
+    semantic_weights: Dict[str, float]
+
+
+class StageMemoryStats(BaseModel):
+    """Memory aggregates of one pipeline stage (GET /admin/memory). Byte values; traced = tracemalloc."""
+    count: int
+    rss_delta_mean_bytes: float
+    rss_delta_max_bytes: int
+    traced_delta_mean_bytes: float
+    traced_delta_total_bytes: int = Field(..., description="Heap retained by all runs; steady growth suggests a leak.")
+    traced_delta_max_bytes: int
+    peak_mean_bytes: float
+    peak_max_bytes: int
+
+
+class AllocationSite(BaseModel):
+    location: str = Field(..., description="file:line of the allocation.")
+    size_bytes: int
+    size_diff_bytes: int = Field(..., description="Growth since tracing started or the last reset.")
+    count: int
+    count_diff: int
+
+
+class MemoryReport(BaseModel):
+    enabled: bool
+    rss_bytes: Optional[int] = None
+    traced_bytes: int
+    stages: Dict[str, StageMemoryStats]
+    recent_requests: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Per-stage measurements of the latest requests: path and stages[{stage, rss_delta, traced_delta, peak}].",
+    )
+    top_allocation_sites: List[AllocationSite]
+
+
+class ProfileInfo(BaseModel):
+    """A stored request profile (GET /admin/profiles)."""
+    id: str
+    mode: Literal["sample", "cprofile"] = Field(..., description="sample: collapsed stacks; cprofile: pstats file.")
+    size_bytes: int
+    created_at: float
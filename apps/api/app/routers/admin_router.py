@@ -0,0 +1,54 @@
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from app.models import MemoryReport, ProfileInfo
+from app.utils.admin_auth import check_admin_token
+from app.utils.memory_profiler import get_memory_accounting
+from app.utils.request_profiler import get_profile_store
+
+
+def require_admin(x_admin_token: Annotated[Optional[str], Header()] = None) -> None:
+    check_admin_token(x_admin_token)
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+def _accounting():
+    accounting = get_memory_accounting()
+    if accounting is None:
+        raise HTTPException(
+            status_code=409,
+            detail="Облік пам'яті вимкнено. Увімкніть MEMORY_PROFILING=true і перезапустіть сервіс.",
+        )
+    return accounting
+
+
+@router.get("/memory", response_model=MemoryReport)
+def memory_report(top: Annotated[int, Query(ge=0, le=200)] = 20):
+    """Per-stage memory aggregates, the latest requests' stage measurements and top allocation sites."""
+    return _accounting().report(top)
+
+
+@router.post("/memory/reset", status_code=204)
+def memory_reset():
+    """Clear the aggregates and take a new baseline heap snapshot for allocation-site diffs."""
+    _accounting().reset()
+
+
+@router.get("/profiles", response_model=List[ProfileInfo])
+def list_profiles():
+    """Stored request profiles, newest first."""
+    return get_profile_store().list()
+
+
+@router.get("/profiles/{profile_id}", response_class=FileResponse)
+def download_profile(profile_id: str):
+    """Collapsed stacks (text, for flamegraph.pl / speedscope) or a pstats file (`python -m pstats <file>`)."""
+    path = get_profile_store().find(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Профіль не знайдено.")
+    media_type = "application/octet-stream" if path.suffix == ".pstats" else "text/plain; charset=utf-8"
+    return FileResponse(path, media_type=media_type, filename=path.name)
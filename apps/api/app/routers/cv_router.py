@@ -1,21 +1,43 @@
+import asyncio
 import logging
 import os
 import re
 import traceback
 from pathlib import Path
-from typing import Annotated, Optional
+from typing import Annotated, Any, AsyncIterator, Dict, List, Literal, Optional
 
 import aiofiles
 import httpx
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
 from app.config import settings
-from app.models import CVAnalysisRequest, CVAnalysisResponse
+from app.models import (
+    AnalysisJobResponse,
+    CandidateSearchRequest,
+    CVAnalysisRequest,
+    CVAnalysisResponse,
+    JobMatchResponse,
+    RankedCandidate,
+    RankResponse,
+)
+from app.services.admission import AdmissionRejected, admission
+from app.services.analysis_jobs import AnalysisJob, QueueFullError, get_worker_pool
 from app.services.analysis_pdf import render_analysis_pdf
+from app.services.candidate_index import get_candidate_index, remove_candidate
 from app.services.cv_analyzer import CVAnalyzer
 from app.services.cv_parser import CVParser
+from app.services.cv_ranker import (
+    JobText,
+    RankCandidate,
+    candidate_from_analysis,
+    rank_candidates,
+    rank_jobs_for_cv,
+)
+from app.services.semantic_matcher import normalized_semantic_weights
 from app.utils.file_validator import validate_file
+from app.utils.sse import format_sse
+from app.utils.stage_metrics import stage
 from app.utils.text_preprocess import normalize_text_for_pipeline
 
 logger = logging.getLogger(__name__)
@@ -24,14 +46,16 @@ UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
 JOB_URL_CONTENT_LIMIT = 50_000
+QUEUE_FULL_RETRY_AFTER_S = 5
 
 
 async def _fetch_job_description_from_url(url: str) -> str:
     """Fetch URL and return body as plain text. Strips HTML tags."""
-    async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-        resp = await client.get(url)
-        resp.raise_for_status()
-        text = resp.text
+    with stage("job_fetch"):
+        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+            resp = await client.get(url)
+            resp.raise_for_status()
+            text = resp.text
     if len(text) > JOB_URL_CONTENT_LIMIT:
         text = text[:JOB_URL_CONTENT_LIMIT] + "\n[... truncated]"
     # Strip HTML tags for a rough plain-text version
@@ -40,51 +64,45 @@ async def _fetch_job_description_from_url(url: str) -> str:
     return normalize_text_for_pipeline(text)
 
 
-@router.post("/analyze", response_model=None)
-async def analyze_cv(
-    file: UploadFile = File(..., description="CV file (PDF or DOCX)"),
-    job_description: Annotated[
-        Optional[str], Form(description="Position requirements as plain text (optional)")
-    ] = None,
-    job_description_url: Annotated[
-        Optional[str],
-        Form(description="URL of job posting to fetch requirements from (optional). Used with or instead of job_description."),
-    ] = None,
-    return_pdf: Annotated[
-        bool,
-        Form(description="If true and analysis succeeds, response is application/pdf."),
-    ] = False,
-):
-    file_path = None
-    try:
-        job_text = (job_description or "").strip()
-        if job_description_url and job_description_url.strip():
-            try:
-                url_content = await _fetch_job_description_from_url(job_description_url.strip())
-                job_text = f"{job_text}\n\n{url_content}".strip() if job_text else url_content
-            except Exception as e:
-                logger.warning("Failed to fetch job_description_url %s: %s", job_description_url, e)
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Не вдалося завантажити опис вакансії за посиланням: {e!s}",
-                ) from e
+async def _job_text_from_form(
+    job_description: Optional[str],
+    job_description_url: Optional[str],
+) -> str:
+    job_text = (job_description or "").strip()
+    if job_description_url and job_description_url.strip():
+        try:
+            url_content = await _fetch_job_description_from_url(job_description_url.strip())
+            job_text = f"{job_text}\n\n{url_content}".strip() if job_text else url_content
+        except Exception as e:
+            logger.warning("Failed to fetch job_description_url %s: %s", job_description_url, e)
+            raise HTTPException(
+                status_code=400,
+                detail=f"Не вдалося завантажити опис вакансії за посиланням: {e!s}",
+            ) from e
+
+    return normalize_text_for_pipeline(job_text) if job_text else ""
 
-        job_text = normalize_text_for_pipeline(job_text) if job_text else ""
 
+async def _extract_cv_text(file: UploadFile) -> str:
+    """Validate the upload, parse it to normalized text and remove the temp file. Raises ValueError / HTTPException."""
+    file_path = None
+    try:
         content = await file.read()
-        file_type, safe_filename = validate_file(
-            content,
-            file.filename,
-            file.content_type,
-            settings.max_upload_size_bytes,
-        )
+        with stage("validate"):
+            file_type, safe_filename = validate_file(
+                content,
+                file.filename,
+                file.content_type,
+                settings.max_upload_size_bytes,
+            )
         file_path = UPLOAD_DIR / safe_filename
         async with aiofiles.open(file_path, "wb") as f:
             await f.write(content)
 
         parser = CVParser()
         try:
-            cv_text = await parser.parse_file(str(file_path), file_type)
+            with stage("parse"):
+                cv_text = await parser.parse_file(str(file_path), file_type)
         except Exception as e:
             logger.warning("CV parse failed: %s", e, exc_info=True)
             raise HTTPException(
@@ -102,11 +120,42 @@ async def analyze_cv(
                 status_code=400,
                 detail="Не вдалося розібрати резюме: текст порожній або недоступний.",
             )
+        return cv_text
+    finally:
+        if file_path is not None and file_path.exists():
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+
+@router.post("/analyze", response_model=None)
+async def analyze_cv(
+    file: UploadFile = File(..., description="CV file (PDF or DOCX)"),
+    job_description: Annotated[
+        Optional[str], Form(description="Position requirements as plain text (optional)")
+    ] = None,
+    job_description_url: Annotated[
+        Optional[str],
+        Form(description="URL of job posting to fetch requirements from (optional). Used with or instead of job_description."),
+    ] = None,
+    return_pdf: Annotated[
+        bool,
+        Form(description="If true and analysis succeeds, response is application/pdf."),
+    ] = False,
+    analysis_mode: Annotated[
+        Literal["full", "lite"],
+        Form(description="full: LLM extraction; lite: rule-based extraction without an LLM (sub-second pre-screening)."),
+    ] = "full",
+):
+    try:
+        job_text = await _job_text_from_form(job_description, job_description_url)
+        cv_text = await _extract_cv_text(file)
 
         analyzer = CVAnalyzer()
         request = (
-            CVAnalysisRequest(job_description=job_text or None)
-            if job_text
+            CVAnalysisRequest(job_description=job_text or None, analysis_mode=analysis_mode)
+            if job_text or analysis_mode != "full"
             else None
         )
         result = await analyzer.analyze_cv(cv_text, request)
@@ -117,7 +166,8 @@ async def analyze_cv(
                     status_code=400,
                     detail=result.error or "Analysis failed; PDF was not generated.",
                 )
-            pdf_bytes = render_analysis_pdf(result)
+            with stage("pdf_render"):
+                pdf_bytes = await asyncio.to_thread(render_analysis_pdf, result)
             return Response(
                 content=pdf_bytes,
                 media_type="application/pdf",
@@ -131,7 +181,7 @@ async def analyze_cv(
     except ValueError as e:
         logger.warning("CV analyze validation error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
-    except HTTPException:
+    except (HTTPException, AdmissionRejected):
         raise
     except Exception as e:
         logger.exception("CV analyze failed: %s", e)
@@ -139,9 +189,236 @@ async def analyze_cv(
             status_code=500,
             detail=traceback.format_exc() if settings.environment == "development" else str(e),
         )
-    finally:
-        if file_path is not None and file_path.exists():
+
+
+@router.post("/analyze/stream", response_model=None)
+async def analyze_cv_stream(
+    file: UploadFile = File(..., description="CV file (PDF or DOCX)"),
+    job_description: Annotated[
+        Optional[str], Form(description="Position requirements as plain text (optional)")
+    ] = None,
+    job_description_url: Annotated[
+        Optional[str],
+        Form(description="URL of job posting to fetch requirements from (optional). Used with or instead of job_description."),
+    ] = None,
+):
+    """Same analysis as /analyze, streamed as Server-Sent Events.
+
+    Events in order: extracted_text, extraction_field (per top-level field while Ollama streams),
+    extraction, semantic, explainability, narrative, then result (full CVAnalysisResponse) or error. Upload/parse errors are returned as plain HTTP errors
+    before the stream starts.
+    """
+    try:
+        job_text = await _job_text_from_form(job_description, job_description_url)
+        cv_text = await _extract_cv_text(file)
+    except ValueError as e:
+        logger.warning("CV analyze validation error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    request = CVAnalysisRequest(job_description=job_text) if job_text else None
+
+    async def events() -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def on_stage(stage_name: str, payload: Dict[str, Any]) -> None:
+            await queue.put((stage_name, payload))
+
+        async def run() -> None:
             try:
-                os.remove(file_path)
-            except OSError:
-                pass
\ No newline at end of file
+                result = await CVAnalyzer().analyze_cv(cv_text, request, on_stage=on_stage)
+                await queue.put(("result", result.model_dump(mode="json")))
+            except AdmissionRejected as e:
+                await queue.put(("error", {"detail": str(e), "retry_after": e.retry_after_s}))
+            except Exception as e:
+                logger.exception("CV analyze stream failed: %s", e)
+                await queue.put(("error", {"detail": str(e)}))
+
+        yield format_sse("extracted_text", {"extracted_text": cv_text})
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                stage_name, payload = await queue.get()
+                yield format_sse(stage_name, payload)
+                if stage_name in ("result", "error"):
+                    break
+        finally:
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _job_status(job: AnalysisJob) -> AnalysisJobResponse:
+    return AnalysisJobResponse(
+        id=job.id,
+        status=job.status,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+@router.post("/analyses", status_code=202, response_model=AnalysisJobResponse)
+async def submit_analysis(
+    file: UploadFile = File(..., description="CV file (PDF or DOCX)"),
+    job_description: Annotated[
+        Optional[str], Form(description="Position requirements as plain text (optional)")
+    ] = None,
+    job_description_url: Annotated[
+        Optional[str],
+        Form(description="URL of job posting to fetch requirements from (optional). Used with or instead of job_description."),
+    ] = None,
+):
+    """Parse the CV now and queue the LLM analysis; poll GET /analyses/{id} for the result."""
+    try:
+        job_text = await _job_text_from_form(job_description, job_description_url)
+        cv_text = await _extract_cv_text(file)
+    except ValueError as e:
+        logger.warning("CV analyze validation error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        job = await get_worker_pool().submit(cv_text, job_text or None)
+    except QueueFullError as e:
+        logger.warning("Analysis queue full: %s", e)
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Черга аналізу переповнена. Спробуйте пізніше."},
+            headers={"Retry-After": str(QUEUE_FULL_RETRY_AFTER_S)},
+        )
+    return _job_status(job)
+
+
+@router.get("/analyses/{job_id}", response_model=AnalysisJobResponse)
+async def get_analysis(job_id: str):
+    job = await get_worker_pool().backend.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Аналіз не знайдено.")
+    return _job_status(job)
+
+
+async def _rank_candidate_from_upload(file: UploadFile) -> RankCandidate:
+    name = file.filename or "cv"
+    try:
+        return RankCandidate(candidate_id=name, cv_text=await _extract_cv_text(file))
+    except HTTPException as e:
+        return RankCandidate(candidate_id=name, error=str(e.detail))
+    except ValueError as e:
+        return RankCandidate(candidate_id=name, error=str(e))
+
+
+async def _rank_candidate_from_id(cv_id: str) -> RankCandidate:
+    job = await get_worker_pool().backend.get(cv_id)
+    if job is None:
+        return RankCandidate(candidate_id=cv_id, error="Аналіз не знайдено.")
+    return candidate_from_analysis(cv_id, job.cv_text, job.result)
+
+
+@router.post("/rank", response_model=RankResponse)
+async def rank_cvs(
+    files: Annotated[Optional[List[UploadFile]], File(description="CV files (PDF or DOCX)")] = None,
+    cv_ids: Annotated[
+        Optional[List[str]],
+        Form(description="Ids from POST /analyses; the stored CV text and extraction are reused."),
+    ] = None,
+    job_description: Annotated[
+        Optional[str], Form(description="Position requirements as plain text")
+    ] = None,
+    job_description_url: Annotated[
+        Optional[str],
+        Form(description="URL of job posting to fetch requirements from. Used with or instead of job_description."),
+    ] = None,
+    top_k: Annotated[
+        int,
+        Form(ge=0, description="Run the full LLM analysis only for this many best-scoring CVs (0 = embeddings only)."),
+    ] = 0,
+):
+    """Rank many CVs against one vacancy by embedding match_score; the job is embedded once."""
+    job_text = await _job_text_from_form(job_description, job_description_url)
+    if not job_text:
+        raise HTTPException(status_code=400, detail="Для ранжування потрібен опис вакансії.")
+    files = files or []
+    cv_ids = [i for i in (cv_ids or []) if i.strip()]
+    if not files and not cv_ids:
+        raise HTTPException(status_code=400, detail="Додайте хоча б одне резюме (files або cv_ids).")
+    if len(files) + len(cv_ids) > settings.rank_max_cvs:
+        raise HTTPException(status_code=400, detail=f"Забагато резюме: максимум {settings.rank_max_cvs}.")
+
+    candidates = await asyncio.gather(
+        *(_rank_candidate_from_upload(f) for f in files),
+        *(_rank_candidate_from_id(i) for i in cv_ids),
+    )
+    return await rank_candidates(candidates, job_text, top_k=min(top_k, settings.rank_max_top_k))
+
+
+async def _job_text_from_url(url: str) -> JobText:
+    try:
+        return JobText(job_id=url, text=await _fetch_job_description_from_url(url))
+    except Exception as e:
+        logger.warning("Failed to fetch job_description_url %s: %s", url, e)
+        return JobText(job_id=url, error=f"Не вдалося завантажити опис вакансії за посиланням: {e!s}")
+
+
+@router.post("/match-jobs", response_model=JobMatchResponse)
+async def match_jobs(
+    file: UploadFile = File(..., description="CV file (PDF or DOCX)"),
+    job_descriptions: Annotated[
+        Optional[List[str]], Form(description="Vacancy texts; each repeated field is one job (job-1, job-2, …).")
+    ] = None,
+    job_description_urls: Annotated[
+        Optional[List[str]], Form(description="Vacancy URLs; the URL is used as the job id.")
+    ] = None,
+):
+    """Score one CV against many vacancies: the CV is parsed, extracted and embedded once."""
+    texts = [t for t in (job_descriptions or []) if t and t.strip()]
+    urls = [u.strip() for u in (job_description_urls or []) if u and u.strip()]
+    if not texts and not urls:
+        raise HTTPException(status_code=400, detail="Додайте хоча б одну вакансію (job_descriptions або job_description_urls).")
+    if len(texts) + len(urls) > settings.match_jobs_max_jobs:
+        raise HTTPException(status_code=400, detail=f"Забагато вакансій: максимум {settings.match_jobs_max_jobs}.")
+
+    try:
+        cv_text = await _extract_cv_text(file)
+    except ValueError as e:
+        logger.warning("CV analyze validation error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    jobs = [JobText(job_id=f"job-{i + 1}", text=normalize_text_for_pipeline(t)) for i, t in enumerate(texts)]
+    jobs += await asyncio.gather(*(_job_text_from_url(u) for u in urls))
+    return await rank_jobs_for_cv(cv_text, jobs)
+
+
+@router.post("/candidates/search", response_model=RankResponse)
+async def search_candidates(body: CandidateSearchRequest):
+    """Top-k indexed candidates for a vacancy, without re-running anything per CV."""
+    job_text = normalize_text_for_pipeline(body.job_description)
+    index = get_candidate_index()
+    async with admission("embeddings"):
+        hits = await asyncio.to_thread(
+            index.search, job_text, body.top_k, body.mode, settings.candidate_index_ivf_probe
+        )
+    ws, we, wo = normalized_semantic_weights()
+    return RankResponse(
+        candidates=[
+            RankedCandidate(
+                candidate_id=h.candidate_id,
+                rank=i + 1,
+                match_score=h.match.score,
+                semantic_breakdown=h.match.breakdown(),
+            )
+            for i, h in enumerate(hits)
+        ],
+        semantic_weights={"skills": ws, "experience": we, "overall": wo},
+    )
+
+
+@router.delete("/candidates/{candidate_id}", status_code=204)
+async def delete_candidate(candidate_id: str):
+    if not await asyncio.to_thread(remove_candidate, candidate_id):
+        raise HTTPException(status_code=404, detail="Кандидата не знайдено в індексі.")
+    return Response(status_code=204)
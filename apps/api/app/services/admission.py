@@ -0,0 +1,130 @@
+"""Admission control for expensive pipeline stages (LLM backends, embeddings, explainers).
+
+Each stage has a concurrency limit and a bounded wait queue. A call that finds the queue full, or
+waits longer than the timeout, is shed with AdmissionRejected (HTTP 429 + Retry-After) instead of
+piling more work onto a saturated backend.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Tuple
+
+from app.config import settings
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_WAIT_SECONDS = REGISTRY.histogram(
+    "cv_admission_wait_seconds",
+    "Time spent waiting for an admission slot, by stage.",
+    ("stage",),
+)
+_REJECTED = REGISTRY.counter(
+    "cv_admission_rejected_total",
+    "Calls shed by admission control, by stage and reason.",
+    ("stage", "reason"),
+)
+
+
+class AdmissionRejected(Exception):
+    """The stage is saturated; retry after `retry_after_s` seconds."""
+
+    def __init__(self, stage: str, retry_after_s: int, reason: str) -> None:
+        super().__init__(f"{stage} overloaded ({reason}); retry after {retry_after_s}s")
+        self.stage = stage
+        self.retry_after_s = retry_after_s
+        self.reason = reason
+
+
+class AdmissionLimiter:
+    def __init__(self, stage: str, max_concurrency: int, max_waiting: int, wait_timeout_s: float) -> None:
+        self.stage = stage
+        self.max_concurrency = max_concurrency
+        self.max_waiting = max_waiting
+        self.wait_timeout_s = wait_timeout_s
+        self.active = 0
+        self.waiting = 0
+        # EWMA of how long a slot is held; drives the Retry-After estimate.
+        self._avg_hold_s = 1.0
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+
+    def retry_after_s(self) -> int:
+        slots = max(1, self.max_concurrency)
+        return max(1, math.ceil(self._avg_hold_s * (self.waiting + 1) / slots))
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        _REJECTED.inc(stage=self.stage, reason=reason)
+        logger.warning(
+            "Admission: shedding %s call (%s; active=%d waiting=%d)", self.stage, reason, self.active, self.waiting
+        )
+        return AdmissionRejected(self.stage, self.retry_after_s(), reason)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self._semaphore is None:
+            yield
+            return
+        started = time.monotonic()
+        if self._semaphore.locked():
+            if self.waiting >= self.max_waiting:
+                raise self._reject("queue_full")
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.wait_timeout_s)
+            except asyncio.TimeoutError:
+                raise self._reject("wait_timeout") from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        acquired = time.monotonic()
+        _WAIT_SECONDS.observe(acquired - started, stage=self.stage)
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            self._avg_hold_s = 0.8 * self._avg_hold_s + 0.2 * (time.monotonic() - acquired)
+
+
+_limiters: Dict[str, AdmissionLimiter] = {}
+
+
+def _stage_concurrency(stage: str) -> int:
+    return int(getattr(settings, f"admission_{stage}_concurrency", 0))
+
+
+def get_limiter(stage: str) -> AdmissionLimiter:
+    """Shared limiter for a stage: ollama, gemini, embeddings or explainer."""
+    limiter = _limiters.get(stage)
+    if limiter is None:
+        limiter = AdmissionLimiter(
+            stage,
+            _stage_concurrency(stage),
+            settings.admission_max_waiting,
+            settings.admission_wait_timeout_s,
+        )
+        _limiters[stage] = limiter
+    return limiter
+
+
+def admission(stage: str):
+    return get_limiter(stage).slot()
+
+
+def _collect_active() -> Dict[Tuple[str, ...], float]:
+    return {(name, "active"): float(l.active) for name, l in _limiters.items()} | {
+        (name, "waiting"): float(l.waiting) for name, l in _limiters.items()
+    }
+
+
+REGISTRY.gauge(
+    "cv_admission_calls",
+    "Calls currently holding (active) or waiting for (waiting) an admission slot, by stage.",
+    ("stage", "state"),
+    _collect_active,
+)
@@ -0,0 +1,435 @@
+"""Background analysis jobs: pluggable queue backends and a bounded worker pool.
+
+POST /analyses enqueues parsed CV text and returns immediately; workers drain the queue with
+bounded concurrency and store the CVAnalysisResponse for GET /analyses/{id}. The SQLite backend
+lets several API nodes share one queue file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, List, Optional, Protocol
+from uuid import uuid4
+
+from app.config import settings
+from app.models import CVAnalysisRequest
+from app.services.admission import AdmissionRejected, admission
+from app.services.candidate_index import index_candidate
+from app.services.cv_analyzer import CVAnalyzer
+from app.services.cv_ranker import experience_text_from_items
+from app.services.semantic_matcher import SemanticBlocks
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised by enqueue when the backend already holds the configured number of pending jobs."""
+
+
+@dataclass
+class AnalysisJob:
+    id: str
+    cv_text: str
+    job_description: Optional[str] = None
+    status: str = JOB_QUEUED
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+
+class JobQueueBackend(Protocol):
+    async def enqueue(self, job: AnalysisJob) -> None: ...
+
+    async def claim(self) -> Optional[AnalysisJob]: ...
+
+    async def complete(self, job_id: str, result: Dict[str, Any]) -> None: ...
+
+    async def fail(self, job_id: str, error: str) -> None: ...
+
+    async def requeue(self, job_id: str) -> None: ...
+
+    async def heartbeat(self, job_id: str) -> None: ...
+
+    async def get(self, job_id: str) -> Optional[AnalysisJob]: ...
+
+    async def pending_count(self) -> int: ...
+
+
+class InMemoryJobQueue:
+    """Single-process backend; jobs are lost on restart."""
+
+    def __init__(self, max_pending: int, result_ttl_s: float) -> None:
+        self._max_pending = max_pending
+        self._ttl = result_ttl_s
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._pending: Deque[str] = deque()
+
+    def _purge_finished(self) -> None:
+        cutoff = time.time() - self._ttl
+        for job_id in [
+            j.id for j in self._jobs.values() if j.status in (JOB_COMPLETED, JOB_FAILED) and j.updated_at < cutoff
+        ]:
+            del self._jobs[job_id]
+
+    async def enqueue(self, job: AnalysisJob) -> None:
+        self._purge_finished()
+        if len(self._pending) >= self._max_pending:
+            raise QueueFullError(f"{len(self._pending)} jobs pending")
+        self._jobs[job.id] = job
+        self._pending.append(job.id)
+
+    async def claim(self) -> Optional[AnalysisJob]:
+        while self._pending:
+            job = self._jobs.get(self._pending.popleft())
+            if job is not None and job.status == JOB_QUEUED:
+                job.status = JOB_RUNNING
+                job.updated_at = time.time()
+                return job
+        return None
+
+    async def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        self._finish(job_id, JOB_COMPLETED, result=result)
+
+    async def fail(self, job_id: str, error: str) -> None:
+        self._finish(job_id, JOB_FAILED, error=error)
+
+    async def requeue(self, job_id: str) -> None:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.status = JOB_QUEUED
+            job.updated_at = time.time()
+            self._pending.append(job_id)
+
+    async def heartbeat(self, job_id: str) -> None:
+        job = self._jobs.get(job_id)
+        if job is not None and job.status == JOB_RUNNING:
+            job.updated_at = time.time()
+
+    async def get(self, job_id: str) -> Optional[AnalysisJob]:
+        return self._jobs.get(job_id)
+
+    async def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _finish(self, job_id: str, status: str, *, result=None, error=None) -> None:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        job.status = status
+        job.result = result
+        job.error = error
+        job.updated_at = time.time()
+
+
+class SQLiteJobQueue:
+    """File-backed backend; safe to share between processes and API nodes on one volume.
+
+    A running job's updated_at is its lease: workers renew it with heartbeat(), and a claim first puts
+    back in the queue any running job whose lease is older than lease_s (its worker died).
+    """
+
+    def __init__(self, path: str, max_pending: int, result_ttl_s: float, lease_s: float = 120.0) -> None:
+        self._path = path
+        self._max_pending = max_pending
+        self._ttl = result_ttl_s
+        self._lease_s = lease_s
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis_jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    cv_text TEXT NOT NULL,
+                    job_description TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS analysis_jobs_status ON analysis_jobs (status, created_at)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> AnalysisJob:
+        return AnalysisJob(
+            id=row["id"],
+            cv_text=row["cv_text"],
+            job_description=row["job_description"],
+            status=row["status"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+        )
+
+    def _enqueue_sync(self, job: AnalysisJob) -> None:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "DELETE FROM analysis_jobs WHERE status IN (?, ?) AND updated_at < ?",
+                    (JOB_COMPLETED, JOB_FAILED, time.time() - self._ttl),
+                )
+                (pending,) = conn.execute(
+                    "SELECT COUNT(*) FROM analysis_jobs WHERE status = ?", (JOB_QUEUED,)
+                ).fetchone()
+                if pending >= self._max_pending:
+                    raise QueueFullError(f"{pending} jobs pending")
+                conn.execute(
+                    "INSERT INTO analysis_jobs (id, status, cv_text, job_description, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (job.id, job.status, job.cv_text, job.job_description, job.created_at, job.updated_at),
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _claim_sync(self) -> Optional[AnalysisJob]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            expired = conn.execute(
+                "UPDATE analysis_jobs SET status = ?, updated_at = ? WHERE status = ? AND updated_at < ?",
+                (JOB_QUEUED, now, JOB_RUNNING, now - self._lease_s),
+            ).rowcount
+            if expired:
+                logger.warning("Analysis queue: %d running job(s) with an expired lease queued again", expired)
+            row = conn.execute(
+                "SELECT * FROM analysis_jobs WHERE status = ? ORDER BY created_at LIMIT 1", (JOB_QUEUED,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE analysis_jobs SET status = ?, updated_at = ? WHERE id = ?", (JOB_RUNNING, now, row["id"])
+            )
+            conn.execute("COMMIT")
+        job = self._row_to_job(row)
+        job.status = JOB_RUNNING
+        job.updated_at = now
+        return job
+
+    def _update_sync(self, job_id: str, status: str, result: Optional[str], error: Optional[str]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE analysis_jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, result, error, time.time(), job_id),
+            )
+
+    def _heartbeat_sync(self, job_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE analysis_jobs SET updated_at = ? WHERE id = ? AND status = ?", (time.time(), job_id, JOB_RUNNING)
+            )
+
+    def _get_sync(self, job_id: str) -> Optional[AnalysisJob]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM analysis_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row is not None else None
+
+    def _pending_sync(self) -> int:
+        with self._connect() as conn:
+            (n,) = conn.execute("SELECT COUNT(*) FROM analysis_jobs WHERE status = ?", (JOB_QUEUED,)).fetchone()
+        return int(n)
+
+    async def enqueue(self, job: AnalysisJob) -> None:
+        await asyncio.to_thread(self._enqueue_sync, job)
+
+    async def claim(self) -> Optional[AnalysisJob]:
+        return await asyncio.to_thread(self._claim_sync)
+
+    async def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._update_sync, job_id, JOB_COMPLETED, json.dumps(result, ensure_ascii=False), None)
+
+    async def fail(self, job_id: str, error: str) -> None:
+        await asyncio.to_thread(self._update_sync, job_id, JOB_FAILED, None, error)
+
+    async def requeue(self, job_id: str) -> None:
+        await asyncio.to_thread(self._update_sync, job_id, JOB_QUEUED, None, None)
+
+    async def heartbeat(self, job_id: str) -> None:
+        await asyncio.to_thread(self._heartbeat_sync, job_id)
+
+    async def get(self, job_id: str) -> Optional[AnalysisJob]:
+        return await asyncio.to_thread(self._get_sync, job_id)
+
+    async def pending_count(self) -> int:
+        return await asyncio.to_thread(self._pending_sync)
+
+
+JobRunner = Callable[[AnalysisJob], Awaitable[Dict[str, Any]]]
+
+
+async def run_analysis_job(job: AnalysisJob) -> Dict[str, Any]:
+    request = CVAnalysisRequest(job_description=job.job_description) if job.job_description else None
+    result = await CVAnalyzer().analyze_cv(job.cv_text, request)
+    if result.success and settings.candidate_index_enabled:
+        blocks = SemanticBlocks(
+            skills=list(result.skills or []),
+            experience_text=experience_text_from_items(result.experience) or job.cv_text[:8000],
+            full_text=job.cv_text,
+        )
+        try:
+            async with admission("embeddings"):
+                await asyncio.to_thread(index_candidate, job.id, blocks)
+        except Exception:
+            logger.warning("Analysis job %s: adding to candidate index failed", job.id, exc_info=True)
+    return result.model_dump(mode="json")
+
+
+class AnalysisWorkerPool:
+    def __init__(
+        self,
+        backend: JobQueueBackend,
+        *,
+        concurrency: int,
+        poll_interval_s: float,
+        heartbeat_interval_s: float = 40.0,
+        runner: JobRunner = run_analysis_job,
+    ) -> None:
+        self.backend = backend
+        self._concurrency = max(1, concurrency)
+        self._poll_interval = poll_interval_s
+        self._heartbeat_interval = heartbeat_interval_s
+        self._runner = runner
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return any(not t.done() for t in self._tasks)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"analysis-worker-{i}") for i in range(self._concurrency)
+        ]
+        logger.info("Analysis worker pool started (%d workers)", self._concurrency)
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, cv_text: str, job_description: Optional[str]) -> AnalysisJob:
+        job = AnalysisJob(id=uuid4().hex, cv_text=cv_text, job_description=job_description or None)
+        await self.backend.enqueue(job)
+        self.start()
+        self._wakeup.set()
+        return job
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                job = await self.backend.claim()
+            except Exception:
+                logger.exception("Analysis worker %d: claim failed", index)
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    # Other nodes may enqueue into a shared backend, so fall back to polling.
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self._heartbeat_interval)
+            try:
+                await self.backend.heartbeat(job_id)
+            except Exception:
+                logger.warning("Analysis job %s: lease renewal failed", job_id, exc_info=True)
+
+    async def _run(self, job: AnalysisJob) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat(job.id), name=f"analysis-heartbeat-{job.id}")
+        try:
+            result = await self._runner(job)
+        except asyncio.CancelledError:
+            await self.backend.requeue(job.id)
+            raise
+        except AdmissionRejected as e:
+            # Backend saturated: hold this worker back and retry the job later instead of failing it.
+            logger.info("Analysis job %s shed by admission control; requeue in %ss", job.id, e.retry_after_s)
+            await asyncio.sleep(e.retry_after_s)
+            await self.backend.requeue(job.id)
+            return
+        except Exception as e:
+            logger.exception("Analysis job %s failed", job.id)
+            await self.backend.fail(job.id, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+        if result.get("success") is False:
+            logger.warning("Analysis job %s failed: %s", job.id, result.get("error"))
+            await self.backend.fail(job.id, result.get("error") or "Невідома помилка")
+            return
+        await self.backend.complete(job.id, result)
+
+
+def _make_backend() -> JobQueueBackend:
+    kind = settings.analysis_queue_backend.lower()
+    if kind == "sqlite":
+        return SQLiteJobQueue(
+            settings.analysis_queue_sqlite_path,
+            settings.analysis_queue_max_pending,
+            settings.analysis_queue_result_ttl_s,
+            settings.analysis_queue_lease_s,
+        )
+    if kind != "memory":
+        logger.warning("Unknown analysis_queue_backend=%s; using in-memory queue", kind)
+    return InMemoryJobQueue(settings.analysis_queue_max_pending, settings.analysis_queue_result_ttl_s)
+
+
+_pool: Optional[AnalysisWorkerPool] = None
+
+
+def get_worker_pool() -> AnalysisWorkerPool:
+    global _pool
+    if _pool is None:
+        _pool = AnalysisWorkerPool(
+            _make_backend(),
+            concurrency=settings.analysis_queue_workers,
+            poll_interval_s=settings.analysis_queue_poll_interval_s,
+            heartbeat_interval_s=settings.analysis_queue_lease_s / 3,
+        )
+    return _pool
+
+
+def start_worker_pool() -> None:
+    """Start draining the queue at startup: jobs left by a restart or enqueued by other nodes do not wait for a POST."""
+    get_worker_pool().start()
+
+
+async def shutdown_worker_pool() -> None:
+    if _pool is not None:
+        await _pool.stop()
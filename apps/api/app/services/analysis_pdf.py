@@ -63,7 +63,8 @@ def render_analysis_pdf(resp: CVAnalysisResponse) -> bytes:
     def _line(text: str) -> None:
         for paragraph in (text or "").split("\n"):
             p = (paragraph or " ").strip() or " "
-            pdf.multi_cell(0, 6, p)
+            # fpdf2 leaves the cursor right of the cell by default; the next full-width cell would have no room.
+            pdf.multi_cell(0, 6, p, new_x="LMARGIN", new_y="NEXT")
         pdf.ln(2)
 
     pdf.set_font("DejaVu", "", 14)
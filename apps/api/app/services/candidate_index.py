@@ -0,0 +1,457 @@
+"""Persistent index of candidate embeddings for "best candidates for this job" queries.
+
+Each candidate keeps the three compute_semantic_match blocks (skills, experience, full CV) as unit
+vectors. Because match_score is linear in the block cosines, each candidate folds into one 2·d
+vector ([w_s·skills + w_e·experience, w_o·full]) and a constant, so scoring a job is one matmul:
+
+    score = const + 0.5 · combined · [job_requirements_vec, job_full_vec]
+
+Search modes: exact (float32 brute force) and ivf (k-means partitions, only the nprobe nearest lists
+are scanned). ivf re-scores its top hits exactly, so returned breakdowns are always exact.
+
+Persistence: <path> is an npz snapshot and <path>.log an append-only log of inserts and deletes since
+it, so a mutation writes O(d) bytes. Once the log holds candidate_index_compact_ops records (and at least
+a quarter of the index), the snapshot is rewritten and the log cut, without holding the search lock
+during the write. Loading replays the log over the snapshot.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.services.semantic_matcher import (
+    SemanticBlocks,
+    SemanticMatchResult,
+    cv_block_vectors,
+    job_block_vectors,
+    normalized_semantic_weights,
+)
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ("exact", "ivf")
+
+# Log record: op, id length, dimension; then the id, and for upserts 3 presence bytes and (3, d) float32.
+_LOG_HEADER = struct.Struct("<BHI")
+_LOG_UPSERT = 1
+_LOG_REMOVE = 2
+
+
+@dataclass
+class CandidateHit:
+    candidate_id: str
+    match: SemanticMatchResult
+
+
+def _unit_rows(m: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(m, axis=-1, keepdims=True)
+    return np.divide(m, norms, out=np.zeros_like(m), where=norms > 0).astype(np.float32)
+
+
+def _combine(
+    blocks: np.ndarray, present: np.ndarray, weights: Tuple[float, float, float]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Fold (n, 3, d) block vectors into the per-candidate constant and (n, 2d) combined vector."""
+    ws, we, wo = weights
+    p = present.astype(np.float32)
+    req_part = ws * p[:, 0:1] * blocks[:, 0] + we * p[:, 1:2] * blocks[:, 1]
+    full_part = wo * p[:, 2:3] * blocks[:, 2]
+    combined = np.concatenate([req_part, full_part], axis=1).astype(np.float32)
+    const = (0.5 * (p @ np.array([ws, we, wo], dtype=np.float32))).astype(np.float32)
+    return const, combined
+
+
+def _kmeans(x: np.ndarray, k: int, iters: int = 10, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centroids = x[rng.choice(len(x), size=k, replace=False)].copy()
+    for _ in range(iters):
+        assign = np.argmax(x @ centroids.T, axis=1)
+        for c in range(k):
+            members = x[assign == c]
+            if len(members):
+                centroids[c] = members.mean(axis=0)
+        centroids = _unit_rows(centroids)
+    return centroids
+
+
+class CandidateIndex:
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._pos: Dict[str, int] = {}
+        # Capacity buffers; the first len(_ids) rows are live: (n, [skills, experience, full], d).
+        self._blocks_buf = np.zeros((0, 3, 0), dtype=np.float32)
+        self._present_buf = np.zeros((0, 3), dtype=bool)
+        self._combined: Optional[Tuple[Tuple[float, float, float], np.ndarray, np.ndarray]] = None
+        self._ivf_centroids: Optional[np.ndarray] = None
+        self._ivf_assign: Optional[np.ndarray] = None
+        # Mutation log since the last snapshot (only with a path): open handle, bytes and records in it.
+        self._log_file = None
+        self._log_bytes = 0
+        self._log_ops = 0
+        self._snapshot_lock = threading.Lock()
+        if path and (os.path.isfile(path) or os.path.isfile(f"{path}.log")):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self._pos
+
+    # --- mutation -----------------------------------------------------------------------------
+
+    def _reserve(self, n: int, dim: int) -> None:
+        """Grow the backing buffers geometrically so single inserts stay amortized O(d)."""
+        if len(self._ids) == 0 and self._blocks_buf.shape[2] != dim:
+            self._blocks_buf = np.zeros((0, 3, dim), dtype=np.float32)
+            self._present_buf = np.zeros((0, 3), dtype=bool)
+        elif dim != self._blocks_buf.shape[2]:
+            raise ValueError(f"Vector dimension {dim} != index dimension {self._blocks_buf.shape[2]}")
+        if n <= len(self._blocks_buf):
+            return
+        cap = max(n, 2 * len(self._blocks_buf), 64)
+        blocks = np.zeros((cap, 3, dim), dtype=np.float32)
+        present = np.zeros((cap, 3), dtype=bool)
+        size = len(self._ids)
+        blocks[:size] = self._blocks_buf[:size]
+        present[:size] = self._present_buf[:size]
+        self._blocks_buf, self._present_buf = blocks, present
+
+    @property
+    def _blocks(self) -> np.ndarray:
+        return self._blocks_buf[: len(self._ids)]
+
+    @property
+    def _present(self) -> np.ndarray:
+        return self._present_buf[: len(self._ids)]
+
+    def add_vectors(self, candidate_id: str, vectors: np.ndarray) -> None:
+        """Insert or replace a candidate from its (3, d) block vectors; zero rows mean an empty block."""
+        self.add_many_vectors([candidate_id], np.asarray(vectors, dtype=np.float32).reshape(1, 3, -1))
+
+    def add_many_vectors(self, candidate_ids: Sequence[str], vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(candidate_ids), 3, -1)
+        present = np.linalg.norm(vectors, axis=2) > 0
+        vectors = _unit_rows(vectors)
+        with self._lock:
+            self._upsert(candidate_ids, vectors, present)
+            if self.path:
+                self._append_log(
+                    b"".join(_upsert_record(cid, v, p) for cid, v, p in zip(candidate_ids, vectors, present)),
+                    len(candidate_ids),
+                )
+
+    def _upsert(self, candidate_ids: Sequence[str], vectors: np.ndarray, present: np.ndarray) -> None:
+        with self._lock:
+            self._reserve(len(self._ids) + len(candidate_ids), vectors.shape[2])
+            rows = []
+            for cid, vecs, pres in zip(candidate_ids, vectors, present):
+                i = self._pos.get(cid)
+                if i is None:
+                    i = len(self._ids)
+                    self._pos[cid] = i
+                    self._ids.append(cid)
+                self._blocks_buf[i] = vecs
+                self._present_buf[i] = pres
+                rows.append(i)
+            self._invalidate(rows)
+
+    def add(self, candidate_id: str, blocks: SemanticBlocks) -> None:
+        self.add_vectors(candidate_id, cv_block_vectors([blocks])[0])
+
+    def remove(self, candidate_id: str) -> bool:
+        with self._lock:
+            removed = self._remove(candidate_id)
+            if removed and self.path:
+                self._append_log(_remove_record(candidate_id), 1)
+            return removed
+
+    def _remove(self, candidate_id: str) -> bool:
+        with self._lock:
+            i = self._pos.pop(candidate_id, None)
+            if i is None:
+                return False
+            last = len(self._ids) - 1
+            if i != last:
+                # Swap-remove keeps deletes O(d) instead of shifting every row.
+                moved = self._ids[last]
+                self._ids[i] = moved
+                self._pos[moved] = i
+                self._blocks_buf[i] = self._blocks_buf[last]
+                self._present_buf[i] = self._present_buf[last]
+                if self._ivf_assign is not None:
+                    self._ivf_assign[i] = self._ivf_assign[last]
+            self._ids.pop()
+            if self._ivf_assign is not None:
+                self._ivf_assign = self._ivf_assign[:last]
+            self._combined = None
+            return True
+
+    def _invalidate(self, rows: Sequence[int]) -> None:
+        self._combined = None
+        if self._ivf_centroids is not None and self._ivf_assign is not None:
+            # New rows join the nearest existing partition; call build_ivf() to retrain after large changes.
+            grow = len(self._ids) - len(self._ivf_assign)
+            if grow > 0:
+                self._ivf_assign = np.concatenate([self._ivf_assign, np.zeros(grow, dtype=np.int32)])
+            idx = np.asarray(rows)
+            _, vecs = _combine(self._blocks[idx], self._present[idx], normalized_semantic_weights())
+            self._ivf_assign[idx] = np.argmax(vecs @ self._ivf_centroids.T, axis=1)
+
+    # --- scoring ------------------------------------------------------------------------------
+
+    def _combined_matrix(self) -> Tuple[np.ndarray, np.ndarray]:
+        weights = normalized_semantic_weights()
+        if self._combined is None or self._combined[0] != weights:
+            const, combined = _combine(self._blocks, self._present, weights)
+            self._combined = (weights, const, combined)
+        return self._combined[1], self._combined[2]
+
+    def build_ivf(self, n_lists: int = 0) -> None:
+        with self._lock:
+            _, combined = self._combined_matrix()
+            n = len(combined)
+            if n == 0:
+                return
+            k = n_lists or max(1, int(np.sqrt(n)))
+            k = min(k, n)
+            centroids = _kmeans(_unit_rows(combined), k)
+            self._ivf_centroids = centroids
+            self._ivf_assign = np.argmax(combined @ centroids.T, axis=1).astype(np.int32)
+            logger.info("Candidate index: IVF built with %d lists over %d candidates", k, n)
+
+    def _exact_results(self, rows: np.ndarray, q_req: np.ndarray, q_full: np.ndarray) -> List[SemanticMatchResult]:
+        ws, we, wo = normalized_semantic_weights()
+        blocks = self._blocks[rows]
+        present = self._present[rows]
+        skills = np.where(present[:, 0], (blocks[:, 0] @ q_req + 1) / 2, 0.0)
+        exp = np.where(present[:, 1], (blocks[:, 1] @ q_req + 1) / 2, 0.0)
+        overall = np.where(present[:, 2], (blocks[:, 2] @ q_full + 1) / 2, 0.0)
+        scores = np.clip(ws * skills + we * exp + wo * overall, 0.0, 1.0)
+        return [
+            SemanticMatchResult(
+                score=float(scores[i]),
+                skills_similarity=float(skills[i]),
+                experience_similarity=float(exp[i]),
+                overall_similarity=float(overall[i]),
+            )
+            for i in range(len(rows))
+        ]
+
+    def search_vectors(
+        self,
+        q_req: np.ndarray,
+        q_full: np.ndarray,
+        top_k: int = 10,
+        mode: str = "exact",
+        nprobe: int = 4,
+    ) -> List[CandidateHit]:
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}. Supported: {', '.join(SEARCH_MODES)}")
+        q_req = _unit_rows(np.asarray(q_req, dtype=np.float32)[None])[0]
+        q_full = _unit_rows(np.asarray(q_full, dtype=np.float32)[None])[0]
+        query = np.concatenate([q_req, q_full])
+        with self._lock:
+            n = len(self._ids)
+            if n == 0 or top_k <= 0:
+                return []
+            const, combined = self._combined_matrix()
+            if mode == "ivf":
+                if self._ivf_centroids is None:
+                    self.build_ivf(settings.candidate_index_ivf_lists)
+                assert self._ivf_centroids is not None and self._ivf_assign is not None
+                probe = np.argsort(-(self._ivf_centroids @ query))[: max(1, nprobe)]
+                rows = np.flatnonzero(np.isin(self._ivf_assign, probe))
+                approx = const[rows] + 0.5 * (combined[rows] @ query)
+            else:
+                rows = np.arange(n)
+                approx = const + 0.5 * (combined @ query)
+
+            k = min(top_k, len(rows))
+            if k == 0:
+                return []
+            best = np.argpartition(-approx, k - 1)[:k]
+            picked = rows[best]
+            results = self._exact_results(picked, q_req, q_full)
+            hits = [CandidateHit(candidate_id=self._ids[r], match=m) for r, m in zip(picked, results)]
+        hits.sort(key=lambda h: h.match.score, reverse=True)
+        return hits
+
+    def search(self, job_text: str, top_k: int = 10, mode: str = "exact", nprobe: int = 4) -> List[CandidateHit]:
+        q_req, q_full = job_block_vectors(job_text)
+        return self.search_vectors(q_req, q_full, top_k=top_k, mode=mode, nprobe=nprobe)
+
+    # --- persistence --------------------------------------------------------------------------
+
+    def _append_log(self, records: bytes, count: int) -> None:
+        """Append mutation records to <path>.log (caller holds the lock, so the log order is the apply order)."""
+        if self._log_file is None:
+            self._log_file = open(f"{self.path}.log", "ab")
+        self._log_file.write(records)
+        self._log_file.flush()
+        self._log_bytes += len(records)
+        self._log_ops += count
+
+    def _close_log(self) -> None:
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write a full snapshot; for the index's own path this also cuts the log to what came after it."""
+        target = path or self.path
+        if not target:
+            return
+        with self._snapshot_lock:
+            self._write_snapshot(target)
+
+    def maybe_compact(self) -> bool:
+        """Rewrite the snapshot once replaying the log would cost more than rewriting it."""
+        if not self.path or self._log_ops < max(settings.candidate_index_compact_ops, len(self) // 4):
+            return False
+        if not self._snapshot_lock.acquire(blocking=False):
+            return False
+        try:
+            self._write_snapshot(self.path)
+        finally:
+            self._snapshot_lock.release()
+        return True
+
+    def _write_snapshot(self, target: str) -> None:
+        # Copy under the lock, write without it: searches and inserts only wait for the copy.
+        with self._lock:
+            ids = np.array(self._ids, dtype=str)
+            blocks = self._blocks.copy()
+            present = self._present.copy()
+            covered_bytes, covered_ops = self._log_bytes, self._log_ops
+        tmp = f"{target}.tmp.npz"
+        np.savez(tmp, ids=ids, blocks=blocks, present=present)
+        os.replace(tmp, target)
+        if target != self.path:
+            return
+        # Keep only the records appended while the snapshot was written. A crash before the log is cut
+        # replays the whole log over the new snapshot, which ends in the same state.
+        log_path = f"{target}.log"
+        with self._lock:
+            self._close_log()
+            tail = b""
+            if os.path.isfile(log_path):
+                with open(log_path, "rb") as f:
+                    f.seek(covered_bytes)
+                    tail = f.read()
+            with open(f"{log_path}.tmp", "wb") as f:
+                f.write(tail)
+            os.replace(f"{log_path}.tmp", log_path)
+            self._log_bytes = len(tail)
+            self._log_ops -= covered_ops
+        logger.info("Candidate index: snapshot of %d candidates written to %s", len(ids), target)
+
+    def load(self, path: str) -> None:
+        with self._lock:
+            if os.path.isfile(path):
+                with np.load(path) as data:
+                    ids = [str(x) for x in data["ids"]]
+                    blocks = data["blocks"].astype(np.float32)
+                    present = data["present"].astype(bool)
+                self._ids = ids
+                self._pos = {cid: i for i, cid in enumerate(ids)}
+                self._blocks_buf = blocks
+                self._present_buf = present
+            self._combined = None
+            self._ivf_centroids = None
+            self._ivf_assign = None
+            self._replay_log(f"{path}.log")
+        logger.info("Candidate index: loaded %d candidates from %s (%d log records)", len(self), path, self._log_ops)
+
+    def _replay_log(self, log_path: str) -> None:
+        self._close_log()
+        self._log_bytes = self._log_ops = 0
+        if not os.path.isfile(log_path):
+            return
+        with open(log_path, "rb") as f:
+            data = f.read()
+        pos = 0
+        while pos + _LOG_HEADER.size <= len(data):
+            op, id_len, dim = _LOG_HEADER.unpack_from(data, pos)
+            body = pos + _LOG_HEADER.size + id_len
+            end = body + (3 + 12 * dim if op == _LOG_UPSERT else 0)
+            if end > len(data):
+                break
+            cid = data[pos + _LOG_HEADER.size : body].decode("utf-8")
+            if op == _LOG_UPSERT:
+                present = np.frombuffer(data, dtype=np.uint8, count=3, offset=body).astype(bool)
+                vectors = np.frombuffer(data, dtype=np.float32, count=3 * dim, offset=body + 3).reshape(1, 3, dim)
+                self._upsert([cid], vectors, present[None])
+            else:
+                self._remove(cid)
+            pos = end
+            self._log_ops += 1
+        self._log_bytes = pos
+        if pos < len(data):
+            # A record cut short by a crash: drop it so new records are not appended after garbage.
+            logger.warning("Candidate index: dropping %d bytes of a truncated record in %s", len(data) - pos, log_path)
+            with open(log_path, "r+b") as f:
+                f.truncate(pos)
+
+
+def _upsert_record(candidate_id: str, vectors: np.ndarray, present: np.ndarray) -> bytes:
+    cid = candidate_id.encode("utf-8")
+    return (
+        _LOG_HEADER.pack(_LOG_UPSERT, len(cid), vectors.shape[1])
+        + cid
+        + present.astype(np.uint8).tobytes()
+        + np.ascontiguousarray(vectors, dtype=np.float32).tobytes()
+    )
+
+
+def _remove_record(candidate_id: str) -> bytes:
+    cid = candidate_id.encode("utf-8")
+    return _LOG_HEADER.pack(_LOG_REMOVE, len(cid), 0) + cid
+
+
+_index: Optional[CandidateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_candidate_index() -> CandidateIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CandidateIndex(settings.candidate_index_path or None)
+    return _index
+
+
+def index_candidate(candidate_id: str, blocks: SemanticBlocks) -> None:
+    """Embed and persist one analyzed CV (blocking; run in a worker thread)."""
+    index = get_candidate_index()
+    index.add(candidate_id, blocks)
+    index.maybe_compact()
+
+
+def remove_candidate(candidate_id: str) -> bool:
+    index = get_candidate_index()
+    removed = index.remove(candidate_id)
+    if removed:
+        index.maybe_compact()
+    return removed
+
+
+def index_candidates(items: Sequence[Tuple[str, SemanticBlocks]]) -> None:
+    """Bulk insert with one batched embedding call."""
+    if not items:
+        return
+    vectors = cv_block_vectors([b for _, b in items])
+    index = get_candidate_index()
+    index.add_many_vectors([cid for cid, _ in items], vectors)
+    index.maybe_compact()
@@ -1,8 +1,11 @@
+import asyncio
+import contextlib
 import json
 import logging
+import math
 import re
 import traceback
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
@@ -17,6 +20,9 @@ from app.models import (
     ExperienceItem,
     ProjectItem,
 )
+from app.services.admission import AdmissionRejected, admission, get_limiter
+from app.services.cv_segmenter import lite_extraction
+from app.services.llm_router import LLMRoute, LLMRouter, get_llm_router
 from app.services.semantic_matcher import (
     SEMANTIC_METRIC_GUIDES,
     SemanticMatchResult,
@@ -24,10 +30,26 @@ from app.services.semantic_matcher import (
     normalized_semantic_weights,
 )
 from app.services.match_explainer import explain_match_score
+from app.services.requirement_coverage import RequirementCoverage, compute_requirement_coverage
+from app.utils.incremental_json import IncrementalJSONObjectParser
+from app.utils.metrics import REGISTRY
+from app.utils.skill_matcher import extract_skills
+from app.utils.stage_metrics import set_stage_labels, stage as timed_stage
+from app.utils.text_chunks import split_into_chunks
 from app.utils.text_preprocess import normalize_text_for_pipeline
 
 logger = logging.getLogger(__name__)
 
+_EXTRACTION_PATH = REGISTRY.counter(
+    "cv_extraction_path_total",
+    "Extraction calls by model, mode (sequential, speculative) and the path that produced the result "
+    "(structured, raw_json, none).",
+    ("model", "mode", "path"),
+)
+
+# Progress hook: called with a stage name and a JSON-serializable partial payload as the pipeline advances.
+StageCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
 _HUMAN_PROMPT = (
     "Поверни ПОВНИЙ JSON з ключами (англійською, як у схемі): skills, experience, certificates, education, projects, "
     "analysis, matched_competencies, missing_competencies, match_score (null), "
@@ -181,15 +203,216 @@ def _is_extraction_empty(result: CVAnalysisOutput) -> bool:
     )
 
 
+# Fields that decide _is_extraction_empty; the schema orders them before analysis/recommendations.
+_EXTRACTION_FIELDS = ("skills", "experience", "certificates", "education", "projects", "analysis")
+
+
+def _streamed_extraction_is_empty(fields: Dict[str, Any]) -> bool:
+    """True once every extraction field has closed and all of them are empty."""
+    return all(name in fields for name in _EXTRACTION_FIELDS) and not any(
+        fields[name] for name in _EXTRACTION_FIELDS
+    )
+
+
+_CHUNK_NOTE = (
+    "[Фрагмент {index} з {total} довгого резюме. Витягни лише дані, наявні в цьому фрагменті; "
+    "сусідні фрагменти обробляються окремо.]\n\n"
+)
+
+
+def _use_map_reduce(cv_text: str) -> bool:
+    threshold = settings.llm_chunk_threshold_chars
+    return threshold > 0 and len(cv_text) > threshold
+
+
+def _dedupe_key(text: Optional[str]) -> str:
+    return " ".join((text or "").split()).casefold()
+
+
+def _dedupe_strings(values: List[str]) -> List[str]:
+    seen = set()
+    out: List[str] = []
+    for v in values:
+        key = _dedupe_key(v)
+        if key and key not in seen:
+            seen.add(key)
+            out.append(v.strip())
+    return out
+
+
+def _merge_items(items: List[BaseModel], key_fields: Tuple[str, ...]) -> List[BaseModel]:
+    """Dedupe entries seen by overlapping chunks; the merged entry keeps every non-empty field."""
+    merged: Dict[Tuple[str, ...], BaseModel] = {}
+    for item in items:
+        key = tuple(_dedupe_key(getattr(item, f)) for f in key_fields)
+        if not any(key):
+            key = tuple(_dedupe_key(str(v)) for v in item.model_dump().values())
+            if not any(key):
+                continue
+        prev = merged.get(key)
+        if prev is None:
+            merged[key] = item
+            continue
+        update = {
+            name: value
+            for name, value in item.model_dump().items()
+            if value and len(str(value)) > len(str(getattr(prev, name) or ""))
+        }
+        if update:
+            merged[key] = prev.model_copy(update=update)
+    return list(merged.values())
+
+
+def _merge_analysis(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """First non-empty scalar wins (the first chunk holds the CV header); list values are unioned."""
+    out: Dict[str, Any] = {}
+    for part in parts:
+        for k, v in (part or {}).items():
+            if isinstance(v, list):
+                prev = out.get(k) if isinstance(out.get(k), list) else []
+                out[k] = _dedupe_strings([str(x) for x in prev + v])
+            elif v not in (None, "", {}) and out.get(k) in (None, "", {}):
+                out[k] = v
+    return out
+
+
+def _merge_chunk_outputs(outputs: List[CVAnalysisOutput]) -> CVAnalysisOutput:
+    """Reduce step of map-reduce extraction: union and dedupe the per-chunk extractions."""
+    matched = _dedupe_strings([c for o in outputs for c in o.matched_competencies or []])
+    matched_keys = {_dedupe_key(c) for c in matched}
+    missing = [
+        c
+        for c in _dedupe_strings([c for o in outputs for c in o.missing_competencies or []])
+        if _dedupe_key(c) not in matched_keys
+    ]
+    recommendations = _dedupe_strings([r for o in outputs for r in o.recommendations or []])
+    return CVAnalysisOutput(
+        skills=_dedupe_strings([s for o in outputs for s in o.skills or []]),
+        experience=_merge_items([e for o in outputs for e in o.experience or []], ("employer", "title")),
+        certificates=_merge_items([c for o in outputs for c in o.certificates or []], ("name", "institution")),
+        education=_merge_items([e for o in outputs for e in o.education or []], ("degree", "institution")),
+        projects=_merge_items([p for o in outputs for p in o.projects or []], ("name", "link")),
+        analysis=_merge_analysis([o.analysis or {} for o in outputs]),
+        recommendations=recommendations or ["Перевірте повноту та структуру резюме."],
+        matched_competencies=matched,
+        missing_competencies=missing,
+    )
+
+
+# Shared chat clients keyed by (backend, model, base_url[, num_ctx]); one ChatOllama per context tier.
+_llm_clients: Dict[Tuple[Any, ...], Any] = {}
+
+
+def _ollama_num_ctx_for(prompt_chars: int) -> int:
+    """Smallest configured context tier that fits the estimated prompt plus the reserved output tokens."""
+    needed = math.ceil(prompt_chars / max(0.5, settings.ollama_chars_per_token)) + settings.ollama_output_tokens
+    for tier in sorted(t for t in settings.ollama_num_ctx_tiers if 0 < t < settings.ollama_num_ctx):
+        if needed <= tier:
+            return tier
+    return settings.ollama_num_ctx
+
+
+def _ollama_client(chat_cls: Any, num_ctx: int, model: Optional[str] = None, base_url: Optional[str] = None) -> Any:
+    model = model or settings.ollama_model
+    key = ("ollama", model, base_url or "", num_ctx)
+    client = _llm_clients.get(key)
+    if client is None:
+        extra = {"base_url": base_url} if base_url else {}
+        client = chat_cls(model=model, temperature=0.2, num_ctx=num_ctx, **extra)
+        _llm_clients[key] = client
+        logger.info("Using Ollama model: %s (num_ctx=%s)", model, num_ctx)
+    return client
+
+
+def _default_ollama_client(prompt_chars: int) -> Any:
+    try:
+        from langchain_ollama import ChatOllama
+    except ImportError:
+        raise ImportError("langchain-ollama package is required for development")
+    return _ollama_client(ChatOllama, _ollama_num_ctx_for(prompt_chars))
+
+
+def _gemini_client(model: str, base_url: Optional[str] = None) -> Any:
+    try:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+    except ImportError:
+        raise ImportError("langchain-google-genai package is required for Gemini routes")
+    key = ("gemini", model, base_url or "")
+    client = _llm_clients.get(key)
+    if client is None:
+        extra = {"base_url": base_url} if base_url else {}
+        client = ChatGoogleGenerativeAI(
+            model=model,
+            google_api_key=settings.gemini_api_key,
+            temperature=0.3,
+            **extra,
+        )
+        _llm_clients[key] = client
+    return client
+
+
+def _ollama_model_class(model_name: str) -> str:
+    """Rough reliability class of an Ollama model tag for JSON-schema output: small, llama3_8b or other."""
+    m = model_name.lower()
+    if any(tok in m for tok in ("3.2", ":3b", "1b", "1.5b", ":2b", "2.3b")) and "8b" not in m and "70b" not in m:
+        return "small"
+    if "llama3" in m and "8b" in m:
+        return "llama3_8b"
+    return "other"
+
+
+# Model classes known to return empty structured output often enough to race the raw-JSON call.
+_UNRELIABLE_OLLAMA_CLASSES = ("small", "llama3_8b")
+
+
+def _speculate_raw_json(model_name: str) -> bool:
+    mode = settings.ollama_speculative_fallback
+    if mode == "off" or model_name in settings.ollama_speculative_skip_models:
+        return False
+    return mode == "always" or _ollama_model_class(model_name) in _UNRELIABLE_OLLAMA_CLASSES
+
+
+def _admission_unless_held(stage: str, slot_held: bool) -> Any:
+    """Admission slot for one LLM call, or nothing when the caller already holds one for it."""
+    return contextlib.nullcontext() if slot_held else admission(stage)
+
+
+async def _first_usable(calls: Dict[str, Awaitable[Optional[CVAnalysisOutput]]]) -> Tuple[str, Optional[CVAnalysisOutput]]:
+    """Run the calls concurrently; the first non-None result wins and the rest are cancelled.
+
+    Returns (name, result), or ("none", None) when every call came back empty. If every call failed
+    or came back empty and at least one raised, the first exception is re-raised.
+    """
+    tasks = {asyncio.ensure_future(coro): name for name, coro in calls.items()}
+    first_error: Optional[BaseException] = None
+    try:
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks.pop(task)
+                if task.exception() is not None:
+                    logger.warning("Speculative extraction: %s failed: %s", name, task.exception())
+                    first_error = first_error or task.exception()
+                elif task.result() is not None:
+                    return name, task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+    if first_error is not None:
+        raise first_error
+    return "none", None
+
+
 def _ollama_empty_extraction_hint(model_name: str) -> str:
     """Hints that do not suggest the same model tag the user already runs."""
-    m = model_name.lower()
+    model_class = _ollama_model_class(model_name)
     parts: List[str] = []
-    small = any(tok in m for tok in ("3.2", ":3b", "1b", "1.5b", ":2b", "2.3b")) and "8b" not in m and "70b" not in m
-    if small:
+    if model_class == "small":
         parts.append("Малі моделі часто не справляються зі складними JSON-схемами.")
         parts.append("Спробуйте OLLAMA_MODEL=llama3:8b або llama3.1:8b (ollama pull …).")
-    elif "llama3" in m and "8b" in m:
+    elif model_class == "llama3_8b":
         parts.append("Навіть llama3:8b іноді повертає порожній структурований вивід (Ollama + LangChain JSON schema).")
         parts.append(
             "Спробуйте: mistral / qwen2.5 / llama3.1:8b; оновіть Ollama та перезавантажте модель; або ENVIRONMENT=production з GEMINI_API_KEY."
@@ -292,7 +515,6 @@ def _build_success_response(
     semantic_weights: Optional[Dict[str, float]] = None
     semantic_metric_guides: Optional[Dict[str, str]] = None
     semantic_pipeline_failed = False
-    match_explainability = None
 
     job_stripped = (job_description or "").strip()
     if job_stripped and settings.use_semantic_matching:
@@ -315,18 +537,6 @@ def _build_success_response(
             semantic_weights = {"skills": ws, "experience": we, "overall": wo}
             semantic_metric_guides = dict(SEMANTIC_METRIC_GUIDES)
             match_reason = _semantic_reasoning_text(sem)
-            try:
-                match_explainability = explain_match_score(
-                    sem=sem,
-                    skills=result.skills or [],
-                    experience=result.experience,
-                    cv_experience_text=cv_exp or cv_text[:8000],
-                    cv_full_text=cv_text,
-                    job_requirements_text=job_stripped,
-                    job_full_text=job_stripped,
-                )
-            except Exception:
-                logger.warning("Match explainability failed; continuing without SHAP/LIME", exc_info=True)
             logger.info(
                 "Semantic match score=%.3f (skills=%.3f exp=%.3f overall=%.3f)",
                 sem.score,
@@ -340,6 +550,17 @@ def _build_success_response(
             match_score = result.match_score
             match_reason = result.match_score_reasoning
 
+    coverage: Optional[RequirementCoverage] = None
+    if job_stripped and settings.use_requirement_coverage:
+        try:
+            exp_lines = [l for l in _experience_text_from_result(result).splitlines() if l.strip()]
+            coverage = compute_requirement_coverage(job_stripped, result.skills or [], exp_lines, cv_text)
+            if not matched and not missing and coverage.items:
+                # No-LLM fallback: the model left both lists empty.
+                matched, missing = coverage.matched, coverage.missing
+        except Exception:
+            logger.exception("Requirement coverage failed")
+
     resp = CVAnalysisResponse(
         success=True,
         extracted_text=cv_text,
@@ -358,12 +579,68 @@ def _build_success_response(
         semantic_weights=semantic_weights,
         semantic_metric_guides=semantic_metric_guides,
         semantic_score_narrative=None,
-        match_explainability=match_explainability,
+        match_explainability=None,
+        requirement_coverage=coverage.items if coverage is not None else None,
         error=None,
     )
     return resp, semantic_pipeline_failed
 
 
+def _attach_match_explainability(
+    resp: CVAnalysisResponse,
+    cv_text: str,
+    result: CVAnalysisOutput,
+    job_description: Optional[str],
+) -> CVAnalysisResponse:
+    sb = resp.semantic_breakdown
+    job_stripped = (job_description or "").strip()
+    if not sb or resp.match_score is None or not job_stripped:
+        return resp
+    sem = SemanticMatchResult(
+        score=float(resp.match_score),
+        skills_similarity=float(sb.get("skills_similarity", 0.0)),
+        experience_similarity=float(sb.get("experience_similarity", 0.0)),
+        overall_similarity=float(sb.get("overall_similarity", 0.0)),
+    )
+    cv_exp = _experience_text_from_result(result)
+    try:
+        match_explainability = explain_match_score(
+            sem=sem,
+            skills=result.skills or [],
+            experience=result.experience,
+            cv_experience_text=cv_exp or cv_text[:8000],
+            cv_full_text=cv_text,
+            job_requirements_text=job_stripped,
+            job_full_text=job_stripped,
+        )
+    except Exception:
+        logger.warning("Match explainability failed; continuing without SHAP/LIME", exc_info=True)
+        return resp
+    return resp.model_copy(update={"match_explainability": match_explainability})
+
+
+# Response fields reported by the "semantic" progress stage.
+_SEMANTIC_STAGE_FIELDS = {
+    "match_score",
+    "match_score_reasoning",
+    "semantic_breakdown",
+    "semantic_weights",
+    "semantic_metric_guides",
+    "requirement_coverage",
+    "matched_competencies",
+    "missing_competencies",
+}
+
+
+async def _emit_stage(on_stage: Optional[StageCallback], stage: str, payload: Dict[str, Any]) -> None:
+    if on_stage is None:
+        return
+    try:
+        await on_stage(stage, payload)
+    except Exception:
+        logger.warning("Stage callback failed for %s", stage, exc_info=True)
+
+
 def _job_section(job_description: Optional[str]) -> str:
     if job_description and job_description.strip():
         return (
@@ -380,10 +657,27 @@ def _job_section(job_description: Optional[str]) -> str:
     )
 
 
+def _llm_prompt_chars(cv_text: str, cv_text_for_prompt: str, job_description: Optional[str]) -> int:
+    """Longest prompt (chars) one LLM call of this analysis will send."""
+    if _use_map_reduce(cv_text):
+        # The full CV is never truncated in this mode; each call only sees one chunk.
+        prompt_cv_chars = min(len(cv_text), settings.llm_chunk_chars) + len(_CHUNK_NOTE)
+    else:
+        prompt_cv_chars = len(cv_text_for_prompt)
+    jd_chars = len((job_description or "").strip())
+    # Follow-up calls (narrative, fallback score) reuse the same client with up to 6000-char excerpts.
+    return max(
+        len(_CV_ANALYZER_SYSTEM) + len(_HUMAN_PROMPT) + prompt_cv_chars + len(_job_section(job_description)),
+        len(_FALLBACK_MATCH_SCORE_SYSTEM) + min(len(cv_text), 6000) + min(jd_chars, 6000),
+    )
+
+
 class CVAnalyzer:
     def __init__(self) -> None:
         self._ollama_llm = None
         self._gemini_llm = None
+        # Admission-control stage for this analyzer's LLM calls (see admission.py).
+        self._llm_stage = "ollama" if settings.environment == "development" else "gemini"
 
     async def _enrich_semantic_score_narrative(
         self,
@@ -418,9 +712,10 @@ class CVAnalyzer:
             "Напиши пояснення для кандидата згідно з інструкціями."
         )
         try:
-            out = await raw_llm.ainvoke(
-                [SystemMessage(content=_SEMANTIC_NARRATIVE_SYSTEM), HumanMessage(content=human)]
-            )
+            async with admission(self._llm_stage):
+                out = await raw_llm.ainvoke(
+                    [SystemMessage(content=_SEMANTIC_NARRATIVE_SYSTEM), HumanMessage(content=human)]
+                )
             text = _llm_message_text(out).strip()
             if not text:
                 return resp
@@ -450,12 +745,13 @@ class CVAnalyzer:
         )
         structured = raw_llm.with_structured_output(MatchScoreFallbackOutput)
         try:
-            out = await structured.ainvoke(
-                [
-                    SystemMessage(content=_FALLBACK_MATCH_SCORE_SYSTEM),
-                    HumanMessage(content=human),
-                ]
-            )
+            async with admission(self._llm_stage):
+                out = await structured.ainvoke(
+                    [
+                        SystemMessage(content=_FALLBACK_MATCH_SCORE_SYSTEM),
+                        HumanMessage(content=human),
+                    ]
+                )
             reason = (out.match_score_reasoning or "").strip()
             if not reason:
                 return resp
@@ -473,22 +769,53 @@ class CVAnalyzer:
         self,
         cv_text: str,
         request: Optional[CVAnalysisRequest] = None,
+        on_stage: Optional[StageCallback] = None,
     ) -> CVAnalysisResponse:
         cv_text = normalize_text_for_pipeline(cv_text or "")
         job = request.job_description if request else None
         if job:
             job = normalize_text_for_pipeline(job)
 
+        if request is not None and request.analysis_mode == "lite":
+            return await self._analyze_lite(cv_text, job, on_stage=on_stage)
+        router = get_llm_router()
+        if router is not None:
+            return await self._analyze_routed(router, cv_text, job, on_stage=on_stage)
         if settings.environment == "development":
-            return await self._analyze_with_ollama(cv_text, job)
-        return await self._analyze_with_gemini(cv_text, job)
+            return await self._analyze_with_ollama(cv_text, job, on_stage=on_stage)
+        return await self._analyze_with_gemini(cv_text, job, on_stage=on_stage)
+
+    async def _analyze_lite(
+        self,
+        cv_text: str,
+        job_description: Optional[str],
+        on_stage: Optional[StageCallback] = None,
+    ) -> CVAnalysisResponse:
+        """No-LLM pre-screening: rule-based segmentation, then the semantic match and requirement coverage only."""
+        set_stage_labels(backend="lite", model="rules")
+        with timed_stage("lite_extraction"):
+            result = CVAnalysisOutput(**await asyncio.to_thread(lite_extraction, cv_text))
+        await _emit_stage(
+            on_stage,
+            "extraction",
+            result.model_dump(mode="json", exclude={"match_score", "match_score_reasoning"}),
+        )
+        async with admission("embeddings"):
+            with timed_stage("embeddings"):
+                built, _ = await asyncio.to_thread(_build_success_response, cv_text, result, job_description)
+        await _emit_stage(on_stage, "semantic", built.model_dump(mode="json", include=_SEMANTIC_STAGE_FIELDS))
+        return built
 
     async def _ollama_raw_json_fallback(
         self,
         cv_text_for_prompt: str,
         job_description_section: str,
+        *,
+        llm: Any = None,
+        slot_held: bool = False,
     ) -> Optional[CVAnalysisOutput]:
-        if not self._ollama_llm:
+        llm = llm or self._ollama_llm
+        if not llm:
             return None
         sys_content = f"{_OLLAMA_FALLBACK_SYSTEM}\n\n{_OLLAMA_FALLBACK_RULES}"
         human_content = _OLLAMA_FALLBACK_HUMAN.format(
@@ -500,7 +827,11 @@ class CVAnalyzer:
             HumanMessage(content=human_content),
         ]
         try:
-            resp = await self._ollama_llm.ainvoke(messages)
+            async with _admission_unless_held("ollama", slot_held):
+                with timed_stage("ollama_fallback"):
+                    resp = await llm.ainvoke(messages)
+        except AdmissionRejected:
+            raise
         except Exception:
             logger.exception("Ollama JSON fallback: invoke failed")
             return None
@@ -524,72 +855,345 @@ class CVAnalyzer:
             return None
         return _cv_output_from_parsed_dict(blob)
 
-    async def _run_structured_chain(
+    async def _finish_success(
         self,
         cv_text: str,
         cv_text_for_prompt: str,
+        result: CVAnalysisOutput,
         job_description: Optional[str],
+        raw_llm: Any,
+        on_stage: Optional[StageCallback] = None,
+    ) -> CVAnalysisResponse:
+        if not result.skills and settings.use_skill_matcher:
+            skills = await asyncio.to_thread(extract_skills, cv_text)
+            if skills:
+                logger.info("LLM returned no skills; %d filled from the skill dictionary", len(skills))
+                result = result.model_copy(update={"skills": skills})
+        await _emit_stage(
+            on_stage,
+            "extraction",
+            result.model_dump(mode="json", exclude={"match_score", "match_score_reasoning"}),
+        )
+        # CPU-bound stages run off the event loop so progress events can be flushed in between.
+        async with admission("embeddings"):
+            with timed_stage("embeddings"):
+                built, sem_failed = await asyncio.to_thread(_build_success_response, cv_text, result, job_description)
+        if sem_failed:
+            built = await self._llm_fallback_match_score(built, raw_llm, cv_text_for_prompt, job_description)
+        await _emit_stage(
+            on_stage,
+            "semantic",
+            built.model_dump(mode="json", include=_SEMANTIC_STAGE_FIELDS),
+        )
+        async with admission("explainer"):
+            built = await asyncio.to_thread(_attach_match_explainability, built, cv_text, result, job_description)
+        await _emit_stage(on_stage, "explainability", built.model_dump(mode="json", include={"match_explainability"}))
+        with timed_stage("narrative"):
+            built = await self._enrich_semantic_score_narrative(built, raw_llm, job_description, cv_text_for_prompt)
+        await _emit_stage(on_stage, "narrative", built.model_dump(mode="json", include={"semantic_score_narrative"}))
+        return built
+
+    async def _stream_structured_extraction(
+        self,
+        messages: List[Any],
+        on_stage: Optional[StageCallback] = None,
+        *,
+        llm: Any = None,
+    ) -> Optional[CVAnalysisOutput]:
+        """Stream the schema-constrained Ollama reply; None when it is malformed or empty (abort early)."""
+        llm = (llm or self._ollama_llm).bind(format=CVAnalysisOutput.model_json_schema())
+        parser = IncrementalJSONObjectParser()
+        stream = llm.astream(messages)
+        try:
+            async for chunk in stream:
+                for field, value in parser.feed(_llm_message_text(chunk)):
+                    await _emit_stage(on_stage, "extraction_field", {"field": field, "value": value})
+                if parser.error:
+                    logger.warning(
+                        "Ollama stream: malformed JSON after %d chars (%s); aborting", parser.consumed_chars, parser.error
+                    )
+                    return None
+                if _streamed_extraction_is_empty(parser.fields):
+                    logger.warning(
+                        "Ollama stream: extraction fields empty after %d chars; aborting", parser.consumed_chars
+                    )
+                    return None
+                if parser.done:
+                    break
+        finally:
+            await stream.aclose()
+        if not parser.done:
+            logger.warning("Ollama stream: JSON object not closed after %d chars", parser.consumed_chars)
+            return None
+        return _cv_output_from_parsed_dict(parser.fields)
+
+    async def _extract_structured(
+        self,
+        cv_text_for_prompt: str,
+        job_description_section: str,
         structured_llm: Any,
         raw_llm: Any,
-        backend: str,
-        model_name: str,
         *,
         ollama_json_fallback: bool = False,
-    ) -> CVAnalysisResponse:
-        job_description_section = _job_section(job_description)
+        on_stage: Optional[StageCallback] = None,
+        stage: Optional[str] = None,
+    ) -> Optional[CVAnalysisOutput]:
+        """One extraction call (streamed for Ollama) plus the raw-JSON fallback; None when nothing usable came back."""
         prompt_template = ChatPromptTemplate.from_messages(
             [
                 ("system", _CV_ANALYZER_SYSTEM),
                 ("human", _HUMAN_PROMPT),
             ]
         )
-        try:
-            chain = prompt_template | structured_llm
-            result: CVAnalysisOutput = await chain.ainvoke(
-                {
-                    "cv_text": cv_text_for_prompt,
-                    "job_description_section": job_description_section,
-                }
-            )
+        prompt_inputs = {
+            "cv_text": cv_text_for_prompt,
+            "job_description_section": job_description_section,
+        }
+        model_name = str(getattr(raw_llm, "model", "") or "")
+
+        llm_stage = stage or self._llm_stage
+
+        async def structured(slot_held: bool = False) -> Optional[CVAnalysisOutput]:
+            result: Optional[CVAnalysisOutput]
+            async with _admission_unless_held(llm_stage, slot_held):
+                if ollama_json_fallback and settings.ollama_stream_extraction and raw_llm is not None:
+                    result = await self._stream_structured_extraction(
+                        prompt_template.format_messages(**prompt_inputs), on_stage, llm=raw_llm
+                    )
+                else:
+                    chain = prompt_template | structured_llm
+                    result = await chain.ainvoke(prompt_inputs)
+            if result is None:
+                return None
             result, incomplete = _normalize_llm_result(result)
             if incomplete:
                 logger.warning("LLM returned incomplete response; filled defaults.")
-            if _is_extraction_empty(result):
-                if ollama_json_fallback and self._ollama_llm is not None:
-                    fb = await self._ollama_raw_json_fallback(
-                        cv_text_for_prompt,
-                        job_description_section,
-                    )
-                    if fb is not None:
-                        fb, _fb_inc = _normalize_llm_result(fb)
-                        if not _is_extraction_empty(fb):
-                            logger.info("Ollama: recovered via raw JSON fallback after empty structured output")
-                            built, sem_failed = _build_success_response(cv_text, fb, job_description)
-                            if sem_failed:
-                                built = await self._llm_fallback_match_score(
-                                    built, raw_llm, cv_text_for_prompt, job_description
-                                )
-                            return await self._enrich_semantic_score_narrative(
-                                built, raw_llm, job_description, cv_text_for_prompt
-                            )
-                return CVAnalysisResponse(
-                    success=False,
-                    extracted_text=cv_text,
-                    error=_empty_extraction_error(
-                        backend,
-                        model_name,
-                        len(cv_text_for_prompt),
-                        len(cv_text),
-                    ),
+            return None if _is_extraction_empty(result) else result
+
+        async def raw_json(slot_held: bool = False) -> Optional[CVAnalysisOutput]:
+            fb = await self._ollama_raw_json_fallback(
+                cv_text_for_prompt, job_description_section, llm=raw_llm, slot_held=slot_held
+            )
+            if fb is None:
+                return None
+            fb, _fb_inc = _normalize_llm_result(fb)
+            return None if _is_extraction_empty(fb) else fb
+
+        if ollama_json_fallback and raw_llm is not None and _speculate_raw_json(model_name):
+            # One slot for the race, so speculation does not take twice the request's share of the backend.
+            async with admission(llm_stage):
+                path, result = await _first_usable(
+                    {"structured": structured(slot_held=True), "raw_json": raw_json(slot_held=True)}
+                )
+            _EXTRACTION_PATH.inc(model=model_name, mode="speculative", path=path)
+            return result
+
+        result = await structured()
+        if result is not None:
+            _EXTRACTION_PATH.inc(model=model_name, mode="sequential", path="structured")
+            return result
+        if ollama_json_fallback and raw_llm is not None:
+            fb = await raw_json()
+            if fb is not None:
+                logger.info("Ollama: recovered via raw JSON fallback after empty structured output")
+                _EXTRACTION_PATH.inc(model=model_name, mode="sequential", path="raw_json")
+                return fb
+        _EXTRACTION_PATH.inc(model=model_name, mode="sequential", path="none")
+        return None
+
+    async def _extract_map_reduce(
+        self,
+        cv_text: str,
+        job_description_section: str,
+        structured_llm: Any,
+        raw_llm: Any,
+        *,
+        ollama_json_fallback: bool = False,
+        stage: Optional[str] = None,
+    ) -> Optional[CVAnalysisOutput]:
+        """Extract each chunk of a long CV concurrently (small context per call) and merge the results."""
+        chunks = split_into_chunks(cv_text, settings.llm_chunk_chars, settings.llm_chunk_overlap_chars)
+        logger.info("Map-reduce extraction: %d chars in %d chunks", len(cv_text), len(chunks))
+        # At most as many chunks in flight as the stage has admission slots: the rest wait here, not in
+        # the admission queue, so a long CV cannot time out or overflow that queue on its own.
+        slots = get_limiter(stage or self._llm_stage).max_concurrency
+        fan_out = asyncio.Semaphore(max(1, slots if slots > 0 else len(chunks)))
+
+        async def extract_chunk(i: int, chunk: str) -> Optional[CVAnalysisOutput]:
+            async with fan_out:
+                return await self._extract_structured(
+                    _CHUNK_NOTE.format(index=i + 1, total=len(chunks)) + chunk,
+                    job_description_section,
+                    structured_llm,
+                    raw_llm,
+                    ollama_json_fallback=ollama_json_fallback,
+                    stage=stage,
                 )
-            built, sem_failed = _build_success_response(cv_text, result, job_description)
-            if sem_failed:
-                built = await self._llm_fallback_match_score(
-                    built, raw_llm, cv_text_for_prompt, job_description
+
+        outcomes = await asyncio.gather(
+            *(extract_chunk(i, chunk) for i, chunk in enumerate(chunks)),
+            return_exceptions=True,
+        )
+        outputs: List[CVAnalysisOutput] = []
+        for i, outcome in enumerate(outcomes):
+            if isinstance(outcome, AdmissionRejected):
+                raise outcome
+            if isinstance(outcome, BaseException):
+                logger.warning("Map-reduce extraction: chunk %d/%d failed: %s", i + 1, len(chunks), outcome)
+            elif outcome is None:
+                logger.warning("Map-reduce extraction: chunk %d/%d returned nothing", i + 1, len(chunks))
+            else:
+                outputs.append(outcome)
+        if not outputs:
+            return None
+        return _merge_chunk_outputs(outputs)
+
+    async def _extract(
+        self,
+        cv_text: str,
+        cv_text_for_prompt: str,
+        job_description_section: str,
+        structured_llm: Any,
+        raw_llm: Any,
+        *,
+        ollama_json_fallback: bool = False,
+        on_stage: Optional[StageCallback] = None,
+        stage: Optional[str] = None,
+    ) -> Optional[CVAnalysisOutput]:
+        with timed_stage("llm_extraction"):
+            if _use_map_reduce(cv_text):
+                return await self._extract_map_reduce(
+                    cv_text,
+                    job_description_section,
+                    structured_llm,
+                    raw_llm,
+                    ollama_json_fallback=ollama_json_fallback,
+                    stage=stage,
                 )
-            return await self._enrich_semantic_score_narrative(
-                built, raw_llm, job_description, cv_text_for_prompt
+            return await self._extract_structured(
+                cv_text_for_prompt,
+                job_description_section,
+                structured_llm,
+                raw_llm,
+                ollama_json_fallback=ollama_json_fallback,
+                on_stage=on_stage,
+                stage=stage,
+            )
+
+    async def _respond(
+        self,
+        cv_text: str,
+        cv_text_for_prompt: str,
+        job_description: Optional[str],
+        result: Optional[CVAnalysisOutput],
+        raw_llm: Any,
+        backend: str,
+        model_name: str,
+        on_stage: Optional[StageCallback] = None,
+    ) -> CVAnalysisResponse:
+        set_stage_labels(backend=backend, model=model_name)
+        if result is None:
+            return CVAnalysisResponse(
+                success=False,
+                extracted_text=cv_text,
+                error=_empty_extraction_error(
+                    backend,
+                    model_name,
+                    len(cv_text_for_prompt),
+                    len(cv_text),
+                ),
+            )
+        return await self._finish_success(cv_text, cv_text_for_prompt, result, job_description, raw_llm, on_stage)
+
+    async def _run_structured_chain(
+        self,
+        cv_text: str,
+        cv_text_for_prompt: str,
+        job_description: Optional[str],
+        structured_llm: Any,
+        raw_llm: Any,
+        backend: str,
+        model_name: str,
+        *,
+        ollama_json_fallback: bool = False,
+        on_stage: Optional[StageCallback] = None,
+    ) -> CVAnalysisResponse:
+        set_stage_labels(backend=backend, model=model_name)
+        try:
+            result = await self._extract(
+                cv_text,
+                cv_text_for_prompt,
+                _job_section(job_description),
+                structured_llm,
+                raw_llm,
+                ollama_json_fallback=ollama_json_fallback,
+                on_stage=on_stage,
+            )
+            return await self._respond(
+                cv_text, cv_text_for_prompt, job_description, result, raw_llm, backend, model_name, on_stage
+            )
+        except AdmissionRejected:
+            raise
+        except Exception as e:
+            error_msg = f"Помилка аналізу: {e!s}\n{traceback.format_exc()}"
+            return CVAnalysisResponse(success=False, extracted_text=cv_text, error=error_msg)
+
+    def _route_client(self, route: LLMRoute, prompt_chars: int) -> Any:
+        if route.backend == "ollama":
+            try:
+                from langchain_ollama import ChatOllama
+            except ImportError:
+                raise ImportError("langchain-ollama package is required for Ollama routes")
+            num_ctx = route.num_ctx or _ollama_num_ctx_for(prompt_chars)
+            return _ollama_client(ChatOllama, num_ctx, model=route.model, base_url=route.base_url)
+        return _gemini_client(route.model, route.base_url)
+
+    async def _analyze_routed(
+        self,
+        router: LLMRouter,
+        cv_text: str,
+        job_description: Optional[str] = None,
+        on_stage: Optional[StageCallback] = None,
+    ) -> CVAnalysisResponse:
+        cv_text_for_prompt = cv_text if _use_map_reduce(cv_text) else self._cv_text_for_prompt(cv_text)
+        prompt_chars = _llm_prompt_chars(cv_text, cv_text_for_prompt, job_description)
+        plan = router.plan(prompt_chars)
+        job_description_section = _job_section(job_description)
+        # Two hedged streams would interleave their field events, so only a lone call streams them.
+        stream_to = on_stage if not router.hedge or len(plan) < 2 else None
+
+        async def extract(route: LLMRoute) -> Tuple[Optional[CVAnalysisOutput], Any]:
+            # First use imports the client library and builds an HTTP client with an SSL context: off the loop.
+            llm = await asyncio.to_thread(self._route_client, route, prompt_chars)
+            result = await self._extract(
+                cv_text,
+                cv_text_for_prompt,
+                job_description_section,
+                llm.with_structured_output(CVAnalysisOutput),
+                llm,
+                ollama_json_fallback=route.backend == "ollama",
+                on_stage=stream_to,
+                stage=route.backend,
+            )
+            return result, llm
+
+        try:
+            route, outcome = await router.run(plan, extract, accept=lambda out: out[0] is not None)
+            result, llm = outcome if outcome is not None else (None, None)
+            # Follow-up calls (narrative, fallback score) go to the backend that won.
+            self._llm_stage = route.backend
+            return await self._respond(
+                cv_text,
+                cv_text_for_prompt,
+                job_description,
+                result,
+                llm,
+                route.backend.capitalize(),
+                route.model,
+                on_stage,
             )
+        except AdmissionRejected:
+            raise
         except Exception as e:
             error_msg = f"Помилка аналізу: {e!s}\n{traceback.format_exc()}"
             return CVAnalysisResponse(success=False, extracted_text=cv_text, error=error_msg)
@@ -608,56 +1212,36 @@ class CVAnalyzer:
         self,
         cv_text: str,
         job_description: Optional[str] = None,
+        on_stage: Optional[StageCallback] = None,
     ) -> CVAnalysisResponse:
-        try:
-            from langchain_ollama import ChatOllama
-        except ImportError:
-            raise ImportError("langchain-ollama package is required for development")
+        cv_text_for_prompt = cv_text if _use_map_reduce(cv_text) else self._cv_text_for_prompt(cv_text)
+        prompt_chars = _llm_prompt_chars(cv_text, cv_text_for_prompt, job_description)
+        llm = await asyncio.to_thread(_default_ollama_client, prompt_chars)
+        self._ollama_llm = llm
 
-        cv_text_for_prompt = self._cv_text_for_prompt(cv_text)
-
-        if not self._ollama_llm:
-            self._ollama_llm = ChatOllama(
-                model=settings.ollama_model,
-                temperature=0.2,
-                num_ctx=settings.ollama_num_ctx,
-            )
-            logger.info(
-                "Using Ollama model: %s (num_ctx=%s)",
-                settings.ollama_model,
-                settings.ollama_num_ctx,
-            )
-
-        structured_llm = self._ollama_llm.with_structured_output(CVAnalysisOutput)
+        structured_llm = llm.with_structured_output(CVAnalysisOutput)
         return await self._run_structured_chain(
             cv_text,
             cv_text_for_prompt,
             job_description,
             structured_llm,
-            self._ollama_llm,
+            llm,
             "Ollama",
             settings.ollama_model,
             ollama_json_fallback=True,
+            on_stage=on_stage,
         )
 
     async def _analyze_with_gemini(
         self,
         cv_text: str,
         job_description: Optional[str] = None,
+        on_stage: Optional[StageCallback] = None,
     ) -> CVAnalysisResponse:
-        try:
-            from langchain_google_genai import ChatGoogleGenerativeAI
-        except ImportError:
-            raise ImportError("langchain-google-genai package is required for production")
-
-        cv_text_for_prompt = self._cv_text_for_prompt(cv_text)
+        cv_text_for_prompt = cv_text if _use_map_reduce(cv_text) else self._cv_text_for_prompt(cv_text)
 
         if not self._gemini_llm:
-            self._gemini_llm = ChatGoogleGenerativeAI(
-                model="gemini-2.5-flash",
-                google_api_key=settings.gemini_api_key,
-                temperature=0.3,
-            )
+            self._gemini_llm = await asyncio.to_thread(_gemini_client, "gemini-2.5-flash")
 
         structured_llm = self._gemini_llm.with_structured_output(CVAnalysisOutput)
         return await self._run_structured_chain(
@@ -668,4 +1252,5 @@ class CVAnalyzer:
             self._gemini_llm,
             "Gemini",
             "gemini-2.5-flash",
+            on_stage=on_stage,
         )
@@ -0,0 +1,178 @@
+"""Batched ranking in both directions.
+
+rank_candidates: many CVs against one vacancy (embeddings first, LLM analysis only for the shortlist).
+rank_jobs_for_cv: one CV, extracted once, against many vacancies.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from app.config import settings
+from app.models import (
+    CVAnalysisRequest,
+    CVAnalysisResponse,
+    ExperienceItem,
+    JobMatch,
+    JobMatchResponse,
+    RankedCandidate,
+    RankResponse,
+)
+from app.services.admission import AdmissionRejected, admission
+from app.services.cv_analyzer import CVAnalyzer
+from app.services.semantic_matcher import (
+    SemanticBlocks,
+    SemanticMatchResult,
+    normalized_semantic_weights,
+    semantic_match_matrix,
+)
+from app.utils.skill_matcher import extract_skills
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RankCandidate:
+    candidate_id: str
+    cv_text: Optional[str] = None
+    skills: List[str] = field(default_factory=list)
+    experience_text: str = ""
+    error: Optional[str] = None
+
+
+def experience_text_from_items(items: Optional[Sequence[ExperienceItem]]) -> str:
+    lines = []
+    for e in items or []:
+        bits = [x for x in (e.title, e.employer, e.duration) if x]
+        if bits:
+            lines.append(" — ".join(bits))
+    return "\n".join(lines)
+
+
+def candidate_from_analysis(candidate_id: str, cv_text: str, result: Optional[dict]) -> RankCandidate:
+    """Reuse a stored analysis' extraction (skills, experience) when ranking a previously analyzed CV."""
+    if not result:
+        return RankCandidate(candidate_id=candidate_id, cv_text=cv_text)
+    resp = CVAnalysisResponse.model_validate(result)
+    return RankCandidate(
+        candidate_id=candidate_id,
+        cv_text=cv_text,
+        skills=list(resp.skills or []),
+        experience_text=experience_text_from_items(resp.experience),
+    )
+
+
+async def _enrich(candidate: RankCandidate, job_text: str) -> Optional[CVAnalysisResponse]:
+    try:
+        return await CVAnalyzer().analyze_cv(candidate.cv_text or "", CVAnalysisRequest(job_description=job_text))
+    except AdmissionRejected:
+        logger.info("Rank: LLM enrichment for %s shed by admission control", candidate.candidate_id)
+    except Exception:
+        logger.warning("Rank: LLM enrichment failed for %s", candidate.candidate_id, exc_info=True)
+    return None
+
+
+def _skills_or_dictionary(skills: Sequence[str], text: str) -> List[str]:
+    """Extracted skills, or dictionary matches in the raw text when there are none (no LLM needed)."""
+    if skills or not settings.use_skill_matcher:
+        return list(skills)
+    return extract_skills(text)
+
+
+def _score_candidates(candidates: Sequence[RankCandidate], job_text: str) -> List[List[SemanticMatchResult]]:
+    blocks = [
+        SemanticBlocks(
+            skills=_skills_or_dictionary(c.skills, c.cv_text or ""),
+            experience_text=c.experience_text or (c.cv_text or "")[:8000],
+            full_text=c.cv_text or "",
+        )
+        for c in candidates
+    ]
+    return semantic_match_matrix(blocks, [job_text])
+
+
+async def rank_candidates(candidates: Sequence[RankCandidate], job_text: str, top_k: int = 0) -> RankResponse:
+    scorable = [c for c in candidates if c.cv_text and not c.error]
+    matrix: List[List[SemanticMatchResult]] = []
+    if scorable:
+        async with admission("embeddings"):
+            matrix = await asyncio.to_thread(_score_candidates, scorable, job_text)
+
+    scored: List[Tuple[RankCandidate, SemanticMatchResult]] = sorted(
+        ((c, row[0]) for c, row in zip(scorable, matrix)),
+        key=lambda pair: pair[1].score,
+        reverse=True,
+    )
+    ranked = [
+        RankedCandidate(candidate_id=c.candidate_id, rank=1, match_score=sem.score, semantic_breakdown=sem.breakdown())
+        for c, sem in scored
+    ]
+
+    shortlist = min(max(0, top_k), len(ranked))
+    if shortlist:
+        analyses = await asyncio.gather(*(_enrich(c, job_text) for c, _ in scored[:shortlist]))
+        for i, analysis in enumerate(analyses):
+            if analysis is None:
+                continue
+            update = {"analysis": analysis}
+            if analysis.success and analysis.match_score is not None:
+                # The LLM-extracted skills make this score more precise than the pre-screen estimate.
+                update["match_score"] = analysis.match_score
+                update["semantic_breakdown"] = analysis.semantic_breakdown or ranked[i].semantic_breakdown
+            ranked[i] = ranked[i].model_copy(update=update)
+        ranked[:shortlist] = sorted(ranked[:shortlist], key=lambda r: r.match_score or 0.0, reverse=True)
+
+    failed = [
+        RankedCandidate(candidate_id=c.candidate_id, rank=1, error=c.error or "Порожній текст резюме.")
+        for c in candidates
+        if not (c.cv_text and not c.error)
+    ]
+    ordered = ranked + failed
+    ws, we, wo = normalized_semantic_weights()
+    return RankResponse(
+        candidates=[r.model_copy(update={"rank": i + 1}) for i, r in enumerate(ordered)],
+        semantic_weights={"skills": ws, "experience": we, "overall": wo},
+    )
+
+
+@dataclass
+class JobText:
+    job_id: str
+    text: str = ""
+    error: Optional[str] = None
+
+
+async def rank_jobs_for_cv(cv_text: str, jobs: Sequence[JobText]) -> JobMatchResponse:
+    """Extract the CV once with the LLM, embed its blocks once and score them against every job in one pass."""
+    cv_analysis = await CVAnalyzer().analyze_cv(cv_text, None)
+    if not cv_analysis.success:
+        logger.warning("Match jobs: CV extraction failed; scoring with full text only")
+    cv_blocks = SemanticBlocks(
+        skills=_skills_or_dictionary(cv_analysis.skills or [], cv_text),
+        experience_text=experience_text_from_items(cv_analysis.experience) or cv_text[:8000],
+        full_text=cv_text,
+    )
+    scorable = [j for j in jobs if j.text and not j.error]
+    row: List[SemanticMatchResult] = []
+    if scorable:
+        async with admission("embeddings"):
+            matrix = await asyncio.to_thread(semantic_match_matrix, [cv_blocks], [j.text for j in scorable])
+        row = matrix[0]
+
+    scored = sorted(zip(scorable, row), key=lambda pair: pair[1].score, reverse=True)
+    matches = [
+        JobMatch(job_id=j.job_id, rank=1, match_score=sem.score, semantic_breakdown=sem.breakdown())
+        for j, sem in scored
+    ]
+    matches += [
+        JobMatch(job_id=j.job_id, rank=1, error=j.error or "Порожній опис вакансії.")
+        for j in jobs
+        if not (j.text and not j.error)
+    ]
+    ws, we, wo = normalized_semantic_weights()
+    return JobMatchResponse(
+        cv_analysis=cv_analysis,
+        jobs=[m.model_copy(update={"rank": i + 1}) for i, m in enumerate(matches)],
+        semantic_weights={"skills": ws, "experience": we, "overall": wo},
+    )
@@ -0,0 +1,327 @@
+"""Rule-based CV segmentation for the no-LLM "lite" analysis mode.
+
+Section headings (Ukrainian and English) split the CV into experience, education, certificates,
+projects and skills; inside a section, date ranges and keyword heuristics turn lines into the same
+ExperienceItem / EducationItem / CertificateItem / ProjectItem records the LLM path returns. Skills
+come from the skill dictionary (skill_matcher.py). Everything is regex work, milliseconds per CV.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.models import CertificateItem, EducationItem, ExperienceItem, ProjectItem
+from app.utils.skill_matcher import extract_skills
+
+logger = logging.getLogger(__name__)
+
+# Heading keywords per section; "other" headings only close the previous section.
+_HEADINGS: Dict[str, Tuple[str, ...]] = {
+    "experience": (
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "work history", "career history", "relevant experience",
+        "досвід", "досвід роботи", "професійний досвід", "трудова діяльність", "місця роботи", "кар'єра",
+    ),
+    "education": (
+        "education", "academic background", "education and training",
+        "освіта", "навчання", "освіта та навчання",
+    ),
+    "certificates": (
+        "certificates", "certifications", "certificates and courses", "courses", "licenses and certifications",
+        "licenses & certifications", "training", "trainings", "additional education",
+        "сертифікати", "сертифікати та курси", "курси", "курси та сертифікати", "тренінги", "додаткова освіта",
+    ),
+    "projects": (
+        "projects", "pet projects", "personal projects", "side projects", "selected projects", "portfolio",
+        "проєкти", "проекти", "пет-проєкти", "пет-проекти", "pet-проєкти", "особисті проєкти", "портфоліо",
+    ),
+    "skills": (
+        "skills", "technical skills", "hard skills", "key skills", "core skills", "tech stack", "technologies",
+        "навички", "технічні навички", "ключові навички", "професійні навички", "технології", "стек технологій",
+    ),
+    "other": (
+        "summary", "profile", "about", "about me", "objective", "contacts", "contact", "contact information",
+        "languages", "soft skills", "interests", "hobbies", "references", "achievements", "awards",
+        "про мене", "профіль", "мета", "контакти", "контактна інформація", "мови", "знання мов",
+        "особисті якості", "інтереси", "хобі", "досягнення", "нагороди", "рекомендації",
+    ),
+}
+_HEADING_INDEX = {kw: section for section, kws in _HEADINGS.items() for kw in kws}
+
+_BULLET = re.compile(r"^\s*[-–—•*·▪●►✓]\s*")
+_MONTH = (
+    r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|"
+    r"січ|лют|бер|квіт|трав|черв|лип|серп|вер|жовт|лист|груд)[a-zа-яіїєґ]*\.?"
+)
+_DATE = rf"(?:{_MONTH}\s*|\d{{1,2}}[./])?(?:19|20)\d{{2}}"
+_PRESENT = (
+    r"present|now|current|today|до\s+тепер(?:ішнього\s+часу|ішній\s+час)?|теперішній\s+час|"
+    r"по\s+теперішній\s+час|дотепер|досі|нині|зараз"
+)
+_DATE_RANGE = re.compile(rf"\(?\b{_DATE}\s*(?:[-–—]|to|до|по)\s*(?:{_DATE}|{_PRESENT})\b\)?", re.IGNORECASE)
+_YEAR = re.compile(r"\(?\b(?:19|20)\d{2}\b\)?")
+_URL = re.compile(r"(?:https?://|www\.|github\.com/|gitlab\.com/)\S+", re.IGNORECASE)
+# "Title — Company", "Title at Company", "Company | Title", "Title, Company".
+_SEPARATORS = re.compile(r"\s+(?:[-–—|@]|at|в|у)\s+|\s*[|,]\s*", re.IGNORECASE)
+
+_ROLE = re.compile(
+    r"\b(?:developer|engineer|programmer|manager|analyst|designer|lead|intern|trainee|architect|consultant|"
+    r"specialist|administrator|admin|tester|qa|devops|scientist|officer|director|head|cto|ceo|founder|"
+    r"recruiter|assistant|coordinator|owner|"
+    r"розробник\w*|інженер\w*|програміст\w*|менеджер\w*|аналітик\w*|дизайнер\w*|стажер\w*|керівник\w*|"
+    r"тестувальник\w*|адміністратор\w*|архітектор\w*|консультант\w*|фахівець|спеціаліст|директор\w*|"
+    r"засновник\w*|рекрутер\w*|асистент\w*|координатор\w*)\b",
+    re.IGNORECASE,
+)
+_DEGREE = re.compile(
+    r"\b(?:bachelor\w*|master\w*|ph\.?d|mba|b\.?sc|m\.?sc|degree|diploma|associate|"
+    r"бакалавр\w*|магістр\w*|спеціаліст|кандидат\w*|аспірант\w*|доктор\w*|диплом\w*|ступінь)\b",
+    re.IGNORECASE,
+)
+_INSTITUTION = re.compile(
+    r"\b(?:university|universit\w*|institute|college|academy|school|polytechnic|"
+    r"університет\w*|інститут\w*|коледж\w*|академі\w*|ліце\w*|школ\w*|політехні\w*|КПІ|КНУ|ЛНУ|ХНУРЕ)",
+    re.IGNORECASE,
+)
+_ISSUERS = (
+    "Coursera", "Udemy", "edX", "Prometheus", "Projector", "EPAM", "SoftServe", "GlobalLogic", "Google",
+    "Microsoft", "Amazon", "AWS", "Meta", "Cisco", "Oracle", "IBM", "Stanford", "Hillel", "Mate academy",
+    "GoIT", "DataCamp", "Linux Foundation", "Scrum.org", "PMI", "Cambridge", "IELTS", "British Council",
+)
+_ISSUER = re.compile(r"\b(?:" + "|".join(re.escape(i) for i in _ISSUERS) + r")\b", re.IGNORECASE)
+
+# A header line of an entry (title / company / degree) is short and not a sentence.
+_MAX_HEADER_CHARS = 90
+_MAX_HEADER_WORDS = 12
+
+
+@dataclass
+class CVSections:
+    """Raw lines of each recognised section (headings removed)."""
+    experience: List[str] = field(default_factory=list)
+    education: List[str] = field(default_factory=list)
+    certificates: List[str] = field(default_factory=list)
+    projects: List[str] = field(default_factory=list)
+    skills: List[str] = field(default_factory=list)
+    other: List[str] = field(default_factory=list)
+
+    def found(self) -> List[str]:
+        return [name for name in ("experience", "education", "certificates", "projects", "skills") if getattr(self, name)]
+
+
+def _heading(line: str) -> Optional[Tuple[str, str]]:
+    """(section, inline rest) when the line is a section heading, e.g. "Skills: Python, SQL"."""
+    stripped = _BULLET.sub("", line).strip()
+    head, sep, rest = stripped.partition(":")
+    key = " ".join(head.replace("’", "'").split()).strip(" .#*").casefold()
+    if len(key) > 40:
+        return None
+    section = _HEADING_INDEX.get(key)
+    if section is None or (not sep and len(stripped) > len(head)):
+        return None
+    return section, rest.strip()
+
+
+def segment_cv(cv_text: str) -> CVSections:
+    sections = CVSections()
+    current: Optional[str] = None
+    for raw in (cv_text or "").splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        found = _heading(line)
+        if found is not None:
+            current, rest = found
+            if rest:
+                getattr(sections, current).append(rest)
+            continue
+        getattr(sections, current or "other").append(line)
+    return sections
+
+
+def _is_bullet(line: str) -> bool:
+    return bool(_BULLET.match(line))
+
+
+def _is_header(line: str) -> bool:
+    return (
+        not _is_bullet(line)
+        and len(line) <= _MAX_HEADER_CHARS
+        and len(line.split()) <= _MAX_HEADER_WORDS
+        and not line.rstrip().endswith((".", ";"))
+    )
+
+
+def _parts(text: str) -> List[str]:
+    return [p.strip(" ()-–—|,:") for p in _SEPARATORS.split(text) if p and p.strip(" ()-–—|,:")]
+
+
+def _clean_date(match: re.Match) -> str:
+    return " ".join(match.group(0).strip("()").split())
+
+
+def _dated_entries(lines: List[str], date_re: re.Pattern) -> List[Tuple[List[str], Optional[str]]]:
+    """Group section lines into (header parts, date) entries anchored on date lines.
+
+    Up to two header lines right before a date line belong to its entry ("Title\\nCompany\\n2020 - 2023");
+    a date line with no header before it takes the header lines right after it ("2020 - 2023\\nTitle, Company").
+    Bullets and prose lines are descriptions and are skipped. Sections without dates yield one entry per
+    header line.
+    """
+    entries: List[Tuple[List[str], Optional[str]]] = []
+    pending: List[str] = []
+    awaiting: Optional[int] = None
+    for line in lines:
+        match = date_re.search(line)
+        if match:
+            rest = (line[: match.start()] + " " + line[match.end() :]).strip()
+            headers = pending[-2:] + ([rest] if _parts(rest) else [])
+            entries.append(([p for h in headers for p in _parts(h)], _clean_date(match)))
+            awaiting = len(entries) - 1 if not headers else None
+            pending = []
+        elif _is_header(line):
+            if awaiting is not None and len(entries[awaiting][0]) < 2:
+                entries[awaiting][0].extend(_parts(line))
+            else:
+                awaiting = None
+                pending.append(line)
+        else:
+            awaiting = None
+            pending = []
+    if not entries:
+        entries = [(_parts(line), None) for line in lines if _is_header(line) and _parts(line)]
+    return entries
+
+
+def _experience(lines: List[str]) -> List[ExperienceItem]:
+    items: List[ExperienceItem] = []
+    for parts, duration in _dated_entries(lines, _DATE_RANGE):
+        if not parts and not duration:
+            continue
+        role = next((p for p in parts if _ROLE.search(p)), None)
+        title = role or (parts[0] if parts else None)
+        employer = next((p for p in parts if p != title), None)
+        items.append(ExperienceItem(title=title, employer=employer, duration=duration))
+    return items
+
+
+def _education(lines: List[str]) -> List[EducationItem]:
+    date_re = re.compile(f"{_DATE_RANGE.pattern}|{_YEAR.pattern}", re.IGNORECASE)
+    items: List[EducationItem] = []
+    for parts, year in _dated_entries(lines, date_re):
+        institution = next((p for p in parts if _INSTITUTION.search(p)), None)
+        degree = next((p for p in parts if _DEGREE.search(p) and p != institution), None)
+        if degree is None:
+            degree = next((p for p in parts if p != institution), None)
+        if institution or degree:
+            items.append(EducationItem(degree=degree, institution=institution, year=year))
+    return items
+
+
+def _certificates(lines: List[str]) -> List[CertificateItem]:
+    items: List[CertificateItem] = []
+    for line in lines:
+        text = _BULLET.sub("", line).strip()
+        if not text:
+            continue
+        year_match = _DATE_RANGE.search(text) or _YEAR.search(text)
+        if year_match:
+            text = (text[: year_match.start()] + " " + text[year_match.end() :]).strip()
+        parts = [p.strip() for p in re.split(r"\s+[-–—|]\s+|,|\s+by\s+|\(|\)", text) if p.strip()]
+        name = parts[0] if parts else text
+        # The issuer is named after the certificate ("..., Coursera"); the name itself may contain one ("Meta ...").
+        issuer = next((m.group(0) for p in parts[1:] for m in [_ISSUER.search(p)] if m), None)
+        institution = issuer or (parts[1] if len(parts) > 1 else None)
+        items.append(
+            CertificateItem(name=name, institution=institution, year=_clean_date(year_match) if year_match else None)
+        )
+    return items
+
+
+def _projects(lines: List[str]) -> List[ProjectItem]:
+    items: List[ProjectItem] = []
+    name: Optional[str] = None
+    description: List[str] = []
+    link: Optional[str] = None
+
+    def flush() -> None:
+        if name:
+            items.append(ProjectItem(name=name, description=" ".join(description) or None, link=link))
+
+    for line in lines:
+        url = _URL.search(line)
+        text = _BULLET.sub("", _URL.sub("", line)).strip(" -–—|:()")
+        if _is_header(line) and text:
+            flush()
+            sep = re.search(r"\s+[-–—]\s+|:\s+", text)
+            rest = text[sep.end() :].strip() if sep else ""
+            name, description, link = (text[: sep.start()] if sep else text).strip(), [rest] if rest else [], None
+        elif text:
+            description.append(text)
+        if url and name:
+            link = link or url.group(0).rstrip(".,;)")
+    flush()
+    return items
+
+
+def _recommendations(
+    experience: List[ExperienceItem],
+    education: List[EducationItem],
+    projects: List[ProjectItem],
+    skills: List[str],
+    sections: CVSections,
+) -> List[str]:
+    recs: List[str] = []
+    if not experience:
+        recs.append("Додайте розділ «Досвід роботи» з посадами, назвами компаній і періодами роботи.")
+    elif any(not e.duration for e in experience):
+        recs.append("Вкажіть період роботи (місяць і рік початку та завершення) для кожної посади.")
+    if len(skills) < 5:
+        recs.append("Винесіть ключові технології та інструменти в окремий розділ «Навички».")
+    bullets = [l for l in sections.experience if _is_bullet(l) or not _is_header(l)]
+    if experience and not any(re.search(r"\d", l) for l in bullets):
+        recs.append("Додайте вимірювані результати (%, час, кількість користувачів, обсяг даних) до описів досвіду.")
+    if not education:
+        recs.append("Додайте розділ «Освіта» із закладом, спеціальністю та роками навчання.")
+    if not projects:
+        recs.append("Додайте 1–2 проєкти з коротким описом і посиланням (GitHub, портфоліо).")
+    return recs or ["Перегляньте резюме: структура повна, уточніть формулювання досягнень під цільову роль."]
+
+
+def lite_extraction(cv_text: str) -> Dict[str, Any]:
+    """Fields of CVAnalysisOutput extracted without an LLM (see CVAnalyzer._analyze_lite)."""
+    sections = segment_cv(cv_text)
+    experience = _experience(sections.experience)
+    education = _education(sections.education)
+    certificates = _certificates(sections.certificates)
+    projects = _projects(sections.projects)
+    skills = extract_skills(cv_text) if settings.use_skill_matcher else []
+    if not skills:
+        skills = [p for line in sections.skills for p in _parts(_BULLET.sub("", line))]
+    logger.info(
+        "Lite extraction: sections=%s experience=%d education=%d certificates=%d projects=%d skills=%d",
+        sections.found(),
+        len(experience),
+        len(education),
+        len(certificates),
+        len(projects),
+        len(skills),
+    )
+    return {
+        "skills": skills,
+        "experience": experience,
+        "education": education,
+        "certificates": certificates,
+        "projects": projects,
+        "analysis": {
+            "summary": (
+                f"Експрес-аналіз без LLM: посад — {len(experience)}, освіта — {len(education)}, "
+                f"сертифікатів — {len(certificates)}, проєктів — {len(projects)}, навичок — {len(skills)}."
+            ),
+            "mode": "lite",
+            "sections": sections.found(),
+        },
+        "recommendations": _recommendations(experience, education, projects, skills, sections),
+    }
@@ -0,0 +1,147 @@
+"""Cross-request micro-batching in front of the encoder.
+
+Every analysis embeds only a handful of texts, from its own worker thread (scoring runs under
+asyncio.to_thread), so concurrent requests would each run a tiny encode call. A request that finds
+the encoder idle is encoded at once. Requests that arrive while an encode call is running are
+coalesced: the next call takes them together, waiting at most embedding_batch_wait_ms from the first
+one's arrival (usually already over) or until embedding_batch_max_texts are queued. The encode call
+runs on the batcher's own thread and every caller gets its slice of the result. Callers block on a concurrent.futures.Future; async code can await it with
+asyncio.wrap_future.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Deque, List, Optional, Sequence
+
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_BATCH_SIZE = REGISTRY.histogram(
+    "cv_embedding_batch_size",
+    "Texts per encoder call issued by the micro-batcher.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+_BATCH_REQUESTS = REGISTRY.histogram(
+    "cv_embedding_batch_requests",
+    "Caller requests merged into one encoder call.",
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16, 32),
+)
+_QUEUE_WAIT = REGISTRY.histogram(
+    "cv_embedding_batch_queue_wait_seconds",
+    "Time a request waited in the micro-batch queue before its encoder call started.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+
+@dataclass
+class _Request:
+    texts: List[str]
+    future: "Future[List[List[float]]]" = field(default_factory=Future)
+    enqueued: float = field(default_factory=time.monotonic)
+    # Arrived while an encode call was running, so it may wait to be merged with later arrivals.
+    coalesce: bool = False
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        encode: Callable[[List[str]], List[List[float]]],
+        *,
+        max_batch: int = 64,
+        max_wait_s: float = 0.005,
+    ) -> None:
+        self._encode = encode
+        self.max_batch = max(1, max_batch)
+        self.max_wait_s = max(0.0, max_wait_s)
+        self._queue: Deque[_Request] = deque()
+        self._queued_texts = 0
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, texts: Sequence[str]) -> "Future[List[List[float]]]":
+        request = _Request(list(texts))
+        if not request.texts:
+            request.future.set_result([])
+            return request.future
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="embedding-batcher", daemon=True)
+                self._thread.start()
+            request.coalesce = self._busy or bool(self._queue)
+            self._queue.append(request)
+            self._queued_texts += len(request.texts)
+            self._cond.notify()
+        return request.future
+
+    def encode(self, texts: Sequence[str]) -> List[List[float]]:
+        return self.submit(texts).result()
+
+    def _next_batch(self) -> List[_Request]:
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+            # An idle encoder takes the request immediately; only requests queued behind a running call linger.
+            deadline = self._queue[0].enqueued + self.max_wait_s
+            while self._queue[0].coalesce and self._queued_texts < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            # Whole requests only; one oversized request still goes alone (the encoder batches internally).
+            batch = [self._queue.popleft()]
+            size = len(batch[0].texts)
+            while self._queue and size + len(self._queue[0].texts) <= self.max_batch:
+                size += len(self._queue[0].texts)
+                batch.append(self._queue.popleft())
+            self._queued_texts -= size
+            self._busy = True
+            return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._next_batch()
+            started = time.monotonic()
+            flat = [t for r in batch for t in r.texts]
+            for r in batch:
+                _QUEUE_WAIT.observe(started - r.enqueued)
+            _BATCH_SIZE.observe(len(flat))
+            _BATCH_REQUESTS.observe(len(batch))
+            try:
+                vectors = self._encode(flat)
+            except BaseException as e:
+                logger.warning("Embedding batch of %d texts failed: %s", len(flat), e)
+                for r in batch:
+                    r.future.set_exception(e)
+                continue
+            finally:
+                with self._cond:
+                    self._busy = False
+            pos = 0
+            for r in batch:
+                r.future.set_result(list(vectors[pos : pos + len(r.texts)]))
+                pos += len(r.texts)
+
+
+class BatchingEmbedder:
+    """Embedder facade whose encode calls go through a shared MicroBatcher."""
+
+    def __init__(self, inner, batcher: MicroBatcher) -> None:
+        self.inner = inner
+        self.batcher = batcher
+        self.split_windows = getattr(inner, "split_windows", None)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.batcher.encode([text])[0]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.batcher.encode(texts)
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return getattr(self.inner, "dimension", None)
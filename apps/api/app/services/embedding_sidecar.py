@@ -0,0 +1,291 @@
+"""Shared embedding server for multi-worker deployments, and its client.
+
+With `uvicorn --workers N` every worker would load its own model. Instead one sidecar process owns
+the model and serves encode requests over a Unix domain socket:
+
+    python -m app.services.embedding_sidecar --socket /tmp/cv-analyzer-embed.sock
+
+and workers run with EMBEDDING_PROVIDER=sidecar. Requests are length-prefixed JSON frames. Vectors
+come back through a per-connection shared memory buffer (float32, rows x dim) that the server
+reuses and grows as needed, so only a small header crosses the socket. Requests of all connections
+go through one MicroBatcher, so the sidecar batches across workers. While the sidecar is down, the
+client encodes with an in-process model and retries the socket every embedding_sidecar_retry_s.
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import numpy as np
+
+from app.config import settings
+from app.services.embedding_batcher import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("!I")
+_MAX_FRAME = 64 * 1024 * 1024
+_INITIAL_BUFFER_BYTES = 1 << 20
+# Segments created by a server in this process; they share one resource tracker registration.
+_created_segments: Set[str] = set()
+
+
+def _send(sock: socket.socket, obj: Dict[str, Any]) -> None:
+    body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> Optional[bytes]:
+    chunks = []
+    while n:
+        chunk = sock.recv(min(n, 1 << 16))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """Next frame, or None when the peer closed the connection."""
+    head = _recv_exact(sock, _HEADER.size)
+    if head is None:
+        return None
+    (size,) = _HEADER.unpack(head)
+    if size > _MAX_FRAME:
+        raise ConnectionError(f"frame of {size} bytes exceeds the limit")
+    body = _recv_exact(sock, size)
+    if body is None:
+        raise ConnectionError("connection closed mid-frame")
+    return json.loads(body)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Map a segment owned by the server without letting this process' resource tracker unlink it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        if name not in _created_segments:
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return shm
+
+
+def _release(buffer: Optional[shared_memory.SharedMemory]) -> None:
+    if buffer is not None:
+        _created_segments.discard(buffer.name)
+        buffer.close()
+        buffer.unlink()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: "EmbeddingSidecarServer"
+
+    def handle(self) -> None:
+        buffer: Optional[shared_memory.SharedMemory] = None
+        try:
+            while True:
+                msg = _recv(self.request)
+                if msg is None:
+                    return
+                op = msg.get("op")
+                try:
+                    if op == "encode":
+                        vectors = np.asarray(self.server.batcher.encode(msg.get("texts") or []), dtype=np.float32)
+                        if vectors.size == 0:
+                            _send(self.request, {"rows": 0, "dim": self.server.dimension})
+                            continue
+                        if buffer is None or buffer.size < vectors.nbytes:
+                            _release(buffer)
+                            buffer = shared_memory.SharedMemory(
+                                create=True, size=max(_INITIAL_BUFFER_BYTES, 2 * vectors.nbytes)
+                            )
+                            _created_segments.add(buffer.name)
+                        np.ndarray(vectors.shape, dtype=np.float32, buffer=buffer.buf)[:] = vectors
+                        _send(self.request, {"shm": buffer.name, "rows": vectors.shape[0], "dim": vectors.shape[1]})
+                    elif op == "windows":
+                        split = self.server.split_windows
+                        _send(self.request, {"windows": split(msg.get("text") or "") if split else None})
+                    elif op == "info":
+                        _send(self.request, {"dim": self.server.dimension, "windows": self.server.split_windows is not None})
+                    else:
+                        _send(self.request, {"error": f"unknown op {op!r}"})
+                except OSError:
+                    raise
+                except Exception as e:
+                    logger.exception("Embedding sidecar: %s failed", op)
+                    _send(self.request, {"error": str(e)})
+        except OSError as e:
+            logger.info("Embedding sidecar: connection dropped (%s)", e)
+        finally:
+            _release(buffer)
+
+
+class EmbeddingSidecarServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, embedder: Any) -> None:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.embedder = embedder
+        self.split_windows = getattr(embedder, "split_windows", None)
+        self.dimension = getattr(embedder, "dimension", None) or len(embedder.embed_query(" "))
+        self.batcher = MicroBatcher(
+            embedder.embed_documents,
+            max_batch=settings.embedding_batch_max_texts,
+            max_wait_s=max(settings.embedding_batch_wait_ms, 0.0) / 1000.0,
+        )
+        super().__init__(socket_path, _Handler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.server_address)  # type: ignore[arg-type]
+        except OSError:
+            pass
+
+
+class SidecarEmbedder:
+    """Client provider: encode through the sidecar, or with a local model while it is unreachable."""
+
+    def __init__(self, socket_path: str, local_factory: Callable[[], Any]) -> None:
+        self.socket_path = socket_path
+        self._local_factory = local_factory
+        self._local: Any = None
+        self._local_lock = threading.Lock()
+        self._conn = threading.local()
+        self._down_until = 0.0
+        self._info: Optional[Dict[str, Any]] = None
+        try:
+            self._info = self._call({"op": "info"})
+        except OSError as e:
+            self._mark_down(e)
+        if self._info is not None and not self._info.get("windows"):
+            # Server model has no tokenizer: blocks are truncated by characters, as for remote APIs.
+            self.split_windows = None  # type: ignore[assignment]
+
+    def _socket(self) -> socket.socket:
+        sock = getattr(self._conn, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(settings.embedding_sidecar_timeout_s)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._conn.sock = sock
+        return sock
+
+    def _drop_connection(self) -> None:
+        sock = getattr(self._conn, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._conn.sock = None
+        shm = getattr(self._conn, "shm", None)
+        if shm is not None:
+            shm.close()
+            self._conn.shm = None
+
+    def _call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            sock = self._socket()
+            _send(sock, request)
+            reply = _recv(sock)
+        except OSError:
+            self._drop_connection()
+            raise
+        if reply is None:
+            self._drop_connection()
+            raise ConnectionError("embedding sidecar closed the connection")
+        if "error" in reply:
+            raise RuntimeError(f"embedding sidecar: {reply['error']}")
+        return reply
+
+    def _read_vectors(self, reply: Dict[str, Any]) -> np.ndarray:
+        rows, dim = int(reply["rows"]), int(reply["dim"])
+        if rows == 0:
+            return np.zeros((0, dim), dtype=np.float32)
+        shm = getattr(self._conn, "shm", None)
+        if shm is None or shm.name != reply["shm"]:
+            if shm is not None:
+                shm.close()
+            shm = self._conn.shm = _attach(reply["shm"])
+        return np.ndarray((rows, dim), dtype=np.float32, buffer=shm.buf).copy()
+
+    def _mark_down(self, error: BaseException) -> None:
+        if time.monotonic() >= self._down_until:
+            logger.warning(
+                "Embedding sidecar at %s unavailable (%s); encoding in-process for %.0fs",
+                self.socket_path,
+                error,
+                settings.embedding_sidecar_retry_s,
+            )
+        self._down_until = time.monotonic() + settings.embedding_sidecar_retry_s
+
+    def _sidecar_up(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def local(self) -> Any:
+        if self._local is None:
+            with self._local_lock:
+                if self._local is None:
+                    self._local = self._local_factory()
+        return self._local
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self._sidecar_up():
+            try:
+                if self._info is None:
+                    self._info = self._call({"op": "info"})
+                return self._read_vectors(self._call({"op": "encode", "texts": list(texts)})).tolist()
+            except OSError as e:
+                self._mark_down(e)
+        return self.local().embed_documents(list(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def split_windows(self, text: str) -> List[str]:
+        if self._sidecar_up():
+            try:
+                windows = self._call({"op": "windows", "text": text}).get("windows")
+                if windows is not None:
+                    return windows
+            except OSError as e:
+                self._mark_down(e)
+        split = getattr(self.local(), "split_windows", None)
+        return split(text) if split is not None else [text]
+
+    @property
+    def dimension(self) -> Optional[int]:
+        if self._info is not None:
+            return self._info.get("dim")
+        return getattr(self.local(), "dimension", None)
+
+
+def main() -> None:
+    from app.services.semantic_matcher import _get_model_embedder
+
+    ap = argparse.ArgumentParser(description="Serve the embedding model to API workers over a Unix socket.")
+    ap.add_argument("--socket", default=settings.embedding_sidecar_socket)
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    server = EmbeddingSidecarServer(args.socket, _get_model_embedder(settings.embedding_sidecar_backend))
+    logger.info("Embedding sidecar listening on %s (%d-dim)", args.socket, server.dimension)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Latency-aware routing of LLM extraction calls across backends and models, with optional hedging.
+
+Routes come from settings.llm_routes. A call goes to the smallest-capacity healthy route whose
+max_prompt_chars fits the prompt: short CVs land on a small fast model, long ones on a large-context
+model. Routes of the same capacity are ordered by their observed median latency. With hedging on,
+a second route is started once the primary runs past its rolling p95, and the first usable result
+wins; the slower call is cancelled.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Literal, Optional, Sequence, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+from app.config import settings
+from app.services.admission import AdmissionRejected
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_CALLS = REGISTRY.counter(
+    "cv_llm_route_calls_total",
+    "LLM extraction calls by route and outcome (ok, error).",
+    ("route", "outcome"),
+)
+_LATENCY = REGISTRY.histogram(
+    "cv_llm_route_latency_seconds",
+    "Latency of completed LLM extraction calls, by route.",
+    ("route",),
+)
+_HEDGES = REGISTRY.counter(
+    "cv_llm_hedge_total",
+    "Hedged requests by primary route and result (launched, won, lost).",
+    ("route", "result"),
+)
+
+
+class LLMRoute(BaseModel):
+    name: str
+    backend: Literal["ollama", "gemini"]
+    model: str
+    # Longest prompt (chars) this route should take; 0 = no limit (the large-context route).
+    max_prompt_chars: int = 0
+    # Alternative server, e.g. a second Ollama host or a local stand-in.
+    base_url: Optional[str] = None
+    # Ollama only; 0 = pick from ollama_num_ctx_tiers by the prompt estimate.
+    num_ctx: int = 0
+
+
+class RouteStats:
+    """Rolling window of (latency, ok) samples for one route."""
+
+    def __init__(self, window: int) -> None:
+        self._samples: Deque[Tuple[float, bool]] = deque(maxlen=max(1, window))
+
+    def record(self, latency_s: float, ok: bool) -> None:
+        self._samples.append((latency_s, ok))
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+    def error_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+
+    def latency_quantile(self, q: float) -> Optional[float]:
+        """Nearest-rank quantile over successful calls; None without samples."""
+        latencies = sorted(lat for lat, ok in self._samples if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, max(0, math.ceil(q * len(latencies)) - 1))]
+
+
+class LLMRouter:
+    def __init__(
+        self,
+        routes: Sequence[LLMRoute],
+        *,
+        window: int = 50,
+        hedge: bool = False,
+        min_samples: int = 10,
+        max_error_rate: float = 0.5,
+    ) -> None:
+        if not routes:
+            raise ValueError("LLMRouter needs at least one route")
+        self.routes = list(routes)
+        self.hedge = hedge
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self._stats: Dict[str, RouteStats] = {r.name: RouteStats(window) for r in self.routes}
+
+    def stats(self, route: LLMRoute) -> RouteStats:
+        return self._stats[route.name]
+
+    def _healthy(self, route: LLMRoute) -> bool:
+        s = self.stats(route)
+        return s.count < self.min_samples or s.error_rate() <= self.max_error_rate
+
+    def plan(self, prompt_chars: int) -> List[LLMRoute]:
+        """Candidate routes in preference order; the first is the primary, the second the hedge."""
+        fitting = [r for r in self.routes if r.max_prompt_chars <= 0 or prompt_chars <= r.max_prompt_chars]
+        if not fitting:
+            # Nothing is big enough: the largest route is still the best effort.
+            fitting = [max(self.routes, key=lambda r: r.max_prompt_chars)]
+
+        def key(r: LLMRoute) -> Tuple[bool, float, float]:
+            p50 = self.stats(r).latency_quantile(0.5)
+            return (
+                not self._healthy(r),
+                r.max_prompt_chars if r.max_prompt_chars > 0 else math.inf,
+                p50 if p50 is not None else 0.0,
+            )
+
+        ordered = sorted(fitting, key=key)
+        # Any other route may serve as the hedge, preferring those that fit.
+        return ordered + sorted((r for r in self.routes if r not in ordered), key=key)
+
+    def hedge_delay_s(self, route: LLMRoute) -> Optional[float]:
+        """Primary's rolling p95 once enough samples exist; None = do not hedge yet."""
+        s = self.stats(route)
+        if s.count < self.min_samples:
+            return None
+        return s.latency_quantile(0.95)
+
+    async def _timed(
+        self, route: LLMRoute, call: Callable[[LLMRoute], Awaitable[T]], accept: Callable[[T], bool]
+    ) -> T:
+        started = time.monotonic()
+        try:
+            result = await call(route)
+        except (asyncio.CancelledError, AdmissionRejected):
+            # Cancelled hedges and local load shedding say nothing about the backend itself.
+            raise
+        except Exception:
+            self._observe(route, time.monotonic() - started, False)
+            raise
+        self._observe(route, time.monotonic() - started, accept(result))
+        return result
+
+    def _observe(self, route: LLMRoute, latency_s: float, ok: bool) -> None:
+        self.stats(route).record(latency_s, ok)
+        _CALLS.inc(route=route.name, outcome="ok" if ok else "error")
+        _LATENCY.observe(latency_s, route=route.name)
+
+    async def run(
+        self,
+        plan: Sequence[LLMRoute],
+        call: Callable[[LLMRoute], Awaitable[T]],
+        accept: Callable[[T], bool] = lambda r: r is not None,
+    ) -> Tuple[LLMRoute, Optional[T]]:
+        """Call the primary route; with hedging, also the next route once the primary passes its p95.
+
+        Returns the route that produced the first accepted result. When every attempt fails, the
+        first exception is re-raised, or the primary's (unaccepted) result is returned.
+        """
+        primary = plan[0]
+        backup = plan[1] if self.hedge and len(plan) > 1 else None
+        delay = self.hedge_delay_s(primary) if backup is not None else None
+        tasks: Dict["asyncio.Task[T]", LLMRoute] = {}
+        first_error: Optional[BaseException] = None
+        fallback: Tuple[LLMRoute, Optional[T]] = (primary, None)
+
+        def start(route: LLMRoute) -> None:
+            tasks[asyncio.create_task(self._timed(route, call, accept))] = route
+
+        start(primary)
+        started = time.monotonic()
+        try:
+            while tasks:
+                timeout = None
+                if backup is not None and delay is not None:
+                    timeout = max(0.0, delay - (time.monotonic() - started))
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logger.info(
+                        "LLM router: %s past p95 (%.2fs); hedging with %s", primary.name, delay, backup.name
+                    )
+                    _HEDGES.inc(route=primary.name, result="launched")
+                    start(backup)
+                    backup = None
+                    continue
+                for task in done:
+                    route = tasks.pop(task)
+                    if task.exception() is None and accept(task.result()):
+                        if route is not primary:
+                            _HEDGES.inc(route=primary.name, result="won")
+                        elif len(tasks) > 0:
+                            _HEDGES.inc(route=primary.name, result="lost")
+                        return route, task.result()
+                    if task.exception() is not None:
+                        first_error = first_error or task.exception()
+                    elif route is primary:
+                        fallback = (route, task.result())
+                if not tasks and backup is not None:
+                    # The primary failed before the hedge was due: fail over right away.
+                    logger.info("LLM router: %s failed; failing over to %s", primary.name, backup.name)
+                    start(backup)
+                    backup = None
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        if first_error is not None:
+            raise first_error
+        return fallback
+
+
+_router: Optional[LLMRouter] = None
+
+
+def get_llm_router() -> Optional[LLMRouter]:
+    """Shared router built from settings.llm_routes; None when no routes are configured."""
+    global _router
+    if _router is None and settings.llm_routes:
+        _router = LLMRouter(
+            [LLMRoute.model_validate(r) for r in settings.llm_routes],
+            window=settings.llm_route_window,
+            hedge=settings.llm_hedge_enabled,
+            min_samples=settings.llm_route_min_samples,
+            max_error_rate=settings.llm_route_max_error_rate,
+        )
+    return _router
+
+
+def reset_llm_router() -> None:
+    global _router
+    _router = None
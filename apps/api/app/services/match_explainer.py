@@ -16,6 +16,7 @@ from app.models.cv_models import (
     MatchExplainability,
 )
 from app.services.semantic_matcher import SemanticMatchResult, compute_semantic_match, normalized_semantic_weights
+from app.utils.stage_metrics import stage
 
 logger = logging.getLogger(__name__)
 
@@ -221,8 +222,10 @@ def explain_match_score(
     baseline_score = float(predict(np.zeros(n))[0])
     predicted_score = float(predict(np.ones(n))[0])
 
-    shap_result = _run_shap(predict, features, baseline_score, predicted_score)
-    lime_result = _run_lime(predict, features, baseline_score, predicted_score)
+    with stage("shap"):
+        shap_result = _run_shap(predict, features, baseline_score, predicted_score)
+    with stage("lime"):
+        lime_result = _run_lime(predict, features, baseline_score, predicted_score)
 
     if shap_result is None and lime_result is None:
         return MatchExplainability(
@@ -0,0 +1,145 @@
+"""ONNX Runtime encoder for the sentence-transformers MiniLM model, float32 or dynamically quantized int8.
+
+Export once (needs torch + transformers, i.e. the sentence-transformers install):
+
+    python -m app.services.onnx_embedder --out models/minilm-onnx
+
+This writes model.onnx, model.int8.onnx and tokenizer.json. Serving (embedding_provider=onnx) needs
+only onnxruntime and tokenizers: mean pooling over the attention mask and L2 normalization are done
+here in numpy, matching the sentence-transformers pipeline of this model.
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ONNX_FP32_FILE = "model.onnx"
+ONNX_INT8_FILE = "model.int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+# max_seq_length of paraphrase-multilingual-MiniLM-L12-v2.
+MAX_LENGTH = 128
+_INPUT_NAMES = ("input_ids", "attention_mask", "token_type_ids")
+
+
+def mean_pool(hidden: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """(B, T, D) token states + (B, T) attention mask -> (B, D) unit-length sentence vectors."""
+    m = mask.astype(np.float32)[..., None]
+    summed = (hidden * m).sum(axis=1)
+    pooled = summed / np.clip(m.sum(axis=1), 1e-9, None)
+    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+    return pooled / np.where(norms == 0, 1.0, norms)
+
+
+class OnnxEncoder:
+    def __init__(
+        self,
+        model_dir: str,
+        *,
+        quantized: bool = True,
+        threads: int = 0,
+        batch_size: int = 32,
+        max_length: int = MAX_LENGTH,
+    ) -> None:
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        root = Path(model_dir)
+        model_path = root / (ONNX_INT8_FILE if quantized else ONNX_FP32_FILE)
+        if not model_path.is_file() or not (root / TOKENIZER_FILE).is_file():
+            raise FileNotFoundError(
+                f"{model_path} / {TOKENIZER_FILE} not found; export with: python -m app.services.onnx_embedder --out {root}"
+            )
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            opts.intra_op_num_threads = threads
+        self._session = ort.InferenceSession(str(model_path), opts, providers=["CPUExecutionProvider"])
+        self._inputs = [i.name for i in self._session.get_inputs()]
+
+        # Two tokenizer instances: padded/truncated for the model, raw for window offsets.
+        self._tokenizer = Tokenizer.from_file(str(root / TOKENIZER_FILE))
+        self._tokenizer.enable_truncation(max_length)
+        pad_token = next((t for t in ("<pad>", "[PAD]") if self._tokenizer.token_to_id(t) is not None), "[PAD]")
+        self._tokenizer.enable_padding(pad_id=self._tokenizer.token_to_id(pad_token) or 0, pad_token=pad_token)
+        self._raw_tokenizer = Tokenizer.from_file(str(root / TOKENIZER_FILE))
+        self._raw_tokenizer.no_truncation()
+        self._raw_tokenizer.no_padding()
+
+        self.max_length = max_length
+        self.batch_size = max(1, batch_size)
+        self.model_path = model_path
+        self.dimension = int(self._run(["dimension probe"]).shape[1])
+        logger.info("ONNX encoder: %s (%d-dim)", model_path, self.dimension)
+
+    def _run(self, texts: Sequence[str]) -> np.ndarray:
+        encodings = self._tokenizer.encode_batch(list(texts))
+        ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask, "token_type_ids": np.zeros_like(ids)}
+        hidden = self._session.run(None, {name: feeds[name] for name in self._inputs})[0]
+        return mean_pool(hidden, mask)
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Unit vectors (N, D); empty texts give zero rows. Batches are length-sorted to cut padding."""
+        out = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        order = sorted((i for i, t in enumerate(texts) if t and t.strip()), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), self.batch_size):
+            idx = order[start : start + self.batch_size]
+            out[idx] = self._run([texts[i].strip() for i in idx])
+        return out
+
+    def token_offsets(self, text: str) -> List[Tuple[int, int]]:
+        return list(self._raw_tokenizer.encode(text, add_special_tokens=False).offsets)
+
+
+def export(out_dir: str, model_name: str, opset: int = 17) -> Tuple[Path, Path]:
+    """Export the Hugging Face model to ONNX (float32) and a dynamically int8-quantized copy."""
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoTokenizer
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name).eval()
+    tokenizer.save_pretrained(str(out))
+
+    sample = tokenizer(["Python developer", "Досвід роботи з FastAPI"], padding=True, return_tensors="pt")
+    names = [n for n in _INPUT_NAMES if n in sample]
+    axes = {n: {0: "batch", 1: "sequence"} for n in names}
+    axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    fp32_path = out / ONNX_FP32_FILE
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[n] for n in names),
+            str(fp32_path),
+            input_names=names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=axes,
+            opset_version=opset,
+        )
+    int8_path = out / ONNX_INT8_FILE
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    return fp32_path, int8_path
+
+
+def main() -> None:
+    from app.services.semantic_matcher import SENTENCE_TRANSFORMERS_MODEL
+
+    ap = argparse.ArgumentParser(description="Export the embedding model to ONNX (fp32 + int8).")
+    ap.add_argument("--out", required=True, help="Output directory (use it as ONNX_MODEL_DIR)")
+    ap.add_argument("--model", default=SENTENCE_TRANSFORMERS_MODEL)
+    ap.add_argument("--opset", type=int, default=17)
+    args = ap.parse_args()
+    for path in export(args.out, args.model, args.opset):
+        print(f"{path} ({path.stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Remote (OpenAI-compatible POST /embeddings) embedding provider built for throughput.
+
+Inputs are packed into requests of up to remote_embedding_batch_inputs texts and
+remote_embedding_batch_tokens estimated tokens, sent concurrently over one pooled HTTP client, and
+retried with full-jitter exponential backoff on 429 / 5xx and transport errors (honouring Retry-After). An in-flight token budget (estimated from characters)
+keeps a large explainer run from tripping the provider's tokens-per-minute limit in one burst.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+import httpx
+
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_RETRIES = REGISTRY.counter(
+    "cv_remote_embedding_retries_total",
+    "Remote embedding requests retried, by reason (HTTP status or transport).",
+    ["reason"],
+)
+_REQUESTS = REGISTRY.counter(
+    "cv_remote_embedding_requests_total",
+    "Remote embedding HTTP requests, by outcome.",
+    ["outcome"],
+)
+_RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+# Rough tokens-per-character for budget accounting; no tokenizer round trip needed.
+_CHARS_PER_TOKEN = 4
+
+
+class RemoteEmbeddingError(RuntimeError):
+    pass
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // _CHARS_PER_TOKEN + 1)
+
+
+class _TokenBudget:
+    """Blocking budget of in-flight tokens; a single request above the cap waits for an empty budget."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, tokens: int) -> int:
+        tokens = min(tokens, self.capacity)
+        with self._cond:
+            while self.in_flight + tokens > self.capacity:
+                self._cond.wait()
+            self.in_flight += tokens
+        return tokens
+
+    def release(self, tokens: int) -> None:
+        with self._cond:
+            self.in_flight -= tokens
+            self._cond.notify_all()
+
+
+class RemoteEmbedder:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        model: str,
+        *,
+        batch_inputs: int = 256,
+        batch_tokens: int = 100_000,
+        concurrency: int = 4,
+        max_retries: int = 5,
+        backoff_s: float = 0.5,
+        max_backoff_s: float = 20.0,
+        max_inflight_tokens: int = 200_000,
+        max_input_chars: int = 24_000,
+        timeout_s: float = 30.0,
+    ) -> None:
+        self.url = base_url.rstrip("/") + "/embeddings"
+        self.model = model
+        self.batch_inputs = max(1, batch_inputs)
+        self.batch_tokens = max(1, batch_tokens)
+        self.max_retries = max(0, max_retries)
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.max_input_chars = max_input_chars
+        self._budget = _TokenBudget(max_inflight_tokens)
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._client = httpx.Client(
+            headers=headers,
+            timeout=timeout_s,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        )
+        self._pool = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="remote-embed")
+        self._dim: Optional[int] = None
+
+    def _batches(self, texts: Sequence[str]) -> List[List[str]]:
+        """Consecutive runs of at most batch_inputs texts and batch_tokens estimated tokens."""
+        batches: List[List[str]] = []
+        current: List[str] = []
+        tokens = 0
+        for text in texts:
+            t = estimate_tokens(text)
+            if current and (len(current) >= self.batch_inputs or tokens + t > self.batch_tokens):
+                batches.append(current)
+                current, tokens = [], 0
+            current.append(text)
+            tokens += t
+        if current:
+            batches.append(current)
+        return batches
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff_s)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_backoff_s, self.backoff_s * (2**attempt)))
+
+    def _post(self, batch: List[str]) -> List[List[float]]:
+        tokens = self._budget.acquire(sum(estimate_tokens(t) for t in batch))
+        try:
+            for attempt in range(self.max_retries + 1):
+                retry_after: Optional[str] = None
+                try:
+                    resp = self._client.post(self.url, json={"model": self.model, "input": batch})
+                except httpx.TransportError as e:
+                    reason, detail = "transport", str(e)
+                else:
+                    if resp.status_code == 200:
+                        _REQUESTS.inc(outcome="ok")
+                        data = sorted(resp.json()["data"], key=lambda d: d["index"])
+                        if len(data) != len(batch):
+                            raise RemoteEmbeddingError(f"expected {len(batch)} embeddings, got {len(data)}")
+                        return [d["embedding"] for d in data]
+                    if resp.status_code not in _RETRY_STATUSES:
+                        _REQUESTS.inc(outcome="error")
+                        raise RemoteEmbeddingError(f"embeddings API returned {resp.status_code}: {resp.text[:300]}")
+                    reason, detail = str(resp.status_code), resp.text[:200]
+                    retry_after = resp.headers.get("Retry-After")
+                if attempt == self.max_retries:
+                    _REQUESTS.inc(outcome="error")
+                    raise RemoteEmbeddingError(f"embeddings API failed after {attempt + 1} attempts: {reason} {detail}")
+                _RETRIES.inc(reason=reason)
+                delay = self._backoff(attempt, retry_after)
+                logger.warning("Embeddings API %s; retry %d in %.2fs", reason, attempt + 1, delay)
+                time.sleep(delay)
+        finally:
+            self._budget.release(tokens)
+        raise AssertionError("unreachable")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        clipped = [t[: self.max_input_chars] if t.strip() else " " for t in texts]
+        batches = self._batches(clipped)
+        if len(batches) == 1:
+            results = [self._post(batches[0])]
+        else:
+            results = list(self._pool.map(self._post, batches))
+        vectors = [v for r in results for v in r]
+        if vectors:
+            self._dim = len(vectors[0])
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return self._dim
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+        self._client.close()
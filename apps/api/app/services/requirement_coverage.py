@@ -0,0 +1,125 @@
+"""Per-requirement coverage: every job requirement line against every CV skill / experience line.
+
+All lines are embedded in one batch and compared with a single matmul. For each requirement the
+best-matching CV line and its cosine decide covered / partial / missing. This gives deterministic
+matched_competencies / missing_competencies when the LLM returns none.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.models import RequirementCoverageItem
+from app.services.semantic_matcher import _unit, embed_texts
+
+logger = logging.getLogger(__name__)
+
+# Leading list markers: "-", "•", "*", "1.", "2)", "a)".
+_BULLET = re.compile(r"^\s*(?:[-–—•*·▪●]+|\(?\d{1,2}[.)]|[a-zа-я][.)])\s*", re.IGNORECASE)
+_SPLIT = re.compile(r"[\n;]+|(?<=[.!?])\s+(?=[A-ZА-ЯІЇЄҐ])")
+
+
+def _clean(line: str) -> str:
+    return " ".join(_BULLET.sub("", line).split()).strip(" .,:")
+
+
+def split_requirement_lines(job_text: str, max_lines: Optional[int] = None) -> List[str]:
+    """Job description -> distinct requirement lines (bullets, sentences, ';'-separated items)."""
+    limit = settings.coverage_max_requirements if max_lines is None else max_lines
+    seen = set()
+    out: List[str] = []
+    for raw in _SPLIT.split(job_text or ""):
+        line = _clean(raw)
+        # Headings such as "Requirements:" carry no requirement of their own.
+        if len(line) < 3 or (raw.strip().endswith(":") and len(line.split()) <= 3):
+            continue
+        key = line.casefold()
+        if key not in seen:
+            seen.add(key)
+            out.append(line)
+        if len(out) >= limit:
+            break
+    return out
+
+
+def cv_evidence_lines(skills: Sequence[str], experience_lines: Sequence[str], cv_text: str = "") -> List[str]:
+    """CV side of the matrix: extracted skills and experience lines, or raw CV lines if none were extracted."""
+    lines = [s.strip() for s in skills if s and s.strip()] + [e.strip() for e in experience_lines if e and e.strip()]
+    if not lines and cv_text:
+        lines = [_clean(l) for l in cv_text.splitlines()]
+        lines = [l for l in lines if len(l) >= 3][: settings.coverage_max_cv_lines]
+    seen = set()
+    out: List[str] = []
+    for line in lines:
+        if line.casefold() not in seen:
+            seen.add(line.casefold())
+            out.append(line)
+    return out
+
+
+@dataclass
+class RequirementCoverage:
+    items: List[RequirementCoverageItem]
+
+    @property
+    def matched(self) -> List[str]:
+        return [i.requirement for i in self.items if i.status == "covered"]
+
+    @property
+    def missing(self) -> List[str]:
+        """Weak (partial) or absent requirements, like missing_competencies."""
+        return [i.requirement for i in self.items if i.status != "covered"]
+
+    @property
+    def ratio(self) -> float:
+        return len(self.matched) / len(self.items) if self.items else 0.0
+
+
+def coverage_from_matrix(
+    requirements: Sequence[str], cv_lines: Sequence[str], sims: np.ndarray
+) -> RequirementCoverage:
+    """sims: (requirements x cv_lines) raw cosine matrix."""
+    items: List[RequirementCoverageItem] = []
+    for r, req in enumerate(requirements):
+        best: Tuple[Optional[str], float] = (None, 0.0)
+        if len(cv_lines):
+            j = int(np.argmax(sims[r]))
+            best = (cv_lines[j], float(sims[r, j]))
+        if best[1] >= settings.coverage_match_threshold:
+            status = "covered"
+        elif best[1] >= settings.coverage_partial_threshold:
+            status = "partial"
+        else:
+            status = "missing"
+        items.append(
+            RequirementCoverageItem(
+                requirement=req,
+                best_match=best[0] if status != "missing" else None,
+                similarity=round(min(1.0, max(0.0, best[1])), 4),
+                status=status,
+            )
+        )
+    return RequirementCoverage(items=items)
+
+
+def compute_requirement_coverage(
+    job_text: str,
+    skills: Sequence[str],
+    experience_lines: Sequence[str],
+    cv_text: str = "",
+) -> RequirementCoverage:
+    requirements = split_requirement_lines(job_text)
+    cv_lines = cv_evidence_lines(skills, experience_lines, cv_text)
+    if not requirements:
+        return RequirementCoverage(items=[])
+    vectors = _unit(embed_texts(list(requirements) + cv_lines))
+    sims = vectors[: len(requirements)] @ vectors[len(requirements) :].T
+    coverage = coverage_from_matrix(requirements, cv_lines, sims)
+    logger.info(
+        "Requirement coverage: %d/%d covered (%d CV lines)", len(coverage.matched), len(requirements), len(cv_lines)
+    )
+    return coverage
@@ -1,10 +1,15 @@
 """Embeddings + cosine similarity between CV and job text blocks."""
 
 import logging
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from app.config import settings
+from app.services.embedding_batcher import BatchingEmbedder, MicroBatcher
 
 logger = logging.getLogger(__name__)
 
@@ -49,9 +54,19 @@ class SemanticMatchResult:
     experience_similarity: float
     overall_similarity: float
 
+    def breakdown(self) -> Dict[str, float]:
+        """The semantic_breakdown dict exposed in API responses."""
+        return {
+            "skills_similarity": self.skills_similarity,
+            "experience_similarity": self.experience_similarity,
+            "overall_similarity": self.overall_similarity,
+        }
+
+
+SENTENCE_TRANSFORMERS_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
 
 def _cosine_similarity(a: List[float], b: List[float]) -> float:
-    import numpy as np
     va = np.array(a, dtype=float)
     vb = np.array(b, dtype=float)
     norm_a = np.linalg.norm(va)
@@ -63,14 +78,19 @@ def _cosine_similarity(a: List[float], b: List[float]) -> float:
 
 
 class _Embedder:
-    def __init__(self, embed_fn, dim: int):
+    def __init__(self, embed_fn, dim: int, batch_fn=None, split_fn=None):
         self._embed = embed_fn
+        self._batch = batch_fn
         self._dim = dim
+        # Optional tokenizer-aware splitter: text -> windows that each fit the encoder's input length.
+        self.split_windows = split_fn
 
     def embed_query(self, text: str) -> List[float]:
         return self._embed(text)
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self._batch is not None:
+            return self._batch(texts)
         return [self._embed(t) for t in texts]
 
     @property
@@ -79,21 +99,56 @@ class _Embedder:
 
 
 def _get_openai_embedder():
-    from langchain_openai import OpenAIEmbeddings
+    """OpenAI-compatible /embeddings API: batched, concurrent and retried (see remote_embedder.py)."""
+    from app.services.remote_embedder import RemoteEmbedder
+
     key = settings.openai_api_key or ""
     if not key:
         return None
-    model = getattr(settings, "openai_embedding_model", "text-embedding-3-small")
-    return OpenAIEmbeddings(model=model, openai_api_key=key)
+    return RemoteEmbedder(
+        settings.openai_base_url,
+        key,
+        settings.openai_embedding_model,
+        batch_inputs=settings.remote_embedding_batch_inputs,
+        batch_tokens=settings.remote_embedding_batch_tokens,
+        concurrency=settings.remote_embedding_concurrency,
+        max_retries=settings.remote_embedding_max_retries,
+        backoff_s=settings.remote_embedding_backoff_s,
+        max_inflight_tokens=settings.remote_embedding_max_inflight_tokens,
+        timeout_s=settings.remote_embedding_timeout_s,
+    )
 
 
 def _get_embedder():
     provider = settings.embedding_provider.lower()
+    if provider == "sidecar":
+        return _get_sidecar_embedder()
+    return _get_model_embedder(provider)
+
+
+def _get_sidecar_embedder():
+    """Client of the shared embedding process (embedding_sidecar.py), with an in-process fallback model."""
+    from app.services.embedding_sidecar import SidecarEmbedder
+
+    return SidecarEmbedder(
+        settings.embedding_sidecar_socket,
+        lambda: _get_model_embedder(settings.embedding_sidecar_backend),
+    )
+
+
+def _get_model_embedder(provider: str):
+    """Load an embedding model in this process (sentence_transformers, onnx or openai)."""
+    provider = provider.lower()
     if provider == "openai":
         emb = _get_openai_embedder()
         if emb is not None:
             return emb
         logger.warning("embedding_provider=openai but OPENAI_API_KEY not set; falling back to sentence_transformers")
+    elif provider == "onnx":
+        try:
+            return _get_onnx_embedder()
+        except (ImportError, FileNotFoundError) as e:
+            logger.warning("embedding_provider=onnx unavailable (%s); falling back to sentence_transformers", e)
     elif provider != "sentence_transformers":
         return _get_openai_embedder() or _get_sentence_transformers_embedder()
 
@@ -109,28 +164,75 @@ def _get_embedder():
 
 def _get_sentence_transformers_embedder():
     from sentence_transformers import SentenceTransformer
-    model_name = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
-    st = SentenceTransformer(model_name, device="cpu")
+    st = SentenceTransformer(SENTENCE_TRANSFORMERS_MODEL, device="cpu")
 
     def embed_fn(text: str) -> List[float]:
         if not text or not text.strip():
             return [0.0] * st.get_sentence_embedding_dimension()
         return st.encode(text.strip(), normalize_embeddings=True).tolist()
 
+    def batch_fn(texts: List[str]) -> List[List[float]]:
+        return st.encode([t.strip() for t in texts], normalize_embeddings=True, batch_size=32).tolist()
+
+    # Room for [CLS]/[SEP] inside max_seq_length (128 word pieces for this model).
+    model_window = max(8, int(st.max_seq_length or 128) - 2)
+
+    def split_fn(text: str) -> List[str]:
+        window = min(settings.embedding_window_tokens or model_window, model_window)
+        enc = st.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)
+        return _windows_from_offsets(text, enc["offset_mapping"], window)
+
     dim = st.get_sentence_embedding_dimension()
-    return _Embedder(embed_fn, dim)
+    return _Embedder(embed_fn, dim, batch_fn, split_fn)
+
+
+def _get_onnx_embedder():
+    """Same model exported to ONNX (see onnx_embedder.py), int8-quantized unless onnx_quantized is off."""
+    from app.services.onnx_embedder import OnnxEncoder
+
+    enc = OnnxEncoder(settings.onnx_model_dir, quantized=settings.onnx_quantized, threads=settings.onnx_threads)
+
+    def embed_fn(text: str) -> List[float]:
+        return enc.encode([text])[0].tolist()
+
+    def batch_fn(texts: List[str]) -> List[List[float]]:
+        return enc.encode(texts).tolist()
+
+    model_window = max(8, enc.max_length - 2)
+
+    def split_fn(text: str) -> List[str]:
+        window = min(settings.embedding_window_tokens or model_window, model_window)
+        return _windows_from_offsets(text, enc.token_offsets(text), window)
+
+    return _Embedder(embed_fn, enc.dimension, batch_fn, split_fn)
 
 
 _embedder = None
+_embedder_lock = threading.Lock()
 
 
 def get_embedder():
     global _embedder
     if _embedder is None:
-        _embedder = _get_embedder()
+        # Scoring stages run in worker threads; load the model once even under concurrent first use.
+        with _embedder_lock:
+            if _embedder is None:
+                _embedder = _with_micro_batching(_get_embedder())
     return _embedder
 
 
+def _with_micro_batching(emb):
+    """Route encode calls of concurrent requests through one micro-batcher (see embedding_batcher.py)."""
+    if settings.embedding_batch_wait_ms <= 0:
+        return emb
+    batcher = MicroBatcher(
+        emb.embed_documents,
+        max_batch=settings.embedding_batch_max_texts,
+        max_wait_s=settings.embedding_batch_wait_ms / 1000.0,
+    )
+    return BatchingEmbedder(emb, batcher)
+
+
 def embed_text(text: str) -> List[float]:
     emb = get_embedder()
     if not (text or text.strip()):
@@ -139,6 +241,256 @@ def embed_text(text: str) -> List[float]:
     return emb.embed_query(text.strip())
 
 
+def _block(text: str, max_chars: int = 8000) -> str:
+    if not text or not text.strip():
+        return ""
+    t = text.strip()
+    return t[:max_chars] if len(t) > max_chars else t
+
+
+def _skills_block(cv_skills: List[str]) -> str:
+    return " ".join(s for s in cv_skills if s and s.strip()) if cv_skills else ""
+
+
+def _windows_from_offsets(text: str, offsets: Sequence[Tuple[int, int]], window: int) -> List[str]:
+    """Cut text into spans of `window` tokens (by tokenizer char offsets), overlapping and capped in count."""
+    if len(offsets) <= window:
+        return [text]
+    step = max(1, window - max(0, settings.embedding_window_overlap_tokens))
+    out: List[str] = []
+    for start in range(0, len(offsets), step):
+        span = offsets[start : start + window]
+        out.append(text[span[0][0] : span[-1][1]])
+        if start + window >= len(offsets) or len(out) >= settings.embedding_max_windows:
+            break
+    return out
+
+
+def embed_texts(texts: Sequence[str]) -> np.ndarray:
+    """Embed many texts with one batched call; rows for empty texts are zero vectors."""
+    emb = get_embedder()
+    idx = [i for i, t in enumerate(texts) if t and t.strip()]
+    vectors = emb.embed_documents([texts[i].strip() for i in idx]) if idx else []
+    dim = len(vectors[0]) if vectors else (getattr(emb, "dimension", None) or len(emb.embed_query(" ")))
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, vec in zip(idx, vectors):
+        out[row] = vec
+    return out
+
+
+# Window matrices of recently embedded blocks. The explainers rescore the same full CV / job text
+# dozens of times per request, so these are worth keeping.
+_WINDOW_CACHE_SIZE = 256
+# Entries keep a reference to their embedder, so its id() cannot be reused while they live.
+_window_cache: "OrderedDict[Tuple[int, str, int], Tuple[object, np.ndarray]]" = OrderedDict()
+_window_cache_lock = threading.Lock()
+
+
+def _split_block(emb, text: str, max_chars: int) -> List[str]:
+    if not text:
+        return []
+    if max_chars > 0:
+        # No tokenizer (remote APIs embed long inputs themselves) or windowing off: one truncated block.
+        return [_block(text, max_chars)]
+    return [w for w in emb.split_windows(text) if w.strip()]
+
+
+def embed_windows(texts: Sequence[str], max_chars: Sequence[int]) -> List[np.ndarray]:
+    """Per text, a (windows x d) matrix; all uncached windows are encoded in one batch.
+
+    Texts are split by the encoder's tokenizer into overlapping windows, so the whole block counts
+    instead of the first ~128 word pieces. max_chars only truncates when the embedder has no splitter.
+    """
+    emb = get_embedder()
+    windowed = getattr(emb, "split_windows", None) is not None and settings.embedding_window_tokens >= 0
+    # With a splitter the cutoff is unused, so requirement and full-text copies of a job share one entry.
+    keys = [(id(emb), (t or "").strip(), 0 if windowed else m) for t, m in zip(texts, max_chars)]
+    out: List[Optional[np.ndarray]] = [None] * len(texts)
+    with _window_cache_lock:
+        for i, key in enumerate(keys):
+            if key in _window_cache:
+                _window_cache.move_to_end(key)
+                out[i] = _window_cache[key][1]
+
+    pending: Dict[Tuple[int, str, int], List[str]] = {}
+    for i, key in enumerate(keys):
+        if out[i] is None and key not in pending:
+            pending[key] = _split_block(emb, key[1], key[2])
+    flat = [w for windows in pending.values() for w in windows]
+    vectors = embed_texts(flat) if flat else None
+    dim = vectors.shape[1] if vectors is not None else None
+
+    fresh: Dict[Tuple[int, str, int], np.ndarray] = {}
+    pos = 0
+    for key, windows in pending.items():
+        if windows:
+            fresh[key] = vectors[pos : pos + len(windows)]
+            pos += len(windows)
+    for i, key in enumerate(keys):
+        if out[i] is None:
+            if key in fresh:
+                out[i] = fresh[key]
+            else:
+                if dim is None:
+                    dim = getattr(emb, "dimension", None) or len(emb.embed_query(" "))
+                out[i] = np.zeros((0, dim), dtype=np.float32)
+    with _window_cache_lock:
+        for key, mat in fresh.items():
+            _window_cache[key] = (emb, mat)
+        while len(_window_cache) > _WINDOW_CACHE_SIZE:
+            _window_cache.popitem(last=False)
+    return out  # type: ignore[return-value]
+
+
+def _pooling() -> str:
+    pooling = settings.embedding_pooling.lower()
+    return pooling if pooling in ("mean", "max", "attention") else "mean"
+
+
+def _pool(windows: np.ndarray, pooling: str, dim: int) -> np.ndarray:
+    if len(windows) == 0:
+        return np.zeros(dim, dtype=np.float32)
+    if pooling == "max":
+        return windows.max(axis=0)
+    # attention needs a query; without one (job side, index storage) it degrades to mean.
+    return windows.mean(axis=0)
+
+
+def _unit(vec: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vec, axis=-1, keepdims=True)
+    return np.divide(vec, norm, out=np.zeros_like(vec), where=norm > 0)
+
+
+def embed_blocks(texts: Sequence[str], max_chars: int = 12000, pooling: Optional[str] = None) -> np.ndarray:
+    """One pooled (unit) vector per text from its token windows; zero rows for empty texts."""
+    mats = embed_windows(texts, [max_chars] * len(texts))
+    dim = mats[0].shape[1] if mats else 0
+    pooling = pooling or _pooling()
+    return _unit(np.stack([_pool(m, pooling, dim) for m in mats])) if mats else np.zeros((0, 0), np.float32)
+
+
+def _cosine_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise cosine similarity mapped to 0..1 like _cosine_similarity; zero rows give 0.5."""
+    na = np.linalg.norm(a, axis=1, keepdims=True)
+    nb = np.linalg.norm(b, axis=1, keepdims=True)
+    a_n = np.divide(a, na, out=np.zeros_like(a), where=na > 0)
+    b_n = np.divide(b, nb, out=np.zeros_like(b), where=nb > 0)
+    return (a_n @ b_n.T + 1.0) / 2.0
+
+
+def _pooled_similarity(cv_windows: Sequence[np.ndarray], job_vecs: np.ndarray, pooling: str) -> np.ndarray:
+    """(M, N) similarity of CV blocks (window matrices) to pooled job vectors, mapped to 0..1."""
+    dim = job_vecs.shape[1]
+    if pooling != "attention":
+        return _cosine_matrix(np.stack([_pool(w, pooling, dim) for w in cv_windows]), job_vecs)
+    # Attention: each job weights the CV windows by softmax(cos / T) before pooling.
+    job_n = _unit(job_vecs)
+    temperature = max(1e-3, settings.embedding_attention_temperature)
+    out = np.full((len(cv_windows), len(job_vecs)), 0.5)
+    for i, w in enumerate(cv_windows):
+        if len(w) == 0:
+            continue
+        sims = _unit(w) @ job_n.T
+        weights = np.exp((sims - sims.max(axis=0, keepdims=True)) / temperature)
+        weights /= weights.sum(axis=0, keepdims=True)
+        pooled = _unit(weights.T @ w)
+        out[i] = ((pooled * job_n).sum(axis=1) + 1.0) / 2.0
+    return out
+
+
+@dataclass
+class SemanticBlocks:
+    """CV-side blocks for batched scoring (same inputs as compute_semantic_match)."""
+
+    skills: List[str]
+    experience_text: str
+    full_text: str
+
+
+def _cv_block_texts(cv: SemanticBlocks) -> List[Tuple[str, int]]:
+    return [(_skills_block(cv.skills), 8000), (cv.experience_text, 8000), (cv.full_text, 12000)]
+
+
+def cv_block_vectors(cvs: Sequence[SemanticBlocks]) -> np.ndarray:
+    """(M, 3, d) pooled unit vectors for the skills, experience and full-CV blocks (attention pools as mean)."""
+    if not cvs:
+        return np.zeros((0, 3, 0), dtype=np.float32)
+    items = [item for cv in cvs for item in _cv_block_texts(cv)]
+    mats = embed_windows([t for t, _ in items], [m for _, m in items])
+    dim = mats[0].shape[1]
+    pooling = _pooling()
+    return _unit(np.stack([_pool(m, pooling, dim) for m in mats])).reshape(len(cvs), 3, dim)
+
+
+def job_block_vectors(job_text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Pooled unit vectors for a job's requirements and full-text blocks."""
+    req, full = embed_windows([job_text, job_text], [8000, 12000])
+    dim = req.shape[1]
+    pooling = _pooling()
+    return _unit(_pool(req, pooling, dim)), _unit(_pool(full, pooling, dim))
+
+
+def _semantic_match_core(
+    cvs: Sequence[SemanticBlocks],
+    job_req_texts: Sequence[str],
+    job_full_texts: Sequence[str],
+) -> List[List[SemanticMatchResult]]:
+    w_skills, w_exp, w_overall = normalized_semantic_weights()
+    m, n = len(cvs), len(job_req_texts)
+    if m == 0 or n == 0:
+        return [[] for _ in range(m)]
+
+    cv_items = [item for cv in cvs for item in _cv_block_texts(cv)]
+    mats = embed_windows(
+        [t for t, _ in cv_items] + list(job_req_texts) + list(job_full_texts),
+        [c for _, c in cv_items] + [8000] * n + [12000] * n,
+    )
+    skills_w, exp_w, full_w = mats[0 : 3 * m : 3], mats[1 : 3 * m : 3], mats[2 : 3 * m : 3]
+    job_req_w, job_full_w = mats[3 * m : 3 * m + n], mats[3 * m + n :]
+    pooling = _pooling()
+    dim = mats[0].shape[1]
+    job_req_v = np.stack([_pool(w, pooling, dim) for w in job_req_w])
+    job_full_v = np.stack([_pool(w, pooling, dim) for w in job_full_w])
+
+    has_req = np.array([len(w) > 0 for w in job_req_w])[None, :]
+    has_job_full = np.array([len(w) > 0 for w in job_full_w])[None, :]
+
+    def _component(cv_w: Sequence[np.ndarray], job_vecs: np.ndarray, job_present: np.ndarray):
+        sims = _pooled_similarity(cv_w, job_vecs, pooling)
+        present = np.array([len(w) > 0 for w in cv_w])[:, None]
+        return np.where(job_present, np.where(present, sims, 0.0), 1.0)
+
+    skills_sim = _component(skills_w, job_req_v, has_req)
+    exp_sim = _component(exp_w, job_req_v, has_req)
+    overall_sim = _component(full_w, job_full_v, has_job_full)
+    scores = np.clip(w_skills * skills_sim + w_exp * exp_sim + w_overall * overall_sim, 0.0, 1.0)
+
+    return [
+        [
+            SemanticMatchResult(
+                score=float(scores[i, j]),
+                skills_similarity=float(skills_sim[i, j]),
+                experience_similarity=float(exp_sim[i, j]),
+                overall_similarity=float(overall_sim[i, j]),
+            )
+            for j in range(n)
+        ]
+        for i in range(m)
+    ]
+
+
+def semantic_match_matrix(
+    cvs: Sequence[SemanticBlocks],
+    job_texts: Sequence[str],
+) -> List[List[SemanticMatchResult]]:
+    """Score M CVs against N jobs: one batched embedding call for every block window, then matmuls.
+
+    Returns results[m][n] equal to compute_semantic_match with
+    job_requirements_text == job_full_text == job_texts[n], the way CVAnalyzer calls it.
+    """
+    return _semantic_match_core(cvs, job_texts, job_texts)
+
+
 def compute_semantic_match(
     cv_skills: List[str],
     cv_experience_text: str,
@@ -146,50 +498,5 @@ def compute_semantic_match(
     job_requirements_text: str,
     job_full_text: str,
 ) -> SemanticMatchResult:
-    w_skills, w_exp, w_overall = normalized_semantic_weights()
-
-    def _block(text: str, max_chars: int = 8000) -> str:
-        if not text or not text.strip():
-            return ""
-        t = text.strip()
-        return t[:max_chars] if len(t) > max_chars else t
-
-    cv_skills_block = " ".join(s for s in cv_skills if s and s.strip()) if cv_skills else ""
-    cv_exp_block = _block(cv_experience_text)
-    cv_full_block = _block(cv_full_text, max_chars=12000)
-    job_req_block = _block(job_requirements_text)
-    job_full_block = _block(job_full_text, max_chars=12000)
-
-    skills_cv_vec = embed_text(cv_skills_block) if cv_skills_block else None
-    exp_cv_vec = embed_text(cv_exp_block) if cv_exp_block else None
-    full_cv_vec = embed_text(cv_full_block) if cv_full_block else None
-    job_req_vec = embed_text(job_req_block) if job_req_block else None
-    job_full_vec = embed_text(job_full_block) if job_full_block else None
-
-    skills_sim = 0.0
-    if skills_cv_vec and job_req_vec:
-        skills_sim = _cosine_similarity(skills_cv_vec, job_req_vec)
-    elif not job_req_vec:
-        skills_sim = 1.0
-
-    exp_sim = 0.0
-    if exp_cv_vec and job_req_vec:
-        exp_sim = _cosine_similarity(exp_cv_vec, job_req_vec)
-    elif not job_req_vec:
-        exp_sim = 1.0
-
-    overall_sim = 0.0
-    if full_cv_vec and job_full_vec:
-        overall_sim = _cosine_similarity(full_cv_vec, job_full_vec)
-    elif not job_full_block:
-        overall_sim = 1.0
-
-    score = w_skills * skills_sim + w_exp * exp_sim + w_overall * overall_sim
-    score = max(0.0, min(1.0, score))
-
-    return SemanticMatchResult(
-        score=score,
-        skills_similarity=skills_sim,
-        experience_similarity=exp_sim,
-        overall_similarity=overall_sim,
-    )
+    cv = SemanticBlocks(skills=cv_skills, experience_text=cv_experience_text, full_text=cv_full_text)
+    return _semantic_match_core([cv], [job_requirements_text], [job_full_text])[0][0]
@@ -0,0 +1,16 @@
+import hmac
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app.config import settings
+
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+def check_admin_token(token: Optional[str]) -> None:
+    """Admin features are hidden (404) unless ADMIN_TOKEN is set, and need it in X-Admin-Token (403)."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not hmac.compare_digest(token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Недійсний токен адміністратора.")
@@ -0,0 +1,93 @@
+"""Incremental parser for a single streamed JSON object.
+
+Fed with LLM token chunks, it reports each top-level field as soon as its value closes, so callers can
+act on partial output (forward fields downstream, abort on an empty or malformed object) before the
+generation finishes.
+"""
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class IncrementalJSONObjectParser:
+    def __init__(self, max_preamble_chars: int = 256) -> None:
+        self._max_preamble = max_preamble_chars
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self.error: Optional[str] = None
+
+    @property
+    def consumed_chars(self) -> int:
+        return len(self._text)
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk; return (key, value) pairs for top-level fields closed by it."""
+        closed: List[Tuple[str, Any]] = []
+        if self.done or self.error or not chunk:
+            return closed
+        self._text += chunk
+        text = self._text
+        i = self._pos
+        while i < len(text) and not self.done and not self.error:
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._value_start is None and self._key_start is not None:
+                        self._key = json.loads(text[self._key_start : i + 1])
+                        self._key_start = None
+            elif self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                elif i >= self._max_preamble:
+                    self.error = "no JSON object in model output"
+            elif ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._value_start is None:
+                    self._key_start = i
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 1:
+                    if ch != "}":
+                        self.error = "unbalanced brackets"
+                        break
+                    self._close_value(i, closed)
+                    self.done = True
+                self._depth -= 1
+            elif self._depth == 1:
+                if ch == ":" and self._key is not None and self._value_start is None:
+                    self._value_start = i + 1
+                elif ch == ",":
+                    self._close_value(i, closed)
+            i += 1
+        self._pos = i
+        return closed
+
+    def _close_value(self, end: int, closed: List[Tuple[str, Any]]) -> None:
+        if self._value_start is None:
+            if self._key is not None:
+                self.error = f"missing value for key {self._key!r}"
+            return
+        raw = self._text[self._value_start : end].strip()
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            self.error = f"invalid JSON value for key {self._key!r}"
+            return
+        key = self._key or ""
+        self.fields[key] = value
+        closed.append((key, value))
+        self._key = None
+        self._value_start = None
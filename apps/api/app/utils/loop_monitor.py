@@ -0,0 +1,165 @@
+"""Event-loop lag monitoring and blocking-call detection.
+
+LoopLagMonitor runs a ticker task that sleeps loop_monitor_interval_ms and records how late it woke
+up (cv_event_loop_lag_seconds). A watchdog thread watches the ticker's heartbeat: when the loop has
+not come round for loop_block_threshold_ms, one callback is hogging it, and the watchdog logs a stack
+sample of the loop thread, taken while the stall is still in progress, so the log names the blocking
+code. `measure_loop_blocking()` is the same measurement for tests.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional
+
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_LAG = REGISTRY.histogram(
+    "cv_event_loop_lag_seconds",
+    "How late the event loop ran a timer callback (scheduling lag).",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+_STALLS = REGISTRY.counter(
+    "cv_event_loop_stalls_total",
+    "Times one callback blocked the event loop for longer than loop_block_threshold_ms.",
+)
+
+
+def _stack_of(thread_id: int) -> str:
+    frame = sys._current_frames().get(thread_id)
+    return "".join(traceback.format_stack(frame)) if frame is not None else "<no frame>"
+
+
+class LoopLagMonitor:
+    def __init__(self, interval_s: float = 0.1, block_threshold_s: float = 0.25) -> None:
+        self.interval_s = max(0.001, interval_s)
+        self.block_threshold_s = max(self.interval_s, block_threshold_s)
+        self.max_lag_s = 0.0
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._tick(), name="loop-lag-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _tick(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._heartbeat = now
+            self.max_lag_s = max(self.max_lag_s, lag)
+            _LAG.observe(lag)
+
+    def _watch(self) -> None:
+        reported_for = 0.0
+        while not self._stopped.wait(self.block_threshold_s / 2):
+            beat = self._heartbeat
+            stalled = time.monotonic() - beat - self.interval_s
+            if stalled < self.block_threshold_s or beat == reported_for:
+                continue
+            reported_for = beat
+            _STALLS.inc()
+            logger.warning(
+                "Event loop blocked for %.0f ms (still running); loop thread stack:\n%s",
+                stalled * 1000,
+                _stack_of(self._loop_thread_id) if self._loop_thread_id is not None else "<unknown>",
+            )
+
+
+_monitor: Optional[LoopLagMonitor] = None
+
+
+def get_loop_monitor() -> Optional[LoopLagMonitor]:
+    return _monitor
+
+
+async def start_loop_monitor(interval_s: float, block_threshold_s: float) -> LoopLagMonitor:
+    global _monitor
+    if _monitor is None:
+        _monitor = LoopLagMonitor(interval_s, block_threshold_s)
+        _monitor.start()
+    return _monitor
+
+
+async def stop_loop_monitor() -> None:
+    global _monitor
+    if _monitor is not None:
+        await _monitor.stop()
+        _monitor = None
+
+
+@dataclass
+class LoopBlocking:
+    max_block_s: float = 0.0
+    stacks: List[str] = field(default_factory=list)
+
+
+@asynccontextmanager
+async def measure_loop_blocking(interval_s: float = 0.005, sample_after_s: float = 0.05) -> AsyncIterator[LoopBlocking]:
+    """Longest stretch the loop went without running a timer inside the block, with stack samples of
+    stalls longer than sample_after_s. Test helper:
+
+        async with measure_loop_blocking() as blocking:
+            await client.post("/api/v1/analyze", ...)
+        assert blocking.max_block_s < 0.1, blocking.stacks
+    """
+    result = LoopBlocking()
+    loop_thread = threading.get_ident()
+    state = {"beat": time.monotonic(), "sampled": 0.0}
+    done = threading.Event()
+
+    async def tick() -> None:
+        while True:
+            await asyncio.sleep(interval_s)
+            now = time.monotonic()
+            result.max_block_s = max(result.max_block_s, now - state["beat"] - interval_s)
+            state["beat"] = now
+
+    def watch() -> None:
+        while not done.wait(sample_after_s / 2):
+            beat = state["beat"]
+            if time.monotonic() - beat > sample_after_s + interval_s and beat != state["sampled"]:
+                state["sampled"] = beat
+                result.stacks.append(_stack_of(loop_thread))
+
+    task = asyncio.get_running_loop().create_task(tick())
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    try:
+        yield result
+    finally:
+        done.set()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        watcher.join()
+        # The final stretch since the last tick counts too.
+        result.max_block_s = max(result.max_block_s, time.monotonic() - state["beat"] - interval_s)
@@ -0,0 +1,218 @@
+"""Opt-in per-stage memory accounting (MEMORY_PROFILING=true), read at GET /api/v1/admin/memory.
+
+Every `stage_metrics.stage(...)` block records the process RSS delta, the tracemalloc delta (bytes
+still allocated when the stage ends) and the tracemalloc peak above the stage's starting point.
+Aggregates per stage point at stages that spike (peak) or retain memory across requests (a traced
+delta that stays positive), and the top allocation sites compare the current heap with the snapshot
+taken when tracing started or was last reset. tracemalloc is process-wide: with concurrent requests
+a stage is charged for everything allocated while it ran, so numbers are sharpest at low load.
+"""
+
+import os
+import threading
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from app.config import settings
+from app.utils.metrics import REGISTRY
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+_STAGE_PEAK = REGISTRY.histogram(
+    "cv_stage_memory_peak_bytes",
+    "tracemalloc peak above the stage's starting heap (MEMORY_PROFILING only).",
+    ["stage"],
+    buckets=(1 << 20, 4 << 20, 16 << 20, 64 << 20, 256 << 20, 1 << 30, 4 << 30),
+)
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size (Linux /proc), or None where it cannot be read cheaply."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+@dataclass
+class StageMemory:
+    stage: str
+    rss_delta: Optional[int]
+    traced_delta: int
+    peak: int
+
+
+class _Measurement:
+    __slots__ = ("stage", "rss_start", "traced_start", "peak")
+
+    def __init__(self, stage: str, rss_start: Optional[int], traced_start: int) -> None:
+        self.stage = stage
+        self.rss_start = rss_start
+        self.traced_start = traced_start
+        self.peak = traced_start
+
+
+class _StageAggregate:
+    __slots__ = ("count", "rss_delta_sum", "rss_delta_max", "traced_delta_sum", "traced_delta_max", "peak_sum", "peak_max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.rss_delta_sum = 0
+        self.rss_delta_max = 0
+        self.traced_delta_sum = 0
+        self.traced_delta_max = 0
+        self.peak_sum = 0
+        self.peak_max = 0
+
+    def add(self, m: StageMemory) -> None:
+        self.count += 1
+        if m.rss_delta is not None:
+            self.rss_delta_sum += m.rss_delta
+            self.rss_delta_max = max(self.rss_delta_max, m.rss_delta)
+        self.traced_delta_sum += m.traced_delta
+        self.traced_delta_max = max(self.traced_delta_max, m.traced_delta)
+        self.peak_sum += m.peak
+        self.peak_max = max(self.peak_max, m.peak)
+
+
+class MemoryAccounting:
+    def __init__(self, trace_frames: int = 1, recent_requests: int = 50) -> None:
+        self.trace_frames = max(1, trace_frames)
+        self._lock = threading.Lock()
+        self._active: List[_Measurement] = []
+        self._stages: Dict[str, _StageAggregate] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=max(1, recent_requests))
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._started_tracing = False
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._started_tracing = True
+        self._baseline = tracemalloc.take_snapshot()
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._baseline = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._recent.clear()
+        self._baseline = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+
+    def _fold_peak(self) -> None:
+        # tracemalloc has one peak counter; carry it into every open stage before it is reset.
+        peak = tracemalloc.get_traced_memory()[1]
+        for m in self._active:
+            m.peak = max(m.peak, peak)
+
+    def begin(self, stage: str) -> _Measurement:
+        rss = rss_bytes()
+        with self._lock:
+            self._fold_peak()
+            tracemalloc.reset_peak()
+            m = _Measurement(stage, rss, tracemalloc.get_traced_memory()[0])
+            self._active.append(m)
+        return m
+
+    def end(self, m: _Measurement) -> StageMemory:
+        with self._lock:
+            self._fold_peak()
+            traced_now = tracemalloc.get_traced_memory()[0]
+            self._active.remove(m)
+            rss = rss_bytes()
+            result = StageMemory(
+                stage=m.stage,
+                rss_delta=rss - m.rss_start if rss is not None and m.rss_start is not None else None,
+                traced_delta=traced_now - m.traced_start,
+                peak=max(0, m.peak - m.traced_start),
+            )
+            self._stages.setdefault(m.stage, _StageAggregate()).add(result)
+        _STAGE_PEAK.observe(result.peak, stage=m.stage)
+        return result
+
+    def record_request(self, path: str, stages: List[StageMemory]) -> None:
+        if not stages:
+            return
+        with self._lock:
+            self._recent.append(
+                {
+                    "path": path,
+                    "stages": [vars(s).copy() for s in stages],
+                }
+            )
+
+    def top_allocation_sites(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Largest heap growth since the baseline snapshot, grouped by the allocating line."""
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"))
+        )
+        if self._baseline is not None:
+            stats = snapshot.compare_to(self._baseline, "lineno")
+        else:
+            stats = snapshot.statistics("lineno")
+        sites = []
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            sites.append(
+                {
+                    "location": f"{frame.filename}:{frame.lineno}",
+                    "size_bytes": stat.size,
+                    "size_diff_bytes": getattr(stat, "size_diff", stat.size),
+                    "count": stat.count,
+                    "count_diff": getattr(stat, "count_diff", stat.count),
+                }
+            )
+        return sites
+
+    def report(self, top: int = 20) -> Dict[str, Any]:
+        with self._lock:
+            stages = {
+                name: {
+                    "count": a.count,
+                    "rss_delta_mean_bytes": a.rss_delta_sum / a.count,
+                    "rss_delta_max_bytes": a.rss_delta_max,
+                    "traced_delta_mean_bytes": a.traced_delta_sum / a.count,
+                    "traced_delta_total_bytes": a.traced_delta_sum,
+                    "traced_delta_max_bytes": a.traced_delta_max,
+                    "peak_mean_bytes": a.peak_sum / a.count,
+                    "peak_max_bytes": a.peak_max,
+                }
+                for name, a in sorted(self._stages.items())
+            }
+            recent = list(self._recent)
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        return {
+            "enabled": tracemalloc.is_tracing(),
+            "rss_bytes": rss_bytes(),
+            "traced_bytes": current,
+            "stages": stages,
+            "recent_requests": recent,
+            "top_allocation_sites": self.top_allocation_sites(top),
+        }
+
+
+_accounting: Optional[MemoryAccounting] = None
+_accounting_lock = threading.Lock()
+
+
+def get_memory_accounting() -> Optional[MemoryAccounting]:
+    """The process-wide accounting (started on first use), or None unless MEMORY_PROFILING is on."""
+    global _accounting
+    if not settings.memory_profiling:
+        return None
+    if _accounting is None:
+        with _accounting_lock:
+            if _accounting is None:
+                accounting = MemoryAccounting(settings.memory_trace_frames, settings.memory_recent_requests)
+                accounting.start()
+                _accounting = accounting
+    return _accounting
@@ -0,0 +1,197 @@
+"""On-demand profiling of single requests (admin only).
+
+A request to a profiled path carrying `?profile=sample|cprofile` or `X-Profile: sample|cprofile`
+together with a valid X-Admin-Token runs under a profiler; the response gets an X-Profile-Id header and
+the profile is downloadable at GET /api/v1/admin/profiles/{id}. Requests without the flag pass straight
+through (one header/query lookup).
+
+- sample: a thread samples the stacks of all threads every profile_sample_interval_ms and writes
+  collapsed stacks (`thread;outer;...;inner count`, for flamegraph.pl or speedscope). Covers work in
+  asyncio.to_thread workers; other requests running at the same time show up as well.
+- cprofile: deterministic cProfile of the event-loop thread, saved as pstats. Functions run in worker
+  threads appear only as the awaiting coroutine; use sample for those.
+
+At most profile_max_concurrent requests are profiled at once; more are answered with 429.
+"""
+
+import asyncio
+import cProfile
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+from app.utils.admin_auth import ADMIN_TOKEN_HEADER, check_admin_token
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("sample", "cprofile")
+_SUFFIX = {"sample": ".collapsed", "cprofile": ".pstats"}
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+# Frames of threads parked in these stdlib modules are idle (executor workers, selector, queues).
+_IDLE_FILES = tuple(os.sep + name for name in ("threading.py", "selectors.py", "queue.py"))
+
+
+def _frame_label(code: Any) -> str:
+    module = Path(code.co_filename).stem
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class StackSampler:
+    def __init__(self, interval_s: float) -> None:
+        self.interval_s = max(0.0005, interval_s)
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> str:
+        self._stop.set()
+        self._thread.join()
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for tid, frame in sys._current_frames().items():
+                if tid == me or frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+                stack: List[str] = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(tid, str(tid)))
+                self.samples[";".join(reversed(stack))] += 1
+
+
+class ProfileStore:
+    """Profiles on disk as <id>.collapsed / <id>.pstats; the oldest beyond profile_max_stored are deleted."""
+
+    def __init__(self, directory: str, max_stored: int) -> None:
+        self.dir = Path(directory)
+        self.max_stored = max(1, max_stored)
+
+    def _files(self) -> List[Path]:
+        if not self.dir.is_dir():
+            return []
+        files = [p for p in self.dir.iterdir() if p.suffix in _SUFFIX.values() and _PROFILE_ID.match(p.stem)]
+        return sorted(files, key=lambda p: p.stat().st_mtime)
+
+    def save(self, profile_id: str, mode: str, data: Any) -> Path:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        path = self.dir / f"{profile_id}{_SUFFIX[mode]}"
+        if mode == "cprofile":
+            data.dump_stats(str(path))
+        else:
+            path.write_text(data, encoding="utf-8")
+        for old in self._files()[: -self.max_stored]:
+            old.unlink(missing_ok=True)
+        return path
+
+    def find(self, profile_id: str) -> Optional[Path]:
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        for suffix in _SUFFIX.values():
+            path = self.dir / f"{profile_id}{suffix}"
+            if path.is_file():
+                return path
+        return None
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": p.stem,
+                "mode": "cprofile" if p.suffix == ".pstats" else "sample",
+                "size_bytes": p.stat().st_size,
+                "created_at": p.stat().st_mtime,
+            }
+            for p in reversed(self._files())
+        ]
+
+
+def get_profile_store() -> ProfileStore:
+    return ProfileStore(settings.profile_dir, settings.profile_max_stored)
+
+
+def _requested_mode(scope: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """(profile mode, admin token) from the query string / headers; mode is None when not requested."""
+    mode = token = None
+    for name, value in scope.get("headers", ()):
+        if name == b"x-profile":
+            mode = value.decode("latin-1").strip().lower()
+        elif name == ADMIN_TOKEN_HEADER.lower().encode():
+            token = value.decode("latin-1")
+    if mode is None and b"profile=" in scope.get("query_string", b""):
+        mode = (parse_qs(scope["query_string"].decode("latin-1")).get("profile") or [""])[0].strip().lower()
+    return mode, token
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, paths: Tuple[str, ...] = ("/api/v1/analyze",)) -> None:
+        self.app = app
+        self.paths = paths
+        self.active = 0
+        self.cprofile_active = False
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        mode, token = _requested_mode(scope)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            check_admin_token(token)
+            if mode not in PROFILE_MODES:
+                raise HTTPException(status_code=400, detail=f"Невідомий режим профілювання: {mode}. Доступні: sample, cprofile.")
+            # The event-loop thread has a single profile hook, so deterministic runs never overlap.
+            if self.active >= max(1, settings.profile_max_concurrent) or (mode == "cprofile" and self.cprofile_active):
+                raise HTTPException(status_code=429, detail="Забагато запитів із профілюванням. Спробуйте пізніше.")
+        except HTTPException as e:
+            await JSONResponse({"detail": e.detail}, status_code=e.status_code)(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+
+        async def send_with_id(message) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        self.active += 1
+        started = time.monotonic()
+        profiler: Any
+        if mode == "cprofile":
+            self.cprofile_active = True
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = StackSampler(settings.profile_sample_interval_ms / 1000.0)
+            profiler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            if mode == "cprofile":
+                profiler.disable()
+                self.cprofile_active = False
+                data = profiler
+            else:
+                data = await asyncio.to_thread(profiler.stop)
+            self.active -= 1
+            path = await asyncio.to_thread(get_profile_store().save, profile_id, mode, data)
+            logger.info("Profiled %s in %.2fs (%s): %s", scope["path"], time.monotonic() - started, mode, path)
@@ -0,0 +1,154 @@
+"""Deterministic skill/technology extraction with an Aho-Corasick automaton over a skill taxonomy.
+
+The taxonomy maps a canonical skill name to its aliases ("JavaScript": ["JS", "ECMAScript"]). All
+surface forms are compiled into one automaton, so a CV or job text is scanned in a single linear
+pass regardless of taxonomy size. Matches must sit on word boundaries and are case-insensitive,
+except for forms of up to two characters ("Go", "R", "ML"), which must match as written.
+"""
+
+import json
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.config import settings
+from app.utils.skill_taxonomy import DEFAULT_SKILL_TAXONOMY
+
+logger = logging.getLogger(__name__)
+
+
+# Short forms ("Go", "R", "ML") are common words or letters in any other case.
+_CASE_SENSITIVE_MAX_LEN = 2
+
+
+def _fold(ch: str) -> str:
+    """Length-preserving case fold, so match offsets stay valid in the original text."""
+    if ch.isspace():
+        return " "
+    low = ch.lower()
+    return low if len(low) == 1 else ch
+
+
+def _normalize(form: str) -> str:
+    return "".join(_fold(c) for c in " ".join(form.split()))
+
+
+@dataclass(frozen=True)
+class SkillMention:
+    skill: str
+    start: int
+    end: int
+    text: str
+
+
+class SkillMatcher:
+    def __init__(self, taxonomy: Mapping[str, Iterable[str]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per node: (pattern length, canonical skill, exact form or None) for every pattern ending here,
+        # including those reached via fail links.
+        self._out: List[List[Tuple[int, str, Optional[str]]]] = [[]]
+        self.size = 0
+        for canonical, aliases in taxonomy.items():
+            for form in {canonical, *aliases}:
+                form = " ".join(form.split())
+                exact = form if len(form) <= _CASE_SENSITIVE_MAX_LEN else None
+                if self._add(_normalize(form), canonical, exact):
+                    self.size += 1
+        self._link()
+
+    def _add(self, pattern: str, canonical: str, exact: Optional[str]) -> bool:
+        if not pattern.strip():
+            return False
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        if any(length == len(pattern) and e == exact for length, _, e in self._out[node]):
+            return False
+        self._out[node].append((len(pattern), canonical, exact))
+        return True
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> List[SkillMention]:
+        """Leftmost-longest, non-overlapping mentions on word boundaries."""
+        if not text:
+            return []
+        goto, fail, out = self._goto, self._fail, self._out
+        n = len(text)
+        candidates: List[Tuple[int, int, str]] = []
+        node = 0
+        for i, raw in enumerate(text):
+            ch = _fold(raw)
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, skill, exact in out[node]:
+                start, end = i + 1 - length, i + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (end == n or not text[end].isalnum()):
+                    if exact is None or text[start:end] == exact:
+                        candidates.append((start, end, skill))
+        candidates.sort(key=lambda c: (c[0], c[0] - c[1]))
+        mentions: List[SkillMention] = []
+        last_end = 0
+        for start, end, skill in candidates:
+            if start >= last_end:
+                mentions.append(SkillMention(skill=skill, start=start, end=end, text=text[start:end]))
+                last_end = end
+        return mentions
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical skills in order of first mention, without duplicates."""
+        seen: Dict[str, None] = {}
+        for m in self.find(text):
+            seen.setdefault(m.skill, None)
+        return list(seen)
+
+
+def load_taxonomy(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Built-in taxonomy, extended (or overridden per skill) by a JSON file {"Skill": ["alias", ...]}."""
+    taxonomy: Dict[str, List[str]] = {k: list(v) for k, v in DEFAULT_SKILL_TAXONOMY.items()}
+    path = settings.skill_taxonomy_path if path is None else path
+    if path:
+        with open(path, encoding="utf-8") as f:
+            extra = json.load(f)
+        for skill, aliases in extra.items():
+            taxonomy[str(skill)] = [str(a) for a in aliases or []]
+    return taxonomy
+
+
+_matcher: Optional[SkillMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher() -> SkillMatcher:
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SkillMatcher(load_taxonomy())
+                logger.info("Skill matcher: %d surface forms compiled", _matcher.size)
+    return _matcher
+
+
+def extract_skills(text: str) -> List[str]:
+    return get_skill_matcher().extract(text)
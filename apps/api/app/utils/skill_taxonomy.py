@@ -0,0 +1,169 @@
+"""Built-in skill taxonomy: canonical name -> aliases (English and Ukrainian forms).
+
+Extend or override it with SKILL_TAXONOMY_PATH (JSON with the same shape); see skill_matcher.py.
+"""
+from typing import Dict, List
+
+DEFAULT_SKILL_TAXONOMY: Dict[str, List[str]] = {
+    # Languages
+    "Python": ["python3", "пайтон", "пітон"],
+    "Java": ["java se", "java ee", "джава"],
+    "JavaScript": ["JS", "ECMAScript", "ES6", "джаваскрипт"],
+    "TypeScript": ["TS"],
+    "C": ["ANSI C"],
+    "C++": ["cpp", "c plus plus"],
+    "C#": ["c sharp", "csharp"],
+    "Go": ["golang"],
+    "Rust": [],
+    "Kotlin": [],
+    "Swift": [],
+    "Objective-C": ["objc", "objective c"],
+    "PHP": [],
+    "Ruby": [],
+    "Scala": [],
+    "R": ["R language"],
+    "Dart": [],
+    "Elixir": [],
+    "Haskell": [],
+    "Perl": [],
+    "Lua": [],
+    "MATLAB": [],
+    "Bash": ["shell scripting", "bash scripting"],
+    "PowerShell": [],
+    "SQL": ["T-SQL", "PL/SQL", "tsql"],
+    "HTML": ["HTML5"],
+    "CSS": ["CSS3"],
+    "Sass": ["SCSS"],
+    # Frontend
+    "React": ["React.js", "ReactJS"],
+    "React Native": [],
+    "Redux": [],
+    "Next.js": ["NextJS"],
+    "Vue.js": ["Vue", "VueJS"],
+    "Nuxt.js": ["Nuxt"],
+    "Angular": ["AngularJS"],
+    "Svelte": [],
+    "jQuery": [],
+    "Tailwind CSS": ["Tailwind"],
+    "Bootstrap": [],
+    "Webpack": [],
+    "Vite": [],
+    # Backend / frameworks
+    "Node.js": ["NodeJS"],
+    "Express.js": ["ExpressJS"],
+    "NestJS": ["Nest.js"],
+    "Django": [],
+    "Django REST Framework": ["DRF"],
+    "Flask": [],
+    "FastAPI": [],
+    "Spring": ["Spring Framework"],
+    "Spring Boot": [],
+    "Hibernate": [],
+    ".NET": ["dotnet", ".NET Core", "ASP.NET", "ASP.NET Core"],
+    "Laravel": [],
+    "Symfony": [],
+    "Ruby on Rails": ["RoR"],
+    "GraphQL": [],
+    "REST API": ["REST", "RESTful", "RESTful API", "REST APIs"],
+    "gRPC": [],
+    "WebSockets": ["WebSocket"],
+    "Microservices": ["microservice architecture", "мікросервіси", "мікросервісна архітектура"],
+    "Celery": [],
+    "SQLAlchemy": [],
+    "Pydantic": [],
+    "LangChain": [],
+    # Data stores / messaging
+    "PostgreSQL": ["Postgres", "psql"],
+    "MySQL": [],
+    "MariaDB": [],
+    "SQLite": [],
+    "Microsoft SQL Server": ["MS SQL", "MSSQL", "SQL Server"],
+    "Oracle Database": ["Oracle DB"],
+    "MongoDB": ["Mongo"],
+    "Redis": [],
+    "Elasticsearch": ["Elastic Search", "OpenSearch"],
+    "Cassandra": [],
+    "DynamoDB": [],
+    "ClickHouse": [],
+    "Kafka": ["Apache Kafka"],
+    "RabbitMQ": [],
+    "Apache Spark": ["Spark", "PySpark"],
+    "Hadoop": [],
+    "Airflow": ["Apache Airflow"],
+    "dbt": [],
+    "Snowflake": [],
+    "BigQuery": [],
+    # Cloud / DevOps
+    "AWS": ["Amazon Web Services"],
+    "Azure": ["Microsoft Azure"],
+    "Google Cloud": ["GCP", "Google Cloud Platform"],
+    "Docker": ["докер"],
+    "Kubernetes": ["k8s", "кубернетес"],
+    "Helm": [],
+    "Terraform": [],
+    "Ansible": [],
+    "Jenkins": [],
+    "GitLab CI": ["GitLab CI/CD"],
+    "GitHub Actions": [],
+    "CI/CD": ["continuous integration", "continuous delivery", "безперервна інтеграція"],
+    "Linux": ["Ubuntu", "Debian", "CentOS"],
+    "Nginx": [],
+    "Prometheus": [],
+    "Grafana": [],
+    "Git": ["GitHub", "GitLab", "Bitbucket"],
+    # Data science / ML
+    "Machine Learning": ["ML", "машинне навчання"],
+    "Deep Learning": ["DL", "глибоке навчання"],
+    "Natural Language Processing": ["NLP", "обробка природної мови"],
+    "Computer Vision": ["комп'ютерний зір", "комп’ютерний зір"],
+    "Large Language Models": ["LLM", "LLMs"],
+    "Data Analysis": ["аналіз даних", "data analytics"],
+    "Statistics": ["статистика"],
+    "pandas": [],
+    "NumPy": [],
+    "SciPy": [],
+    "scikit-learn": ["sklearn"],
+    "TensorFlow": [],
+    "Keras": [],
+    "PyTorch": [],
+    "Hugging Face": ["HuggingFace"],
+    "Jupyter": ["Jupyter Notebook"],
+    "Power BI": ["PowerBI"],
+    "Tableau": [],
+    "Excel": ["MS Excel", "Microsoft Excel"],
+    # Mobile
+    "Android": [],
+    "iOS": [],
+    "Flutter": [],
+    "SwiftUI": [],
+    # Testing / QA
+    "Unit Testing": ["юніт-тестування", "модульне тестування"],
+    "pytest": [],
+    "JUnit": [],
+    "Jest": [],
+    "Selenium": [],
+    "Cypress": [],
+    "Playwright": [],
+    "Postman": [],
+    "Manual Testing": ["ручне тестування"],
+    "Test Automation": ["автоматизоване тестування", "QA automation"],
+    # Practices / tools
+    "Agile": ["аджайл"],
+    "Scrum": ["скрам"],
+    "Kanban": [],
+    "Jira": [],
+    "Confluence": [],
+    "Design Patterns": ["патерни проєктування", "шаблони проєктування"],
+    "OOP": ["object-oriented programming", "ООП", "об'єктно-орієнтоване програмування"],
+    "System Design": [],
+    "Figma": [],
+    "UI/UX Design": ["UI/UX", "UX design", "UI design"],
+    "SEO": [],
+    "Project Management": ["управління проєктами", "управління проектами"],
+    "Team Leadership": ["team lead", "керівництво командою"],
+    # Languages (spoken)
+    "English": ["англійська", "англійська мова"],
+    "Ukrainian": ["українська", "українська мова"],
+    "German": ["німецька", "німецька мова"],
+    "Polish": ["польська", "польська мова"],
+}
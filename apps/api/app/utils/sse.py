@@ -0,0 +1,9 @@
+"""Server-Sent Events framing for streaming endpoints."""
+import json
+from typing import Any
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one SSE frame; `data` is serialized as a single-line JSON document."""
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return f"event: {event}\ndata: {payload}\n\n"
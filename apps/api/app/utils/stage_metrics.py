@@ -0,0 +1,155 @@
+"""Per-request pipeline stage timing, reported as a Server-Timing header and /metrics histograms.
+
+StageTimingMiddleware opens a RequestStages record per HTTP request and keeps it in a ContextVar, so
+`with stage("parse"):` works anywhere below the endpoint, including asyncio.to_thread workers (they
+run in a copy of the caller's context and share the same record). Histogram samples are written when
+the response finishes, labelled with the backend and model the analysis ended up using; stages that
+run outside a request (background jobs) are observed immediately.
+"""
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.utils.memory_profiler import StageMemory, get_memory_accounting
+from app.utils.metrics import REGISTRY
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "cv_stage_duration_seconds",
+    "Wall time of one pipeline stage (validate, parse, job_fetch, llm_extraction, ollama_fallback, "
+    "embeddings, shap, lime, narrative, pdf_render, ...).",
+    ["stage", "backend", "model"],
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "cv_request_duration_seconds",
+    "Wall time of instrumented HTTP requests, by route.",
+    ["path", "backend", "model"],
+)
+
+_TOKEN = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class RequestStages:
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.stages: List[Tuple[str, float]] = []
+        self.labels: Dict[str, str] = {"backend": "", "model": ""}
+        self.memory: List[StageMemory] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.stages.append((name, seconds))
+
+    def totals(self) -> Dict[str, float]:
+        """Seconds per stage name, summed over repeats (map-reduce chunks, retries), in first-seen order."""
+        out: Dict[str, float] = {}
+        with self._lock:
+            for name, seconds in self.stages:
+                out[name] = out.get(name, 0.0) + seconds
+        return out
+
+    def server_timing(self) -> str:
+        parts = [f"{_TOKEN.sub('_', name)};dur={seconds * 1000:.1f}" for name, seconds in self.totals().items()]
+        parts.append(f"total;dur={(time.monotonic() - self.started) * 1000:.1f}")
+        return ", ".join(parts)
+
+    def observe(self, path: str) -> None:
+        with self._lock:
+            stages = list(self.stages)
+        for name, seconds in stages:
+            STAGE_SECONDS.observe(seconds, stage=name, **self.labels)
+        REQUEST_SECONDS.observe(time.monotonic() - self.started, path=path, **self.labels)
+        accounting = get_memory_accounting()
+        if accounting is not None:
+            accounting.record_request(path, self.memory)
+
+
+_current: ContextVar[Optional[RequestStages]] = ContextVar("request_stages", default=None)
+
+
+def current_stages() -> Optional[RequestStages]:
+    return _current.get()
+
+
+def set_stage_labels(backend: Optional[str] = None, model: Optional[str] = None) -> None:
+    """Backend / model labels for this request's stage histograms (set once the LLM is chosen)."""
+    record = _current.get()
+    if record is None:
+        return
+    if backend is not None:
+        record.labels["backend"] = backend.lower()
+    if model is not None:
+        record.labels["model"] = model
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    accounting = get_memory_accounting()
+    measurement = accounting.begin(name) if accounting is not None else None
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        seconds = time.monotonic() - started
+        record = _current.get()
+        if measurement is not None:
+            usage = accounting.end(measurement)
+            if record is not None:
+                with record._lock:
+                    record.memory.append(usage)
+        if record is not None:
+            record.add(name, seconds)
+        else:
+            STAGE_SECONDS.observe(seconds, stage=name, backend="", model="")
+
+
+def route_template(scope) -> str:
+    """Path label with path parameters put back as {name} (/api/v1/analyses/{job_id}); "unmatched" if no route.
+
+    Raw URLs would make one metric series per job or candidate id.
+    """
+    if scope.get("route") is None:
+        return "unmatched"
+    segments = scope["path"].split("/")
+    for name, value in (scope.get("path_params") or {}).items():
+        for i in range(len(segments) - 1, -1, -1):
+            if segments[i] == str(value):
+                segments[i] = f"{{{name}}}"
+                break
+    return "/".join(segments)
+
+
+class StageTimingMiddleware:
+    """ASGI middleware: Server-Timing header with the stages finished before the response starts.
+
+    For streamed responses (SSE) later stages are missing from the header but still reach /metrics,
+    which are observed after the last body chunk.
+    """
+
+    def __init__(self, app, paths: Tuple[str, ...] = ("/api/",)) -> None:
+        self.app = app
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+        record = RequestStages()
+        token = _current.set(record)
+
+        async def send_with_timing(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", record.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            record.observe(route_template(scope))
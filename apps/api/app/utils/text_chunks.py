@@ -0,0 +1,72 @@
+"""Split long CV text into overlapping chunks at section / paragraph boundaries."""
+import re
+from typing import List, Tuple
+
+# Short lines that look like section headings ("ДОСВІД РОБОТИ", "Education:", "Projects").
+_HEADING = re.compile(r"^[^\W\d_][^.!?]{1,40}:?$")
+
+
+def _is_heading(line: str) -> bool:
+    s = line.strip()
+    return bool(_HEADING.match(s)) and (s.isupper() or s.endswith(":") or len(s.split()) <= 3)
+
+
+def _units(text: str, max_chars: int) -> List[Tuple[str, bool]]:
+    """(line, starts_section) pairs; lines longer than max_chars are split at whitespace."""
+    units: List[Tuple[str, bool]] = []
+    blank_before = True
+    for raw in text.split("\n"):
+        line = raw.strip()
+        if not line:
+            blank_before = True
+            continue
+        boundary = blank_before or _is_heading(line)
+        blank_before = False
+        while len(line) > max_chars:
+            cut = line.rfind(" ", 0, max_chars)
+            cut = cut if cut > max_chars // 2 else max_chars
+            units.append((line[:cut].strip(), boundary))
+            boundary = False
+            line = line[cut:].strip()
+        if line:
+            units.append((line, boundary))
+    return units
+
+
+def split_into_chunks(text: str, max_chars: int, overlap_chars: int = 0) -> List[str]:
+    """Pack lines into chunks of at most ~max_chars, cutting at the last section boundary when possible.
+
+    Each chunk after the first starts with trailing lines (up to overlap_chars) of the previous one,
+    so an entry that straddles a cut is seen whole by at least one chunk.
+    """
+    text = (text or "").strip()
+    if not text:
+        return []
+    if len(text) <= max_chars:
+        return [text]
+
+    units = _units(text, max_chars)
+    chunks: List[str] = []
+    start = 0
+    while start < len(units):
+        end = start
+        size = 0
+        while end < len(units) and (end == start or size + len(units[end][0]) + 1 <= max_chars):
+            size += len(units[end][0]) + 1
+            end += 1
+        if end < len(units):
+            # Prefer to end right before a section start in the second half of the chunk.
+            for cut in range(end - 1, start, -1):
+                if units[cut][1] and sum(len(u[0]) + 1 for u in units[start:cut]) >= max_chars // 2:
+                    end = cut
+                    break
+        chunks.append("\n".join(u[0] for u in units[start:end]))
+        if end >= len(units):
+            break
+        next_start = end
+        carried = 0
+        while next_start - 1 > start and carried + len(units[next_start - 1][0]) + 1 <= overlap_chars:
+            next_start -= 1
+            carried += len(units[next_start][0]) + 1
+        start = next_start
+    return chunks
@@ -0,0 +1 @@
+"""Performance benchmarks for the API pipeline (run from apps/api: python -m benchmarks.<name>)."""
@@ -0,0 +1,78 @@
+"""Recall/latency benchmark of CandidateIndex ivf search against exact search.
+
+Uses synthetic clustered block vectors (no embedding model needed):
+
+    python -m benchmarks.candidate_index_bench --candidates 50000 --queries 200 --top-k 10
+"""
+
+import argparse
+import json
+import time
+from typing import Tuple
+
+import numpy as np
+
+from app.services.candidate_index import SEARCH_MODES, CandidateIndex
+
+
+def _clustered(rng: np.random.Generator, n: int, centers: np.ndarray, noise: float) -> np.ndarray:
+    picks = centers[rng.integers(0, len(centers), size=n)]
+    return picks + noise * rng.standard_normal(picks.shape).astype(np.float32)
+
+
+def build_index(n: int, dim: int, clusters: int, seed: int) -> Tuple[CandidateIndex, np.ndarray]:
+    """Index of clustered candidates and the cluster centers (queries are drawn around the same centers)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    blocks = np.stack([_clustered(rng, n, centers, 0.6) for _ in range(3)], axis=1)
+    index = CandidateIndex()
+    index.add_many_vectors([f"cv-{i}" for i in range(n)], blocks)
+    return index, centers
+
+
+def run(n: int, dim: int, queries: int, top_k: int, clusters: int, nprobe: int, seed: int) -> dict:
+    index, centers = build_index(n, dim, clusters, seed)
+    q = _clustered(np.random.default_rng(seed + 1), queries, centers, 0.6)
+
+    t0 = time.perf_counter()
+    index.build_ivf()
+    ivf_build_s = time.perf_counter() - t0
+
+    report: dict = {"candidates": n, "dim": dim, "queries": queries, "top_k": top_k, "ivf_build_s": ivf_build_s}
+    truth = []
+    for mode in SEARCH_MODES:
+        latencies = []
+        recalls = []
+        for qi in range(queries):
+            start = time.perf_counter()
+            hits = index.search_vectors(q[qi], q[qi], top_k=top_k, mode=mode, nprobe=nprobe)
+            latencies.append(time.perf_counter() - start)
+            ids = {h.candidate_id for h in hits}
+            if mode == "exact":
+                truth.append(ids)
+            else:
+                recalls.append(len(ids & truth[qi]) / max(1, len(truth[qi])))
+        lat = np.array(latencies) * 1000
+        report[mode] = {
+            "p50_ms": float(np.percentile(lat, 50)),
+            "p95_ms": float(np.percentile(lat, 95)),
+            "recall_at_k": float(np.mean(recalls)) if recalls else 1.0,
+        }
+    return report
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--candidates", type=int, default=20000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--queries", type=int, default=100)
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--clusters", type=int, default=64)
+    ap.add_argument("--nprobe", type=int, default=4)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    print(json.dumps(run(args.candidates, args.dim, args.queries, args.top_k, args.clusters, args.nprobe, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
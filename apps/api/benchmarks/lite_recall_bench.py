@@ -0,0 +1,102 @@
+"""Field recall and latency of the no-LLM "lite" analysis against the LLM path on a labelled sample.
+
+Recall per field is the share of labelled items (skills, experience title+employer, education
+institution, certificate / project names) found in the extraction. The LLM path needs a configured
+backend (Ollama in development, Gemini otherwise) and is only run with --llm:
+
+    python -m benchmarks.lite_recall_bench
+    python -m benchmarks.lite_recall_bench --llm --semantic
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.models import CVAnalysisRequest
+from app.services.cv_analyzer import CVAnalyzer
+from app.services.cv_segmenter import lite_extraction
+
+DEFAULT_SAMPLE = Path(__file__).parent / "data" / "lite_labelled.jsonl"
+FIELDS = ("skills", "experience", "education", "certificates", "projects")
+# Labelled keys that must all be found in one extracted item.
+_KEYS = {"experience": ("title", "employer"), "education": ("institution",), "certificates": ("name",), "projects": ("name",)}
+
+
+def _norm(value: Any) -> str:
+    return " ".join(str(value or "").casefold().replace("’", "'").split())
+
+
+def _found(expected: str, got: str) -> bool:
+    return bool(expected) and bool(got) and (expected in got or got in expected)
+
+
+def field_recall(field: str, labels: List[Any], extracted: List[Any]) -> Optional[float]:
+    if not labels:
+        return None
+    if field == "skills":
+        got = {_norm(s) for s in extracted}
+        return sum(_norm(s) in got for s in labels) / len(labels)
+    hits = 0
+    for label in labels:
+        keys = _KEYS[field]
+        hits += any(all(_found(_norm(label.get(k)), _norm(item.get(k))) for k in keys) for item in extracted)
+    return hits / len(labels)
+
+
+def _as_dicts(value: Any) -> List[Any]:
+    return [v.model_dump() if hasattr(v, "model_dump") else v for v in value or []]
+
+
+def load_sample(path: Path) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+async def _run_mode(sample: List[Dict[str, Any]], mode: str, semantic: bool) -> Dict[str, Any]:
+    recalls: Dict[str, List[float]] = {f: [] for f in FIELDS}
+    latencies = []
+    for item in sample:
+        started = time.perf_counter()
+        if mode == "lite" and not semantic:
+            extracted = lite_extraction(item["cv_text"])
+        else:
+            request = CVAnalysisRequest(job_description=item.get("job") if semantic else None, analysis_mode=mode)
+            resp = await CVAnalyzer().analyze_cv(item["cv_text"], request)
+            extracted = resp.model_dump()
+        latencies.append(time.perf_counter() - started)
+        for field in FIELDS:
+            r = field_recall(field, item["labels"].get(field, []), _as_dicts(extracted.get(field)))
+            if r is not None:
+                recalls[field].append(r)
+    lat = np.array(latencies) * 1000
+    return {
+        "recall": {f: round(float(np.mean(v)), 3) if v else None for f, v in recalls.items()},
+        "p50_ms": float(np.percentile(lat, 50)),
+        "p95_ms": float(np.percentile(lat, 95)),
+    }
+
+
+async def run(path: Path, llm: bool, semantic: bool) -> dict:
+    sample = load_sample(path)
+    report: dict = {"cvs": len(sample), "semantic": semantic, "lite": await _run_mode(sample, "lite", semantic)}
+    if llm:
+        report["llm"] = await _run_mode(sample, "full", semantic)
+    return report
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sample", type=Path, default=DEFAULT_SAMPLE, help="JSONL: {id, cv_text, job, labels}")
+    ap.add_argument("--llm", action="store_true", help="Also run the LLM path (needs a configured backend)")
+    ap.add_argument("--semantic", action="store_true", help="Time end-to-end analysis incl. semantic match vs the job")
+    args = ap.parse_args()
+    print(json.dumps(asyncio.run(run(args.sample, args.llm, args.semantic)), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
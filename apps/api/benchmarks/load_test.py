@@ -0,0 +1,170 @@
+"""Load generator for POST /api/v1/analyze: throughput, latency percentiles and error rates.
+
+Run the API against the stand-in LLM (benchmarks/standin_llm_server.py) so results reflect the service,
+not model speed or quota:
+
+    python -m benchmarks.standin_llm_server --port 11435 --latency lognormal:1.0,0.4 --fail-malformed 0.05 &
+    OLLAMA_HOST=http://127.0.0.1:11435 uvicorn app.main:app --port 8000 &
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --concurrency 16 --requests 200
+
+CVs are synthetic PDFs (--pages, --lang, --distinct different documents, so per-text caches do not hide
+the work). A request counts as an error on a transport failure, timeout, non-2xx status, or a 200 whose
+body has success=false. The report is JSON on stdout (--out to also write it to a file). --in-process
+calls the app through ASGI without a server (no lifespan: models load on the first request, so keep --warmup).
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.synthetic_data import LANGS, find_unicode_font, synthetic_cv_pages, synthetic_job, write_pdf
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(q / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def build_documents(lang: str, pages: int, distinct: int) -> List[Tuple[str, bytes]]:
+    font = find_unicode_font()
+    out = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for seed in range(distinct):
+            path = Path(tmp) / f"cv-{seed}.pdf"
+            write_pdf(synthetic_cv_pages(lang, pages, seed), path, font)
+            out.append((path.name, path.read_bytes()))
+    return out
+
+
+async def _one(client: httpx.AsyncClient, doc: Tuple[str, bytes], form: Dict[str, str]) -> Tuple[float, str]:
+    """(latency seconds, outcome)."""
+    started = time.perf_counter()
+    try:
+        response = await client.post("/api/v1/analyze", files={"file": (doc[0], doc[1], "application/pdf")}, data=form)
+    except httpx.TimeoutException:
+        return time.perf_counter() - started, "timeout"
+    except httpx.HTTPError as e:
+        return time.perf_counter() - started, f"transport:{type(e).__name__}"
+    elapsed = time.perf_counter() - started
+    if response.status_code >= 300:
+        return elapsed, f"http_{response.status_code}"
+    try:
+        body = response.json()
+    except ValueError:
+        return elapsed, "invalid_body"
+    return elapsed, "ok" if body.get("success") else "success_false"
+
+
+async def run_load(
+    url: str,
+    documents: List[Tuple[str, bytes]],
+    form: Dict[str, str],
+    concurrency: int,
+    requests: Optional[int],
+    duration_s: Optional[float],
+    timeout_s: float,
+    warmup: int = 0,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout_s, limits=limits, transport=transport) as client:
+        for i in range(warmup):
+            await _one(client, documents[i % len(documents)], form)
+
+        results: List[Tuple[float, str]] = []
+        issued = 0
+        started = time.perf_counter()
+        deadline = started + duration_s if duration_s else None
+
+        def next_index() -> Optional[int]:
+            nonlocal issued
+            if requests is not None and issued >= requests:
+                return None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            issued += 1
+            return issued - 1
+
+        async def worker() -> None:
+            while (i := next_index()) is not None:
+                results.append(await _one(client, documents[i % len(documents)], form))
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+    return summarize(results, wall, concurrency)
+
+
+def summarize(results: List[Tuple[float, str]], wall_s: float, concurrency: int) -> Dict[str, Any]:
+    outcomes = Counter(outcome for _, outcome in results)
+    ok = [latency for latency, outcome in results if outcome == "ok"]
+    total = len(results)
+    report: Dict[str, Any] = {
+        "requests": total,
+        "concurrency": concurrency,
+        "wall_s": round(wall_s, 3),
+        "throughput_rps": round(total / wall_s, 3) if wall_s else 0.0,
+        "ok_rps": round(len(ok) / wall_s, 3) if wall_s else 0.0,
+        "error_rate": round(1 - len(ok) / total, 4) if total else 0.0,
+        "outcomes": dict(outcomes.most_common()),
+    }
+    if ok:
+        report["latency_ms"] = {
+            "mean": round(statistics.fmean(ok) * 1000, 1),
+            **{f"p{q}": round(percentile(ok, q) * 1000, 1) for q in (50, 90, 95, 99)},
+            "max": round(max(ok) * 1000, 1),
+        }
+    return report
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Load test POST /api/v1/analyze.")
+    ap.add_argument("--url", default="http://127.0.0.1:8000")
+    ap.add_argument("--in-process", action="store_true", help="call app.main:app through ASGI instead of --url")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=None, help="total requests (default 100 unless --duration)")
+    ap.add_argument("--duration", type=float, default=None, help="run for this many seconds instead")
+    ap.add_argument("--warmup", type=int, default=1, help="sequential requests before measuring")
+    ap.add_argument("--pages", type=int, default=2)
+    ap.add_argument("--lang", choices=LANGS, default="uk")
+    ap.add_argument("--distinct", type=int, default=8, help="number of different CVs to cycle through")
+    ap.add_argument("--mode", choices=("full", "lite"), default="full", help="analysis_mode form field")
+    ap.add_argument("--no-job", action="store_true", help="send no job_description")
+    ap.add_argument("--timeout", type=float, default=300.0, help="client timeout per request, seconds")
+    ap.add_argument("--out", type=Path, default=None)
+    args = ap.parse_args()
+
+    requests = args.requests if args.requests is not None or args.duration else 100
+    form = {"analysis_mode": args.mode}
+    if not args.no_job:
+        form["job_description"] = synthetic_job(args.lang)
+    documents = build_documents(args.lang, args.pages, max(1, args.distinct))
+    url, transport = args.url, None
+    if args.in_process:
+        from app.main import app
+
+        url, transport = "http://test", httpx.ASGITransport(app=app)
+    report = asyncio.run(
+        run_load(url, documents, form, args.concurrency, requests, args.duration, args.timeout, args.warmup, transport)
+    )
+    report["params"] = {"pages": args.pages, "lang": args.lang, "mode": args.mode, "distinct": args.distinct}
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        args.out.write_text(text + "\n", encoding="utf-8")
+    if not report["requests"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
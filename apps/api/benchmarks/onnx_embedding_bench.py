@@ -0,0 +1,121 @@
+"""Accuracy and throughput of the ONNX Runtime embedding backends (fp32, int8) against PyTorch.
+
+On a fixed corpus (the CVs, CV lines and jobs of benchmarks/data/lite_labelled.jsonl) it reports,
+per backend: load time, resident memory added by the model, encode throughput, the deviation of
+job x CV-line cosine similarities and of the final match_score from the PyTorch backend. Each
+backend runs in its own process so memory numbers do not overlap. Export the model first:
+
+    python -m app.services.onnx_embedder --out models/minilm-onnx
+    python -m benchmarks.onnx_embedding_bench --model-dir models/minilm-onnx
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from benchmarks.lite_recall_bench import DEFAULT_SAMPLE, load_sample
+
+BACKENDS = ("pytorch", "onnx-fp32", "onnx-int8")
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def corpus(sample: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    cv_lines = [line.strip() for item in sample for line in item["cv_text"].splitlines() if len(line.strip()) > 3]
+    return {"cvs": [i["cv_text"] for i in sample], "jobs": [i["job"] for i in sample], "cv_lines": cv_lines}
+
+
+def measure(backend: str, model_dir: str, texts: Dict[str, List[str]], repeats: int) -> Dict[str, Any]:
+    """Runs in a fresh process: load one backend, encode the corpus, score every CV against every job."""
+    from app.config import settings
+    from app.services import semantic_matcher
+
+    settings.onnx_model_dir = model_dir
+    settings.onnx_quantized = backend == "onnx-int8"
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+    if backend == "pytorch":
+        emb = semantic_matcher._get_sentence_transformers_embedder()
+    else:
+        emb = semantic_matcher._get_onnx_embedder()
+    load_s = time.perf_counter() - started
+    semantic_matcher._embedder = emb
+
+    lines = texts["cv_lines"] + texts["jobs"]
+    emb.embed_documents(lines[:8])  # warm-up
+    started = time.perf_counter()
+    for _ in range(repeats):
+        vectors = np.asarray(emb.embed_documents(lines), dtype=np.float32)
+    encode_s = (time.perf_counter() - started) / repeats
+    n_lines = len(texts["cv_lines"])
+    sims = vectors[n_lines:] @ vectors[:n_lines].T
+
+    cvs = [semantic_matcher.SemanticBlocks(skills=[], experience_text=cv[:8000], full_text=cv) for cv in texts["cvs"]]
+    scores = semantic_matcher.semantic_match_matrix(cvs, texts["jobs"])
+    return {
+        "load_s": round(load_s, 3),
+        "rss_mb": round(_rss_mb() - rss_before, 1),
+        "texts_per_s": round(len(lines) / encode_s, 1),
+        "sims": sims.tolist(),
+        "match_scores": [[r.score for r in row] for row in scores],
+    }
+
+
+def compare(reference: Dict[str, Any], other: Dict[str, Any]) -> Dict[str, float]:
+    sims_diff = np.abs(np.array(other["sims"]) - np.array(reference["sims"]))
+    score_diff = np.abs(np.array(other["match_scores"]) - np.array(reference["match_scores"]))
+    ref_rank = np.argsort(-np.array(reference["match_scores"]), axis=0)[0]
+    rank = np.argsort(-np.array(other["match_scores"]), axis=0)[0]
+    return {
+        "cosine_max_abs_diff": float(sims_diff.max()),
+        "cosine_mean_abs_diff": float(sims_diff.mean()),
+        "match_score_max_abs_diff": float(score_diff.max()),
+        "match_score_mean_abs_diff": float(score_diff.mean()),
+        "top1_cv_agreement": float(np.mean(ref_rank == rank)),
+    }
+
+
+def run(sample_path: Path, model_dir: str, backends: List[str], repeats: int) -> dict:
+    texts = corpus(load_sample(sample_path))
+    results: Dict[str, Dict[str, Any]] = {}
+    ctx = multiprocessing.get_context("spawn")
+    for backend in backends:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            results[backend] = pool.submit(measure, backend, model_dir, texts, repeats).result()
+    report: dict = {"texts": len(texts["cv_lines"]) + len(texts["jobs"]), "cvs": len(texts["cvs"])}
+    for backend, r in results.items():
+        entry = {k: r[k] for k in ("load_s", "rss_mb", "texts_per_s")}
+        if backend != "pytorch" and "pytorch" in results:
+            entry.update(compare(results["pytorch"], r))
+            entry["speedup"] = round(r["texts_per_s"] / results["pytorch"]["texts_per_s"], 2)
+        if backend != "pytorch":
+            path = Path(model_dir) / ("model.int8.onnx" if backend == "onnx-int8" else "model.onnx")
+            entry["model_file_mb"] = round(path.stat().st_size / 1e6, 1)
+        report[backend] = entry
+    return report
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sample", type=Path, default=DEFAULT_SAMPLE)
+    ap.add_argument("--model-dir", default="models/minilm-onnx")
+    ap.add_argument("--backends", default=",".join(BACKENDS), help=f"Comma-separated subset of {BACKENDS}")
+    ap.add_argument("--repeats", type=int, default=5)
+    args = ap.parse_args()
+    backends = [b for b in args.backends.split(",") if b in BACKENDS]
+    print(json.dumps(run(args.sample, args.model_dir, backends, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
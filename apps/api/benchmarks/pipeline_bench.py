@@ -0,0 +1,344 @@
+"""Stage benchmarks of the analysis pipeline on synthetic Ukrainian / English CVs, with JSON baselines.
+
+Stages: normalize (normalize_text_for_pipeline), parser (CVParser on PDF and DOCX of 1-50 pages),
+semantic (compute_semantic_match), explain (explain_match_score by feature count), pdf
+(render_analysis_pdf) and route (POST /api/v1/analyze with a stub LLM). Embeddings use a hashed
+bag-of-words stand-in unless --embedder configured, so the numbers track pipeline cost, not the model.
+
+    python -m benchmarks.pipeline_bench --quick
+    python -m benchmarks.pipeline_bench --save-baseline          # write benchmarks/baselines/pipeline.json
+    python -m benchmarks.pipeline_bench --compare --tolerance 0.3    # exit 1 on regressions
+
+Baselines are machine-specific: record them on the machine (or CI runner class) that compares.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+import numpy as np
+
+from app.config import settings
+from app.models import CVAnalysisResponse
+from app.services.cv_analyzer import CVAnalysisOutput
+from benchmarks.synthetic_data import (
+    LANGS,
+    find_unicode_font,
+    synthetic_cv,
+    synthetic_cv_pages,
+    synthetic_job,
+    synthetic_skills,
+    write_docx,
+    write_pdf,
+)
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "pipeline.json"
+STAGES = ("normalize", "parser", "semantic", "explain", "pdf", "route")
+# Differences below this many ms are noise for sub-millisecond cases, whatever the ratio.
+MIN_REGRESSION_MS = 2.0
+
+Case = Tuple[str, Callable[[], Any]]
+
+
+def _hashed_embedding(text: str, dim: int = 384) -> List[float]:
+    vec = np.zeros(dim, dtype=np.float32)
+    for token in text.lower().split():
+        vec[zlib.crc32(token.encode("utf-8")) % dim] += 1.0
+    norm = float(np.linalg.norm(vec))
+    return (vec / norm if norm else vec).tolist()
+
+
+def _use_embedder(kind: str) -> None:
+    from app.services import semantic_matcher
+
+    if kind == "hashed":
+        semantic_matcher._embedder = semantic_matcher._Embedder(_hashed_embedding, 384)
+    else:
+        semantic_matcher.get_embedder()
+
+
+def _cold_caches() -> None:
+    from app.services import semantic_matcher
+
+    with semantic_matcher._window_cache_lock:
+        semantic_matcher._window_cache.clear()
+
+
+def measure(fn: Callable[[], Any], repeat: int, setup: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    times: List[float] = []
+    # One warm-up run (imports, first-use allocations) before the timed ones.
+    for i in range(repeat + 1):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        if i:
+            times.append((time.perf_counter() - started) * 1000)
+    return _summary(times)
+
+
+async def measure_async(fn: Callable[[], Awaitable[Any]], repeat: int) -> Dict[str, float]:
+    await fn()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return _summary(times)
+
+
+def _summary(times_ms: List[float]) -> Dict[str, float]:
+    return {
+        "median_ms": round(statistics.median(times_ms), 3),
+        "p95_ms": round(float(np.percentile(times_ms, 95)), 3),
+        "runs": len(times_ms),
+    }
+
+
+def _normalize_cases(pages: Tuple[int, ...]) -> List[Case]:
+    from app.utils.text_preprocess import normalize_text_for_pipeline
+
+    return [
+        (f"normalize/{lang}/{n}p", lambda text=synthetic_cv(lang, n): normalize_text_for_pipeline(text))
+        for lang in LANGS
+        for n in pages
+    ]
+
+
+def _parser_cases(pages: Tuple[int, ...], workdir: Path) -> List[Case]:
+    from app.services.cv_parser import CVParser
+
+    font = find_unicode_font()
+    if font is None:
+        print("parser: no Unicode TTF found (set PDF_FONT_PATH); Ukrainian PDFs are written as Latin-1", file=sys.stderr)
+    cases: List[Case] = []
+    for lang in LANGS:
+        for n in pages:
+            text_pages = synthetic_cv_pages(lang, n)
+            pdf, docx = workdir / f"cv-{lang}-{n}.pdf", workdir / f"cv-{lang}-{n}.docx"
+            write_pdf(text_pages, pdf, font)
+            write_docx(text_pages, docx)
+            cases.append((f"parser/pdf/{lang}/{n}p", lambda p=str(pdf): CVParser._parse_pdf_sync(p)))
+            cases.append((f"parser/docx/{lang}/{n}p", lambda p=str(docx): CVParser._parse_docx_sync(p)))
+    return cases
+
+
+def _semantic_cases(pages: Tuple[int, ...]) -> List[Case]:
+    from app.services.semantic_matcher import compute_semantic_match
+
+    cases: List[Case] = []
+    for lang in LANGS:
+        job = synthetic_job(lang, 8)
+        for n in pages:
+            cv = synthetic_cv(lang, n)
+            cases.append(
+                (
+                    f"semantic/{lang}/{n}p",
+                    lambda cv=cv, job=job: compute_semantic_match(
+                        synthetic_skills(10), cv[: len(cv) // 2], cv, job, job
+                    ),
+                )
+            )
+    return cases
+
+
+def _explain_cases(feature_counts: Tuple[int, ...]) -> List[Case]:
+    from app.models import ExperienceItem
+    from app.services.match_explainer import explain_match_score
+    from app.services.semantic_matcher import compute_semantic_match
+
+    cv, job = synthetic_cv("uk", 2), synthetic_job("uk", 8)
+    experience = [ExperienceItem(title="Python розробник", employer=f"Company {i}", duration="2020 – 2023") for i in range(3)]
+    cases: List[Case] = []
+    for count in feature_counts:
+        skills = synthetic_skills(count)
+        sem = compute_semantic_match(skills, cv[:2000], cv, job, job)
+
+        def run(skills=skills, sem=sem, count=count):
+            with patch.object(settings, "explainer_max_skills", count), patch.object(settings, "use_match_explainers", True):
+                return explain_match_score(
+                    sem=sem,
+                    skills=skills,
+                    experience=experience,
+                    cv_experience_text=cv[:2000],
+                    cv_full_text=cv,
+                    job_requirements_text=job,
+                    job_full_text=job,
+                )
+
+        cases.append((f"explain/{count + len(experience)}features", run))
+    return cases
+
+
+def _sample_response(lang: str, pages: int) -> CVAnalysisResponse:
+    from app.models import CVAnalysisRequest
+    from app.services.cv_analyzer import CVAnalyzer
+
+    request = CVAnalysisRequest(job_description=synthetic_job(lang, 8), analysis_mode="lite")
+    return asyncio.run(CVAnalyzer().analyze_cv(synthetic_cv(lang, pages), request))
+
+
+def _pdf_cases(pages: Tuple[int, ...]) -> List[Case]:
+    from app.services.analysis_pdf import render_analysis_pdf
+
+    font = find_unicode_font()
+    if font is None:
+        print("pdf: skipped, no Unicode TTF found (set PDF_FONT_PATH)", file=sys.stderr)
+        return []
+    settings.pdf_font_path = settings.pdf_font_path or str(font)
+    return [
+        (f"pdf/{lang}/{n}p", lambda resp=_sample_response(lang, n): render_analysis_pdf(resp))
+        for lang in LANGS
+        for n in pages
+    ]
+
+
+async def _route_results(pages: Tuple[int, ...], workdir: Path, repeat: int) -> Dict[str, Dict[str, float]]:
+    """POST /api/v1/analyze in process; the LLM extraction is stubbed with the rule-based segmenter."""
+    from httpx import ASGITransport, AsyncClient
+
+    from app.main import app
+    from app.services.cv_analyzer import CVAnalyzer
+    from app.services.cv_segmenter import lite_extraction
+
+    async def stub_extract(self, cv_text, *args, **kwargs):
+        return CVAnalysisOutput(**lite_extraction(cv_text))
+
+    results: Dict[str, Dict[str, float]] = {}
+    font = find_unicode_font()
+    with patch.object(CVAnalyzer, "_extract", stub_extract), patch.object(settings, "use_llm_semantic_narrative", False):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for lang in LANGS:
+                job = synthetic_job(lang, 8)
+                for n in pages:
+                    pdf = workdir / f"route-{lang}-{n}.pdf"
+                    write_pdf(synthetic_cv_pages(lang, n), pdf, font)
+                    content = pdf.read_bytes()
+
+                    async def post(content=content, job=job):
+                        _cold_caches()
+                        resp = await client.post(
+                            "/api/v1/analyze",
+                            files={"file": ("cv.pdf", content, "application/pdf")},
+                            data={"job_description": job},
+                        )
+                        if resp.status_code != 200 or not resp.json().get("success"):
+                            raise RuntimeError(f"/analyze failed: {resp.status_code} {resp.text[:300]}")
+
+                    name = f"route/{lang}/{n}p"
+                    results[name] = await measure_async(post, repeat)
+                    print(f"{name:32s} {results[name]['median_ms']:10.2f} ms", file=sys.stderr)
+    return results
+
+
+def run(stages: Tuple[str, ...], pages: Tuple[int, ...], feature_counts: Tuple[int, ...], repeat: int) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        builders: Dict[str, Callable[[], List[Case]]] = {
+            "normalize": lambda: _normalize_cases(pages),
+            "parser": lambda: _parser_cases(pages, workdir),
+            "semantic": lambda: _semantic_cases(pages),
+            "explain": lambda: _explain_cases(feature_counts),
+            "pdf": lambda: _pdf_cases(pages),
+        }
+        for stage in stages:
+            if stage == "route":
+                results.update(asyncio.run(_route_results(pages, workdir, repeat)))
+                continue
+            setup = _cold_caches if stage in ("semantic", "explain") else None
+            for name, fn in builders[stage]():
+                results[name] = measure(fn, repeat, setup)
+                print(f"{name:32s} {results[name]['median_ms']:10.2f} ms", file=sys.stderr)
+    return {"results": results}
+
+
+def compare(current: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Cases whose median is slower than the baseline by more than `tolerance` (fraction) and MIN_REGRESSION_MS."""
+    regressions = []
+    for name, cur in sorted(current.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        delta = cur["median_ms"] - base["median_ms"]
+        if delta > MIN_REGRESSION_MS and cur["median_ms"] > base["median_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: {base['median_ms']:.2f} ms -> {cur['median_ms']:.2f} ms (+{delta / base['median_ms']:.0%})")
+    return regressions
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--stages", default=",".join(STAGES), help=f"comma-separated subset of {','.join(STAGES)}")
+    ap.add_argument("--pages", default="1,10,50")
+    ap.add_argument("--features", default="2,5,10,20", help="skill features for explain (3 experience features are added)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--quick", action="store_true", help="pages 1,5; features 2,10; 3 repeats")
+    ap.add_argument("--embedder", choices=("hashed", "configured"), default="hashed")
+    ap.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--compare", action="store_true", help="exit 1 if a case regressed beyond --tolerance")
+    ap.add_argument("--tolerance", type=float, default=0.3)
+    ap.add_argument("--out", type=Path, help="also write the results JSON here")
+    args = ap.parse_args()
+
+    if args.quick:
+        args.pages, args.features, args.repeat = "1,5", "2,10", 3
+    stages = tuple(s for s in args.stages.split(",") if s)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        ap.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    # app.main configures DEBUG logging in development; SHAP alone would flood the output.
+    logging.getLogger().setLevel(logging.WARNING)
+    settings.embedding_batch_wait_ms = 0  # single caller: micro-batching would only add its wait
+    _use_embedder(args.embedder)
+
+    report = run(
+        stages,
+        tuple(int(p) for p in args.pages.split(",")),
+        tuple(int(f) for f in args.features.split(",")),
+        args.repeat,
+    )
+    report["meta"] = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(terse=True),
+        "embedder": args.embedder,
+        "repeat": args.repeat,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False, sort_keys=True)
+    print(text)
+    if args.out:
+        args.out.write_text(text + "\n", encoding="utf-8")
+    if args.save_baseline:
+        baseline: Dict[str, Any] = {"meta": report["meta"], "results": {}}
+        if args.baseline.is_file():
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        baseline["meta"] = report["meta"]
+        baseline["results"].update(report["results"])
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baseline, indent=2, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+    if args.compare:
+        if not args.baseline.is_file():
+            sys.exit(f"no baseline at {args.baseline}; run with --save-baseline first")
+        baseline_results = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare(report["results"], baseline_results, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.tolerance:.0%} against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
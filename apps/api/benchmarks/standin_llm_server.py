@@ -0,0 +1,381 @@
+"""Local stand-in for the Ollama chat API and the Gemini REST API, for load tests without a GPU or quota.
+
+    python -m benchmarks.standin_llm_server --port 11435 --latency lognormal:1.5,0.4 \
+        --fail-empty 0.02 --fail-malformed 0.02 --fail-timeout 0.01
+
+Point the API at it with OLLAMA_HOST=http://127.0.0.1:11435 (development), or with a route:
+LLM_ROUTES='[{"name": "standin", "backend": "ollama", "model": "llama3:8b", "base_url": "http://127.0.0.1:11435"}]'.
+Gemini routes use POST /v1beta/models/{model}:generateContent and :streamGenerateContent (alt=sse).
+
+Structured requests (Ollama `format`, Gemini responseSchema / function declarations, or a prompt
+asking for JSON) get schema-valid JSON: a CVAnalysisOutput built by the rule-based CV segmenter from
+the prompt, or a minimal instance of any other schema. Other requests (narratives) get plain text.
+Each request draws its latency from --latency and may be turned into an injected failure.
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.cv_analyzer import CVAnalysisOutput
+from app.services.cv_segmenter import lite_extraction
+
+logger = logging.getLogger(__name__)
+
+FAILURES = ("empty", "malformed", "timeout", "error")
+_NARRATIVE = (
+    "Семантична відповідність помірна: ключові навички збігаються з вимогами, "
+    "але досвід у суміжних технологіях описано коротко."
+)
+
+
+def parse_latency(spec: str) -> Tuple[str, Tuple[float, ...]]:
+    """`fixed:S`, `uniform:LO,HI`, `normal:MEAN,SD` or `lognormal:MEDIAN,SIGMA` (seconds)."""
+    kind, _, params = spec.partition(":")
+    values = tuple(float(v) for v in params.split(",") if v.strip())
+    expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+    if expected.get(kind) != len(values):
+        raise ValueError(f"bad latency spec {spec!r}; use fixed:S, uniform:LO,HI, normal:MEAN,SD or lognormal:MEDIAN,SIGMA")
+    return kind, values
+
+
+def sample_latency(rng: random.Random, kind: str, params: Tuple[float, ...]) -> float:
+    if kind == "fixed":
+        value = params[0]
+    elif kind == "uniform":
+        value = rng.uniform(*params)
+    elif kind == "normal":
+        value = rng.gauss(*params)
+    else:
+        value = params[0] * rng.lognormvariate(0.0, params[1])
+    return max(0.0, value)
+
+
+@dataclass
+class StandinConfig:
+    latency: str = "fixed:0"
+    # Share of the latency spent before the first streamed chunk (time to first token).
+    first_token_share: float = 0.3
+    stream_chunks: int = 8
+    fail_empty: float = 0.0
+    fail_malformed: float = 0.0
+    fail_timeout: float = 0.0
+    fail_error: float = 0.0
+    # How long a "timeout" request hangs before the connection is dropped.
+    timeout_hang_s: float = 600.0
+    seed: int = 0
+    # Fixed JSON reply for every request instead of a generated one (tests).
+    reply: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class StandinStats:
+    requests: int = 0
+    by_outcome: Dict[str, int] = field(default_factory=dict)
+
+    def count(self, outcome: str) -> None:
+        self.requests += 1
+        self.by_outcome[outcome] = self.by_outcome.get(outcome, 0) + 1
+
+
+def _fill_schema(schema: Dict[str, Any], defs: Optional[Dict[str, Any]] = None) -> Any:
+    """Smallest instance of a JSON schema with all required fields set (Pydantic-style schemas)."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return _fill_schema(defs.get(schema["$ref"].rsplit("/", 1)[-1], {}), defs)
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"] or schema[key]
+            return _fill_schema(options[0], defs)
+    kind = schema.get("type")
+    if kind == "object" or "properties" in schema:
+        props = schema.get("properties", {})
+        return {name: _fill_schema(props[name], defs) for name in schema.get("required", []) if name in props}
+    if kind == "array":
+        return [_fill_schema(schema.get("items", {}), defs)] * max(1, schema.get("minItems", 0))
+    if kind in ("number", "integer"):
+        low = schema.get("minimum", 0)
+        high = schema.get("maximum", 1)
+        value = (low + high) / 2
+        return int(value) if kind == "integer" else value
+    if kind == "boolean":
+        return False
+    return "x" * max(10, schema.get("minLength", 0))
+
+
+def _is_cv_schema(schema: Optional[Dict[str, Any]]) -> bool:
+    return schema is None or "recommendations" in schema.get("properties", {})
+
+
+def cv_analysis_reply(prompt: str) -> Dict[str, Any]:
+    out = lite_extraction(prompt)
+    out["match_score"] = round(random.Random(len(prompt)).uniform(0.3, 0.9), 2)
+    out["match_score_reasoning"] = "Оцінка stand-in сервера на основі збігу навичок."
+    out["matched_competencies"] = (out.get("skills") or [])[:3]
+    out["missing_competencies"] = []
+    # Round-trip through the app's schema so the reply is exactly what the real model must produce.
+    return json.loads(CVAnalysisOutput(**out).model_dump_json())
+
+
+def reply_text(prompt: str, schema: Optional[Dict[str, Any]], structured: bool) -> str:
+    if not structured:
+        return _NARRATIVE
+    if _is_cv_schema(schema):
+        return json.dumps(cv_analysis_reply(prompt), ensure_ascii=False)
+    return json.dumps(_fill_schema(schema or {}), ensure_ascii=False)
+
+
+def _chunks(text: str, n: int) -> List[str]:
+    step = max(1, -(-len(text) // max(1, n)))
+    return [text[i : i + step] for i in range(0, len(text), step)] or [""]
+
+
+class StandinLLMServer:
+    def __init__(self, config: StandinConfig, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config
+        self.latency = parse_latency(config.latency)
+        self.stats = StandinStats()
+        self.requests: List[Dict[str, Any]] = []
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw(self) -> Tuple[float, str]:
+        """(latency seconds, outcome) for the next request."""
+        c = self.config
+        with self._lock:
+            latency = sample_latency(self._rng, *self.latency)
+            roll = self._rng.random()
+        outcome = "ok"
+        for name, p in (("empty", c.fail_empty), ("malformed", c.fail_malformed), ("timeout", c.fail_timeout), ("error", c.fail_error)):
+            if roll < p:
+                outcome = name
+                break
+            roll -= p
+        with self._lock:
+            self.stats.count(outcome)
+        return latency, outcome
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def __enter__(self) -> "StandinLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _ollama_chunk(model: str, content: str, done: bool) -> Dict[str, Any]:
+    out: Dict[str, Any] = {
+        "model": model,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "message": {"role": "assistant", "content": content},
+        "done": done,
+    }
+    if done:
+        out.update(done_reason="stop", total_duration=1, prompt_eval_count=1, eval_count=max(1, len(content) // 4))
+    return out
+
+
+def _gemini_chunk(content: str, done: bool, function: Optional[str] = None) -> Dict[str, Any]:
+    part: Dict[str, Any] = {"text": content}
+    if function is not None:
+        part = {"functionCall": {"name": function, "args": json.loads(content)}}
+    candidate: Dict[str, Any] = {"content": {"role": "model", "parts": [part]}, "index": 0}
+    if done:
+        candidate["finishReason"] = "STOP"
+    return {
+        "candidates": [candidate],
+        "usageMetadata": {"promptTokenCount": 1, "candidatesTokenCount": 1, "totalTokenCount": 2},
+    }
+
+
+def _make_handler(standin: StandinLLMServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def _send_json(self, status: int, body: Any) -> None:
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self) -> None:
+            if self.path.startswith("/api/tags"):
+                self._send_json(200, {"models": [{"name": "standin:latest", "model": "standin:latest"}]})
+            elif self.path.startswith("/api/version"):
+                self._send_json(200, {"version": "0.0.0-standin"})
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            standin.requests.append(body)
+            try:
+                if self.path.startswith("/api/chat"):
+                    self._ollama(body)
+                elif re.match(r"^/v1(beta)?/models/[^:]+:(stream)?[gG]enerateContent", self.path):
+                    self._gemini(body)
+                else:
+                    self._send_json(404, {"error": "not found"})
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def _fail_early(self, outcome: str, latency: float) -> bool:
+            if outcome == "timeout":
+                time.sleep(standin.config.timeout_hang_s)
+                self.close_connection = True
+                return True
+            if outcome == "error":
+                time.sleep(latency)
+                self._send_json(500, {"error": "injected failure"})
+                return True
+            return False
+
+        def _content(self, outcome: str, prompt: str, schema: Optional[Dict[str, Any]], structured: bool) -> str:
+            if outcome == "empty":
+                return ""
+            if standin.config.reply is not None:
+                text = json.dumps(standin.config.reply, ensure_ascii=False)
+            else:
+                text = reply_text(prompt, schema, structured)
+            if outcome == "malformed":
+                return text[: max(1, len(text) // 2)] + ' "oops'
+            return text
+
+        def _stream(self, content_type: str, lines: List[bytes], latency: float) -> None:
+            ttft = latency * standin.config.first_token_share
+            gap = (latency - ttft) / max(1, len(lines) - 1)
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            time.sleep(ttft)
+            for i, line in enumerate(lines):
+                if i:
+                    time.sleep(gap)
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _ollama(self, body: Dict[str, Any]) -> None:
+            latency, outcome = standin.draw()
+            if self._fail_early(outcome, latency):
+                return
+            messages = body.get("messages") or []
+            prompt = "\n".join(str(m.get("content", "")) for m in messages)
+            fmt = body.get("format")
+            schema = fmt if isinstance(fmt, dict) else None
+            structured = bool(fmt) or "JSON" in prompt
+            content = self._content(outcome, prompt, schema, structured)
+            model = body.get("model", "standin")
+            if body.get("stream", True):
+                pieces = _chunks(content, standin.config.stream_chunks)
+                lines = [json.dumps(_ollama_chunk(model, p, False), ensure_ascii=False).encode() + b"\n" for p in pieces]
+                lines.append(json.dumps(_ollama_chunk(model, "", True)).encode() + b"\n")
+                self._stream("application/x-ndjson", lines, latency)
+            else:
+                time.sleep(latency)
+                self._send_json(200, _ollama_chunk(model, content, True))
+
+        def _gemini(self, body: Dict[str, Any]) -> None:
+            latency, outcome = standin.draw()
+            if self._fail_early(outcome, latency):
+                return
+            parts = [p for c in body.get("contents") or [] for p in c.get("parts") or []]
+            system = body.get("systemInstruction") or body.get("system_instruction") or {}
+            parts += system.get("parts") or []
+            prompt = "\n".join(str(p.get("text", "")) for p in parts)
+            generation = body.get("generationConfig") or body.get("generation_config") or {}
+            schema = generation.get("responseSchema") or generation.get("responseJsonSchema")
+            declarations = [d for t in body.get("tools") or [] for d in t.get("functionDeclarations") or t.get("function_declarations") or []]
+            function = None
+            if declarations:
+                function = declarations[0].get("name")
+                schema = declarations[0].get("parameters") or schema
+            structured = bool(schema) or function is not None or "JSON" in prompt
+            content = self._content(outcome, prompt, schema, structured)
+            if function is not None and outcome == "ok":
+                chunk = _gemini_chunk(content, True, function)
+                if ":stream" in self.path:
+                    self._stream("text/event-stream", [b"data: " + json.dumps(chunk).encode() + b"\r\n\r\n"], latency)
+                else:
+                    time.sleep(latency)
+                    self._send_json(200, chunk)
+                return
+            if ":stream" in self.path:
+                pieces = _chunks(content, standin.config.stream_chunks)
+                lines = [
+                    b"data: " + json.dumps(_gemini_chunk(p, i == len(pieces) - 1), ensure_ascii=False).encode() + b"\r\n\r\n"
+                    for i, p in enumerate(pieces)
+                ]
+                self._stream("text/event-stream", lines, latency)
+            else:
+                time.sleep(latency)
+                self._send_json(200, _gemini_chunk(content, True))
+
+    return Handler
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Stand-in Ollama / Gemini server for load tests.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=11435)
+    ap.add_argument("--latency", default="lognormal:1.0,0.4", help="fixed:S | uniform:LO,HI | normal:MEAN,SD | lognormal:MEDIAN,SIGMA")
+    ap.add_argument("--first-token-share", type=float, default=0.3)
+    ap.add_argument("--stream-chunks", type=int, default=8)
+    ap.add_argument("--fail-empty", type=float, default=0.0, help="probability of an empty reply")
+    ap.add_argument("--fail-malformed", type=float, default=0.0, help="probability of truncated / invalid JSON")
+    ap.add_argument("--fail-timeout", type=float, default=0.0, help="probability of hanging without a reply")
+    ap.add_argument("--fail-error", type=float, default=0.0, help="probability of HTTP 500")
+    ap.add_argument("--timeout-hang-s", type=float, default=600.0)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("app").setLevel(logging.WARNING)
+    config = StandinConfig(
+        latency=args.latency,
+        first_token_share=args.first_token_share,
+        stream_chunks=args.stream_chunks,
+        fail_empty=args.fail_empty,
+        fail_malformed=args.fail_malformed,
+        fail_timeout=args.fail_timeout,
+        fail_error=args.fail_error,
+        timeout_hang_s=args.timeout_hang_s,
+        seed=args.seed,
+    )
+    server = StandinLLMServer(config, args.host, args.port)
+    logger.info("Stand-in LLM listening on %s (latency %s)", server.base_url, args.latency)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info("Served %d requests: %s", server.stats.requests, server.stats.by_outcome)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Deterministic synthetic CVs and job descriptions (Ukrainian and English) for benchmarks.
+
+The same (lang, pages, seed) always gives the same text, so timings are comparable across runs and
+machines. A "page" is about PAGE_CHARS characters of CV text; documents are written to PDF / DOCX
+with one page break per page.
+"""
+
+import random
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PAGE_CHARS = 2800
+LANGS = ("uk", "en")
+
+_SKILLS = [
+    "Python", "FastAPI", "Django", "PostgreSQL", "Redis", "Docker", "Kubernetes", "AWS", "Terraform",
+    "React", "TypeScript", "Node.js", "GraphQL", "Kafka", "RabbitMQ", "Airflow", "Spark", "Pandas",
+    "PyTorch", "scikit-learn", "Git", "CI/CD", "Linux", "Go", "Java", "Spring", "MongoDB", "Elasticsearch",
+]
+_COMPANIES = ["SoftServe", "EPAM Systems", "GlobalLogic", "Luxoft", "Grammarly", "MacPaw", "Ajax Systems", "Intellias"]
+_TEXT: Dict[str, Dict[str, List[str]]] = {
+    "uk": {
+        "names": ["Іван Петренко", "Олена Коваленко", "Андрій Шевчук", "Марія Бондаренко", "Олег Мельник"],
+        "titles": ["Python розробник", "Backend інженер", "Data інженер", "Frontend розробник", "DevOps інженер"],
+        "universities": ["Київський політехнічний інститут", "Львівська політехніка", "КНУ імені Тараса Шевченка"],
+        "degrees": ["бакалавр", "магістр"],
+        "months": ["Січень", "Березень", "Травень", "Вересень", "Листопад"],
+        "present": "дотепер",
+        "headings": ["Досвід роботи", "Освіта", "Навички", "Сертифікати", "Проєкти"],
+        "bullets": [
+            "Розробив сервіс на {skill} для {n} тис. користувачів",
+            "Скоротив час відповіді API на {p}% завдяки кешуванню в {skill}",
+            "Налаштував CI/CD із {skill}, що зменшило час релізу на {p}%",
+            "Впровадив моніторинг і алерти, знизивши кількість інцидентів на {p}%",
+            "Менторив {k} розробників і проводив code review",
+            "Мігрував моноліт на мікросервіси з {skill} та {skill2}",
+        ],
+        "summary": "Інженер із {y} роками досвіду в розробці високонавантажених систем.",
+        "job_intro": "Шукаємо {title} у продуктову команду.",
+        "job_req": "Досвід роботи з {skill} від {y} років",
+        "job_nice": "Буде перевагою: {skill}",
+    },
+    "en": {
+        "names": ["John Carter", "Emily Stone", "Michael Brown", "Sarah Miller", "David Clark"],
+        "titles": ["Python Developer", "Backend Engineer", "Data Engineer", "Frontend Developer", "DevOps Engineer"],
+        "universities": ["Kyiv Polytechnic Institute", "Lviv Polytechnic National University", "University of Toronto"],
+        "degrees": ["Bachelor of Science", "Master of Science"],
+        "months": ["Jan", "Mar", "May", "Sep", "Nov"],
+        "present": "Present",
+        "headings": ["Experience", "Education", "Skills", "Certifications", "Projects"],
+        "bullets": [
+            "Built a {skill} service used by {n}k customers",
+            "Cut API latency by {p}% with caching in {skill}",
+            "Set up CI/CD with {skill}, reducing release time by {p}%",
+            "Introduced monitoring and alerting, reducing incidents by {p}%",
+            "Mentored {k} engineers and ran code reviews",
+            "Migrated a monolith to {skill} and {skill2} microservices",
+        ],
+        "summary": "Engineer with {y} years of experience building high-load systems.",
+        "job_intro": "We are looking for a {title} to join our product team.",
+        "job_req": "{y}+ years of experience with {skill}",
+        "job_nice": "Nice to have: {skill}",
+    },
+}
+
+
+def _bullet(rng: random.Random, t: Dict[str, List[str]]) -> str:
+    return "- " + rng.choice(t["bullets"]).format(
+        skill=rng.choice(_SKILLS), skill2=rng.choice(_SKILLS), n=rng.randint(5, 900), p=rng.randint(10, 70), k=rng.randint(2, 8)
+    )
+
+
+def synthetic_cv_pages(lang: str = "uk", pages: int = 1, seed: int = 0) -> List[str]:
+    """CV text split into pages of roughly PAGE_CHARS characters (section headings on the first page)."""
+    rng = random.Random(f"cv-{lang}-{pages}-{seed}")
+    t = _TEXT[lang]
+    experience_h, education_h, skills_h, certs_h, projects_h = t["headings"]
+    head = [
+        rng.choice(t["names"]),
+        rng.choice(t["titles"]),
+        f"email{seed}@example.com | +380 67 {rng.randint(100, 999)} {rng.randint(10, 99)} {rng.randint(10, 99)}",
+        t["summary"].format(y=rng.randint(2, 12)),
+        "",
+        f"{skills_h}: " + ", ".join(rng.sample(_SKILLS, 10)),
+        "",
+        experience_h,
+    ]
+    out: List[str] = []
+    page: List[str] = head
+    year = 2024
+    while len(out) < pages:
+        if sum(len(line) + 1 for line in page) >= PAGE_CHARS:
+            out.append("\n".join(page))
+            page = []
+            continue
+        start = year - rng.randint(1, 3)
+        page += [
+            "",
+            f"{rng.choice(t['titles'])} — {rng.choice(_COMPANIES)}",
+            f"{rng.choice(t['months'])} {start} – " + (t["present"] if year == 2024 else f"{rng.choice(t['months'])} {year}"),
+        ]
+        page += [_bullet(rng, t) for _ in range(rng.randint(3, 6))]
+        year = start
+    tail = [
+        "",
+        education_h,
+        f"{rng.choice(t['universities'])}, {rng.choice(t['degrees'])}, {year - 6} – {year - 1}",
+        "",
+        certs_h,
+        f"AWS Certified Developer - Amazon - {rng.randint(2018, 2024)}",
+        "",
+        projects_h,
+        f"cv-tools: {rng.choice(_SKILLS)} utilities (github.com/example/cv-tools-{seed})",
+    ]
+    out[-1] = out[-1] + "\n" + "\n".join(tail)
+    return out
+
+
+def synthetic_cv(lang: str = "uk", pages: int = 1, seed: int = 0) -> str:
+    return "\n\n".join(synthetic_cv_pages(lang, pages, seed))
+
+
+def synthetic_job(lang: str = "uk", requirements: int = 8, seed: int = 0) -> str:
+    rng = random.Random(f"job-{lang}-{requirements}-{seed}")
+    t = _TEXT[lang]
+    skills = rng.sample(_SKILLS, min(len(_SKILLS), requirements + 3))
+    lines = [t["job_intro"].format(title=rng.choice(t["titles"])), ""]
+    lines += ["- " + t["job_req"].format(skill=s, y=rng.randint(1, 5)) for s in skills[:requirements]]
+    lines += ["- " + t["job_nice"].format(skill=s) for s in skills[requirements:]]
+    return "\n".join(lines)
+
+
+def synthetic_skills(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(f"skills-{count}-{seed}")
+    return rng.sample(_SKILLS, min(count, len(_SKILLS)))
+
+
+def find_unicode_font() -> Optional[Path]:
+    """A TTF with Cyrillic glyphs available offline: PDF_FONT_PATH, the report font cache, or matplotlib's DejaVu."""
+    from app.config import settings
+
+    candidates = [Path(settings.pdf_font_path).expanduser()] if settings.pdf_font_path else []
+    candidates.append(Path.home() / ".cache" / "cv-analyzer" / "DejaVuSans.ttf")
+    try:
+        import matplotlib
+
+        candidates.append(Path(matplotlib.get_data_path()) / "fonts" / "ttf" / "DejaVuSans.ttf")
+    except ImportError:
+        pass
+    return next((p for p in candidates if p.is_file()), None)
+
+
+def write_pdf(pages: List[str], path: Path, font: Optional[Path]) -> None:
+    """One PDF page per text page. Without a Unicode font only Latin-1 text can be written."""
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(True, margin=10)
+    if font is not None:
+        pdf.add_font("Body", "", str(font))
+        pdf.set_font("Body", size=8)
+    else:
+        pdf.set_font("Helvetica", size=8)
+    for text in pages:
+        pdf.add_page()
+        pdf.multi_cell(0, 3.5, text if font is not None else text.encode("latin-1", "replace").decode("latin-1"))
+    pdf.output(str(path))
+
+
+def write_docx(pages: List[str], path: Path) -> None:
+    from docx import Document
+    from docx.enum.text import WD_BREAK
+
+    doc = Document()
+    for i, text in enumerate(pages):
+        for line in text.split("\n"):
+            doc.add_paragraph(line)
+        if i < len(pages) - 1:
+            doc.paragraphs[-1].add_run().add_break(WD_BREAK.PAGE)
+    doc.save(str(path))
@@ -16,3 +16,26 @@ async def client():
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
+
+
+def _hashed_bag_of_words(text: str, dim: int = 64):
+    """Deterministic stand-in for a sentence embedding: normalized hashed token counts."""
+    import zlib
+
+    import numpy as np
+
+    vec = np.zeros(dim, dtype=float)
+    for token in text.lower().split():
+        vec[zlib.crc32(token.encode("utf-8")) % dim] += 1.0
+    norm = np.linalg.norm(vec)
+    return (vec / norm if norm else vec).tolist()
+
+
+@pytest.fixture
+def fake_embedder(monkeypatch):
+    """Replace the sentence-transformers model with a cheap deterministic embedder."""
+    from app.services import semantic_matcher
+
+    emb = semantic_matcher._Embedder(_hashed_bag_of_words, 64)
+    monkeypatch.setattr(semantic_matcher, "_embedder", emb)
+    return emb
@@ -0,0 +1,12 @@
+"""Local stand-in for the Ollama chat API (POST /api/chat), for routing and hedging tests."""
+from typing import Any, Dict
+
+from benchmarks.standin_llm_server import StandinConfig, StandinLLMServer
+
+
+class StandinOllama(StandinLLMServer):
+    """Serves a fixed JSON reply after `delay_s`, streamed as NDJSON when the client asks for it."""
+
+    def __init__(self, reply: Dict[str, Any], delay_s: float = 0.0) -> None:
+        # The whole delay comes before the first chunk, so a slow stand-in looks like a slow first token.
+        super().__init__(StandinConfig(latency=f"fixed:{delay_s}", first_token_share=1.0, stream_chunks=4, reply=reply))
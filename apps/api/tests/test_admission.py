@@ -0,0 +1,70 @@
+"""Tests for per-stage admission control and load shedding."""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.admission import AdmissionLimiter, AdmissionRejected, _WAIT_SECONDS
+
+MINIMAL_PDF = b"%PDF-1.4\n1 0 obj\n<<>>\nendobj\nxref\n0 2\ntrailer\n<<>>\nstartxref\n10\n%%EOF"
+
+
+async def test_limiter_caps_concurrency_and_sheds_when_queue_full():
+    limiter = AdmissionLimiter("test_cap", max_concurrency=1, max_waiting=1, wait_timeout_s=1.0)
+    release = asyncio.Event()
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.active)
+            await release.wait()
+
+    first = asyncio.create_task(call())
+    await asyncio.sleep(0)
+    second = asyncio.create_task(call())
+    await asyncio.sleep(0)
+    assert limiter.waiting == 1
+
+    with pytest.raises(AdmissionRejected) as exc:
+        async with limiter.slot():
+            pass
+    assert exc.value.reason == "queue_full"
+    assert exc.value.retry_after_s >= 1
+
+    release.set()
+    await asyncio.gather(first, second)
+    assert peak == 1
+    assert _WAIT_SECONDS.count(stage="test_cap") == 2
+
+
+async def test_limiter_wait_timeout():
+    limiter = AdmissionLimiter("test_timeout", max_concurrency=1, max_waiting=4, wait_timeout_s=0.01)
+    async with limiter.slot():
+        with pytest.raises(AdmissionRejected) as exc:
+            async with limiter.slot():
+                pass
+    assert exc.value.reason == "wait_timeout"
+    assert limiter.waiting == 0
+
+
+async def test_analyze_returns_429_with_retry_after(client):
+    with (
+        patch("app.routers.cv_router.CVParser") as MockParser,
+        patch("app.routers.cv_router.CVAnalyzer") as MockAnalyzer,
+    ):
+        MockParser.return_value.parse_file = AsyncMock(return_value="Sample CV text")
+        MockAnalyzer.return_value.analyze_cv = AsyncMock(side_effect=AdmissionRejected("ollama", 7, "queue_full"))
+        response = await client.post(
+            "/api/v1/analyze",
+            files={"file": ("cv.pdf", MINIMAL_PDF, "application/pdf")},
+        )
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "7"
+
+
+async def test_metrics_endpoint_exposes_admission_histogram(client):
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert "cv_admission_wait_seconds" in response.text
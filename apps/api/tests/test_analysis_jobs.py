@@ -0,0 +1,161 @@
+"""Tests for background analysis jobs (POST/GET /api/v1/analyses)."""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.config import settings
+from app.models import CVAnalysisResponse
+from app.services import analysis_jobs
+from app.services.analysis_jobs import (
+    JOB_COMPLETED,
+    JOB_FAILED,
+    AnalysisWorkerPool,
+    InMemoryJobQueue,
+    QueueFullError,
+    SQLiteJobQueue,
+)
+
+MINIMAL_PDF = b"%PDF-1.4\n1 0 obj\n<<>>\nendobj\nxref\n0 2\ntrailer\n<<>>\nstartxref\n10\n%%EOF"
+
+
+async def _wait_for_status(backend, job_id, statuses, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        job = await backend.get(job_id)
+        if job is not None and job.status in statuses:
+            return job
+        assert asyncio.get_running_loop().time() < deadline, f"job stuck in {job and job.status}"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteJobQueue(str(tmp_path / "jobs.sqlite3"), max_pending=2, result_ttl_s=60)
+    return InMemoryJobQueue(max_pending=2, result_ttl_s=60)
+
+
+async def test_queue_rejects_when_full(backend):
+    pool = AnalysisWorkerPool(backend, concurrency=1, poll_interval_s=0.05, runner=AsyncMock())
+    await backend.enqueue(analysis_jobs.AnalysisJob(id="a", cv_text="cv"))
+    await backend.enqueue(analysis_jobs.AnalysisJob(id="b", cv_text="cv"))
+    with pytest.raises(QueueFullError):
+        await pool.submit("cv", None)
+    assert await backend.pending_count() == 2
+
+
+async def test_pool_bounds_concurrency_and_records_results(backend):
+    active = 0
+    peak = 0
+
+    async def runner(job):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        if job.cv_text == "boom":
+            raise RuntimeError("LLM down")
+        if job.cv_text == "unreadable":
+            return {"success": False, "error": "Не вдалося проаналізувати резюме"}
+        return {"success": True, "extracted_text": job.cv_text}
+
+    pool = AnalysisWorkerPool(backend, concurrency=2, poll_interval_s=0.05, runner=runner)
+    try:
+        ok = await pool.submit("cv one", "job")
+        bad = await pool.submit("boom", None)
+        done = await _wait_for_status(backend, ok.id, {JOB_COMPLETED})
+        failed = await _wait_for_status(backend, bad.id, {JOB_FAILED})
+        unsuccessful = await pool.submit("unreadable", None)
+        unsuccessful = await _wait_for_status(backend, unsuccessful.id, {JOB_COMPLETED, JOB_FAILED})
+        more = [await pool.submit(f"cv {i}", None) for i in range(2)]
+        for job in more:
+            await _wait_for_status(backend, job.id, {JOB_COMPLETED})
+    finally:
+        await pool.stop()
+
+    assert done.result == {"success": True, "extracted_text": "cv one"}
+    assert failed.error == "LLM down"
+    assert unsuccessful.status == JOB_FAILED
+    assert unsuccessful.error == "Не вдалося проаналізувати резюме"
+    assert peak <= 2
+
+
+async def test_submit_and_poll_endpoints(client, monkeypatch):
+    monkeypatch.setattr(analysis_jobs, "_pool", None)
+    mock_response = CVAnalysisResponse(success=True, extracted_text="Sample CV text", skills=["Python"])
+
+    with (
+        patch("app.routers.cv_router.CVParser") as MockParser,
+        patch("app.services.analysis_jobs.CVAnalyzer") as MockAnalyzer,
+    ):
+        MockParser.return_value.parse_file = AsyncMock(return_value="Sample CV text")
+        MockAnalyzer.return_value.analyze_cv = AsyncMock(return_value=mock_response)
+
+        submitted = await client.post(
+            "/api/v1/analyses",
+            files={"file": ("cv.pdf", MINIMAL_PDF, "application/pdf")},
+            data={"job_description": "Python developer"},
+        )
+        assert submitted.status_code == 202
+        job_id = submitted.json()["id"]
+        await _wait_for_status(analysis_jobs.get_worker_pool().backend, job_id, {JOB_COMPLETED})
+        polled = await client.get(f"/api/v1/analyses/{job_id}")
+
+    await analysis_jobs.shutdown_worker_pool()
+    assert polled.status_code == 200
+    body = polled.json()
+    assert body["status"] == "completed"
+    assert body["result"]["skills"] == ["Python"]
+    assert (await client.get("/api/v1/analyses/missing")).status_code == 404
+
+
+async def test_lifespan_drains_jobs_persisted_before_startup(tmp_path, monkeypatch):
+    from app.main import app, lifespan
+
+    monkeypatch.setattr(settings, "preload_optional_modules", False)
+    monkeypatch.setattr(settings, "loop_monitor_enabled", False)
+    backend = SQLiteJobQueue(str(tmp_path / "jobs.sqlite3"), max_pending=2, result_ttl_s=60)
+    await backend.enqueue(analysis_jobs.AnalysisJob(id="left-over", cv_text="cv"))
+    runner = AsyncMock(return_value={"success": True})
+    monkeypatch.setattr(
+        analysis_jobs, "_pool", AnalysisWorkerPool(backend, concurrency=1, poll_interval_s=0.05, runner=runner)
+    )
+
+    async with lifespan(app):
+        job = await _wait_for_status(backend, "left-over", {JOB_COMPLETED})
+    assert job.result == {"success": True}
+    assert not analysis_jobs._pool.running
+
+
+async def test_sqlite_lease_requeues_jobs_of_dead_workers_but_not_live_ones(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    crashed_node = SQLiteJobQueue(path, max_pending=2, result_ttl_s=60, lease_s=0.1)
+    await crashed_node.enqueue(analysis_jobs.AnalysisJob(id="orphan", cv_text="cv"))
+    assert (await crashed_node.claim()).id == "orphan"
+    assert await crashed_node.claim() is None
+
+    await asyncio.sleep(0.15)
+    other_node = SQLiteJobQueue(path, max_pending=2, result_ttl_s=60, lease_s=0.1)
+    runner_started = asyncio.Event()
+
+    async def slow_runner(job):
+        runner_started.set()
+        await asyncio.sleep(0.4)
+        return {"success": True}
+
+    pool = AnalysisWorkerPool(
+        other_node, concurrency=1, poll_interval_s=0.05, heartbeat_interval_s=0.03, runner=slow_runner
+    )
+    pool.start()
+    try:
+        await asyncio.wait_for(runner_started.wait(), timeout=2)
+        # The live worker keeps renewing its lease, so nobody else takes the job over.
+        for _ in range(5):
+            await asyncio.sleep(0.06)
+            assert await crashed_node.claim() is None
+        job = await _wait_for_status(other_node, "orphan", {JOB_COMPLETED})
+    finally:
+        await pool.stop()
+    assert job.result == {"success": True}
@@ -0,0 +1,42 @@
+"""Tests for the PDF analysis report (offline: uses a locally available DejaVu font)."""
+import pytest
+
+from app.config import settings
+from app.models import CVAnalysisResponse
+from app.services.analysis_pdf import render_analysis_pdf
+from benchmarks.synthetic_data import find_unicode_font
+
+
+@pytest.fixture
+def local_font(monkeypatch):
+    font = find_unicode_font()
+    if font is None:
+        pytest.skip("no local Unicode TTF font (set PDF_FONT_PATH)")
+    monkeypatch.setattr(settings, "pdf_font_path", str(font))
+
+
+def test_renders_multi_line_sections(local_font):
+    long_line = "Досвід розробки бекенду на Python і FastAPI, " * 8
+    resp = CVAnalysisResponse(
+        success=True,
+        match_score=0.72,
+        match_score_reasoning="Навички збігаються.\nДосвід трохи коротший за вимоги.\n" + long_line,
+        semantic_breakdown={"skills_similarity": 0.8, "experience_similarity": 0.6, "overall_similarity": 0.7},
+        semantic_weights={"skills": 0.4, "experience": 0.4, "overall": 0.2},
+        analysis={"summary": long_line, "strengths": ["Python", "SQL"], "weaknesses": "Мало досвіду з Kubernetes"},
+        matched_competencies=["Python", "FastAPI"],
+        missing_competencies=["Kubernetes"],
+        recommendations=["Додайте метрики результатів", "Опишіть проєкти детальніше"],
+        skills=["Python", "FastAPI", "PostgreSQL"],
+    )
+
+    pdf = render_analysis_pdf(resp)
+
+    assert pdf.startswith(b"%PDF")
+    assert len(pdf) > 1000
+
+
+def test_renders_failed_analysis(local_font):
+    pdf = render_analysis_pdf(CVAnalysisResponse(success=False, error="Не вдалося прочитати файл"))
+
+    assert pdf.startswith(b"%PDF")
@@ -0,0 +1,79 @@
+"""Tests for POST /api/v1/analyze/stream (Server-Sent Events)."""
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.models import CVAnalysisResponse
+from app.services.cv_analyzer import CVAnalysisOutput, CVAnalyzer
+from app.services.semantic_matcher import SemanticMatchResult
+
+MINIMAL_PDF = b"%PDF-1.4\n1 0 obj\n<<>>\nendobj\nxref\n0 2\ntrailer\n<<>>\nstartxref\n10\n%%EOF"
+
+
+def _parse_sse(body: str):
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_stages_then_result(client):
+    final = CVAnalysisResponse(success=True, extracted_text="Sample CV text", skills=["Python"], match_score=0.7)
+
+    async def fake_analyze(cv_text, request, on_stage=None):
+        await on_stage("extraction", {"skills": ["Python"]})
+        await on_stage("semantic", {"match_score": 0.7})
+        return final
+
+    with (
+        patch("app.routers.cv_router.CVParser") as MockParser,
+        patch("app.routers.cv_router.CVAnalyzer") as MockAnalyzer,
+    ):
+        MockParser.return_value.parse_file = AsyncMock(return_value="Sample CV text")
+        MockAnalyzer.return_value.analyze_cv = AsyncMock(side_effect=fake_analyze)
+
+        response = await client.post(
+            "/api/v1/analyze/stream",
+            files={"file": ("cv.pdf", MINIMAL_PDF, "application/pdf")},
+            data={"job_description": "Python developer"},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    assert [e[0] for e in events] == ["extracted_text", "extraction", "semantic", "result"]
+    assert events[0][1]["extracted_text"] == "Sample CV text"
+    assert events[-1][1]["match_score"] == 0.7
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_invalid_file_before_streaming(client):
+    response = await client.post(
+        "/api/v1/analyze/stream",
+        files={"file": ("fake.pdf", b"not a pdf at all", "application/pdf")},
+    )
+    assert response.status_code == 400
+
+
+async def test_finish_success_reports_stages_in_order():
+    seen = []
+
+    async def on_stage(stage, payload):
+        seen.append((stage, payload))
+
+    sem = SemanticMatchResult(score=0.6, skills_similarity=0.6, experience_similarity=0.6, overall_similarity=0.6)
+    output = CVAnalysisOutput(skills=["Python"], experience=[], recommendations=["Додайте проєкти."])
+    with (
+        patch("app.services.cv_analyzer.compute_semantic_match", return_value=sem),
+        patch("app.services.cv_analyzer.explain_match_score", return_value=None),
+        patch("app.services.cv_analyzer.settings.use_llm_semantic_narrative", False),
+    ):
+        resp = await CVAnalyzer()._finish_success("CV", "CV", output, "Job", raw_llm=None, on_stage=on_stage)
+
+    assert [s for s, _ in seen] == ["extraction", "semantic", "explainability", "narrative"]
+    assert seen[0][1]["skills"] == ["Python"]
+    assert seen[1][1]["match_score"] == pytest.approx(0.6)
+    assert resp.match_score == pytest.approx(0.6)
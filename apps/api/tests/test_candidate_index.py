@@ -0,0 +1,106 @@
+"""Tests for the candidate vector index and POST /api/v1/candidates/search."""
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services import candidate_index
+from app.services.candidate_index import CandidateIndex
+from app.services.semantic_matcher import SemanticBlocks, semantic_match_matrix
+
+CVS = {
+    "py": SemanticBlocks(skills=["Python", "FastAPI"], experience_text="Backend developer", full_text="Python FastAPI backend"),
+    "chef": SemanticBlocks(skills=[], experience_text="Chef", full_text="Pastry chef and cook"),
+    "js": SemanticBlocks(skills=["React"], experience_text="Frontend developer", full_text="React frontend developer"),
+}
+JOB = "Python FastAPI backend developer"
+
+
+def test_exact_search_matches_semantic_scoring(fake_embedder):
+    index = CandidateIndex()
+    for cid, blocks in CVS.items():
+        index.add(cid, blocks)
+
+    hits = index.search(JOB, top_k=3)
+    expected = semantic_match_matrix(list(CVS.values()), [JOB])
+    by_id = {cid: row[0] for cid, row in zip(CVS, expected)}
+    assert hits[0].candidate_id == "py"
+    for hit in hits:
+        assert hit.match.score == pytest.approx(by_id[hit.candidate_id].score, abs=1e-5)
+        assert hit.match.skills_similarity == pytest.approx(by_id[hit.candidate_id].skills_similarity, abs=1e-5)
+
+
+def test_insert_delete_and_persistence(tmp_path, fake_embedder):
+    path = str(tmp_path / "index.npz")
+    index = CandidateIndex(path)
+    for cid, blocks in CVS.items():
+        index.add(cid, blocks)
+    assert index.remove("py")
+    assert not index.remove("py")
+    index.save()
+
+    reloaded = CandidateIndex(path)
+    assert len(reloaded) == 2 and "py" not in reloaded
+    assert {h.candidate_id for h in reloaded.search(JOB, top_k=5)} == {"chef", "js"}
+
+
+def test_mutations_are_logged_and_compacted_without_full_rewrites(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "candidate_index_compact_ops", 4)
+    path = tmp_path / "index.npz"
+    log = tmp_path / "index.npz.log"
+    vectors = np.random.default_rng(0).standard_normal((6, 3, 8)).astype(np.float32)
+    index = CandidateIndex(str(path))
+    for i in range(3):
+        index.add_vectors(f"cv-{i}", vectors[i])
+        assert not index.maybe_compact()
+    assert index.remove("cv-0")
+    assert not path.exists() and log.stat().st_size > 0
+
+    replayed = CandidateIndex(str(path))
+    assert sorted(replayed._ids) == ["cv-1", "cv-2"]
+
+    index.add_vectors("cv-3", vectors[3])
+    assert index.maybe_compact()
+    assert path.exists() and log.stat().st_size == 0
+    index.add_vectors("cv-4", vectors[4])
+    index.add_vectors("cv-5", vectors[5])
+    # A record cut short by a crash is dropped; everything before it survives.
+    with open(log, "ab") as f:
+        f.write(b"\x01\x05")
+
+    reloaded = CandidateIndex(str(path))
+    assert sorted(reloaded._ids) == ["cv-1", "cv-2", "cv-3", "cv-4", "cv-5"]
+    hit = reloaded.search_vectors(vectors[5, 0], vectors[5, 2], top_k=1)[0]
+    assert hit.candidate_id == "cv-5"
+    reloaded.add_vectors("cv-6", vectors[0])
+    assert "cv-6" in CandidateIndex(str(path))
+
+
+def test_ivf_recall():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((400, 3, 32)).astype(np.float32)
+    index = CandidateIndex()
+    index.add_many_vectors([f"cv-{i}" for i in range(400)], vectors)
+    index.build_ivf(n_lists=8)
+
+    recalls = []
+    for q in rng.standard_normal((20, 32)).astype(np.float32):
+        exact = {h.candidate_id for h in index.search_vectors(q, q, top_k=10)}
+        approx = index.search_vectors(q, q, top_k=10, mode="ivf", nprobe=4)
+        recalls.append(len(exact & {h.candidate_id for h in approx}) / 10)
+    assert np.mean(recalls) >= 0.6
+
+
+async def test_search_and_delete_endpoints(client, fake_embedder, monkeypatch):
+    index = CandidateIndex()
+    for cid, blocks in CVS.items():
+        index.add(cid, blocks)
+    monkeypatch.setattr(candidate_index, "_index", index)
+
+    response = await client.post("/api/v1/candidates/search", json={"job_description": JOB, "top_k": 2})
+    assert response.status_code == 200
+    candidates = response.json()["candidates"]
+    assert [c["rank"] for c in candidates] == [1, 2]
+    assert candidates[0]["candidate_id"] == "py"
+
+    assert (await client.delete("/api/v1/candidates/py")).status_code == 204
+    assert (await client.delete("/api/v1/candidates/py")).status_code == 404
@@ -0,0 +1,134 @@
+"""Tests for map-reduce extraction of long CVs (chunking, merge, concurrent chunk calls)."""
+import asyncio
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from app.config import settings
+from app.models import ExperienceItem
+from app.services import admission as admission_module
+from app.services.admission import AdmissionLimiter
+from app.services.cv_analyzer import CVAnalysisOutput, CVAnalyzer, _merge_chunk_outputs
+from app.utils.text_chunks import split_into_chunks
+
+
+def _long_cv(sections=12, lines_per_section=8):
+    parts = []
+    for s in range(sections):
+        parts.append(f"EXPERIENCE {s}:")
+        parts.extend(f"Company {s} line {i}: built services in Python and SQL." for i in range(lines_per_section))
+        parts.append("")
+    return "\n".join(parts)
+
+
+def test_short_text_is_single_chunk():
+    assert split_into_chunks("Python developer", 100) == ["Python developer"]
+    assert split_into_chunks("   ", 100) == []
+
+
+def test_chunks_respect_size_cut_at_sections_and_overlap():
+    text = _long_cv()
+    chunks = split_into_chunks(text, 800, overlap_chars=120)
+    assert len(chunks) > 1
+    assert all(len(c) <= 800 for c in chunks)
+    # Every line of the CV is covered by some chunk.
+    for line in filter(None, text.split("\n")):
+        assert any(line in c for c in chunks)
+    # The next chunk repeats a short tail of the previous one.
+    assert chunks[1].splitlines()[0] in chunks[0]
+    # Without overlap every cut lands on a section start.
+    assert all(c.startswith("EXPERIENCE") for c in split_into_chunks(text, 800))
+
+
+def test_overlong_line_is_split():
+    chunks = split_into_chunks("word " * 500, 300)
+    assert len(chunks) > 1 and all(len(c) <= 300 for c in chunks)
+
+
+def test_merge_dedupes_and_keeps_most_complete_items():
+    a = CVAnalysisOutput(
+        skills=["Python", "SQL"],
+        experience=[ExperienceItem(employer="Acme", title="Backend Developer", duration=None)],
+        analysis={"summary": "Backend engineer", "strengths": ["APIs"]},
+        recommendations=["Додайте метрики"],
+        matched_competencies=["Python"],
+        missing_competencies=["Kubernetes"],
+    )
+    b = CVAnalysisOutput(
+        skills=[" python ", "Docker"],
+        experience=[
+            ExperienceItem(employer="acme", title="Backend  developer", duration="2020-2023"),
+            ExperienceItem(employer="Globex", title="Intern", duration="2019"),
+        ],
+        analysis={"summary": "", "strengths": ["apis", "Testing"]},
+        recommendations=["додайте метрики", "Опишіть проєкти"],
+        matched_competencies=["Kubernetes"],
+        missing_competencies=["Go"],
+    )
+    merged = _merge_chunk_outputs([a, b])
+    assert merged.skills == ["Python", "SQL", "Docker"]
+    assert len(merged.experience) == 2
+    assert merged.experience[0].duration == "2020-2023"
+    assert merged.analysis == {"summary": "Backend engineer", "strengths": ["APIs", "Testing"]}
+    assert merged.recommendations == ["Додайте метрики", "Опишіть проєкти"]
+    assert merged.matched_competencies == ["Python", "Kubernetes"]
+    assert merged.missing_competencies == ["Go"]
+
+
+@pytest.mark.asyncio
+async def test_map_reduce_runs_chunks_concurrently(monkeypatch):
+    monkeypatch.setattr(settings, "llm_chunk_threshold_chars", 1000)
+    monkeypatch.setattr(settings, "llm_chunk_chars", 800)
+    monkeypatch.setattr(settings, "llm_chunk_overlap_chars", 0)
+
+    in_flight = 0
+    peak = 0
+    prompts = []
+
+    async def fake_llm(prompt_value):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        text = prompt_value.to_string()
+        prompts.append(text)
+        skills = sorted({f"Skill{s}" for s in range(12) if f"EXPERIENCE {s}:" in text})
+        return CVAnalysisOutput(skills=skills + ["Python"], recommendations=["Додайте метрики"])
+
+    analyzer = CVAnalyzer()
+    analyzer._llm_stage = "gemini"
+    cv_text = _long_cv()
+    result = await analyzer._extract_map_reduce(cv_text, "", RunnableLambda(fake_llm), None)
+
+    assert len(prompts) == len(split_into_chunks(cv_text, 800)) > 1
+    assert peak > 1
+    assert all("Фрагмент" in p for p in prompts)
+    assert result.skills.count("Python") == 1
+    assert {f"Skill{s}" for s in range(12)} <= set(result.skills)
+
+
+@pytest.mark.asyncio
+async def test_map_reduce_fan_out_stays_within_admission_limits(monkeypatch):
+    monkeypatch.setattr(settings, "llm_chunk_threshold_chars", 1000)
+    monkeypatch.setattr(settings, "llm_chunk_chars", 800)
+    monkeypatch.setattr(settings, "llm_chunk_overlap_chars", 0)
+    # Two slots and no wait queue: a chunk that had to queue for a slot would be shed.
+    limiter = AdmissionLimiter("gemini", max_concurrency=2, max_waiting=0, wait_timeout_s=0.01)
+    monkeypatch.setitem(admission_module._limiters, "gemini", limiter)
+    peak = 0
+
+    async def fake_llm(prompt_value):
+        nonlocal peak
+        peak = max(peak, limiter.active)
+        await asyncio.sleep(0.02)
+        return CVAnalysisOutput(skills=["Python"], recommendations=["Додайте метрики"])
+
+    analyzer = CVAnalyzer()
+    analyzer._llm_stage = "gemini"
+    cv_text = _long_cv()
+    assert len(split_into_chunks(cv_text, 800)) > 2
+    result = await analyzer._extract_map_reduce(cv_text, "", RunnableLambda(fake_llm), None)
+
+    assert result.skills == ["Python"]
+    assert peak == 2 and limiter.waiting == 0
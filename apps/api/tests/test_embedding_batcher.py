@@ -0,0 +1,114 @@
+"""Tests for cross-request micro-batching of encoder calls."""
+import threading
+import time
+
+import pytest
+
+from app.config import settings
+from app.services import embedding_batcher, semantic_matcher
+from app.services.embedding_batcher import BatchingEmbedder, MicroBatcher
+from tests.conftest import _hashed_bag_of_words
+
+
+class RecordingEncoder:
+    def __init__(self, fail=False, hold_first=False):
+        self.calls = []
+        self.fail = fail
+        # When set, the first call blocks until release is set, so later requests queue behind it.
+        self.release = threading.Event()
+        self.running = threading.Event()
+        if not hold_first:
+            self.release.set()
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        self.running.set()
+        self.release.wait(5)
+        if self.fail:
+            raise RuntimeError("encoder down")
+        return [[float(len(t))] for t in texts]
+
+
+def _submit_concurrently(batcher, requests):
+    results = [None] * len(requests)
+    barrier = threading.Barrier(len(requests))
+
+    def worker(i):
+        barrier.wait()
+        results[i] = batcher.encode(requests[i])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(requests))]
+    for t in threads:
+        t.start()
+    return threads, results
+
+
+def _behind_a_running_call(batcher, encoder, requests):
+    """Submit requests while the encoder is busy with a first one, then let it finish."""
+    first = batcher.submit(["warm"])
+    assert encoder.running.wait(5)
+    threads, results = _submit_concurrently(batcher, requests)
+    while len(batcher._queue) < len(requests):
+        time.sleep(0.001)
+    encoder.release.set()
+    for t in threads:
+        t.join(5)
+    assert first.result(5) == [[4.0]]
+    return results
+
+
+def test_idle_batcher_encodes_a_lone_request_without_waiting():
+    encoder = RecordingEncoder()
+    batcher = MicroBatcher(encoder, max_batch=64, max_wait_s=5)
+    started = time.monotonic()
+    assert batcher.encode(["a"]) == [[1.0]]
+    assert batcher.encode(["bb"]) == [[2.0]]
+    assert time.monotonic() - started < 1
+    assert encoder.calls == [["a"], ["bb"]]
+
+
+def test_requests_arriving_while_busy_share_one_encoder_call():
+    encoder = RecordingEncoder(hold_first=True)
+    batcher = MicroBatcher(encoder, max_batch=64, max_wait_s=0.2)
+    sizes = embedding_batcher._BATCH_SIZE.count()
+
+    results = _behind_a_running_call(batcher, encoder, [["a"], ["bb", "ccc"], ["dddd"]])
+
+    assert len(encoder.calls) == 2
+    assert sorted(encoder.calls[1]) == ["a", "bb", "ccc", "dddd"]
+    assert results == [[[1.0]], [[2.0], [3.0]], [[4.0]]]
+    assert embedding_batcher._BATCH_SIZE.count() == sizes + 2
+    assert embedding_batcher._QUEUE_WAIT.count() >= 4
+
+
+def test_full_batch_is_sent_without_waiting_and_requests_are_not_split():
+    encoder = RecordingEncoder(hold_first=True)
+    batcher = MicroBatcher(encoder, max_batch=4, max_wait_s=5)
+    started = time.monotonic()
+    results = _behind_a_running_call(batcher, encoder, [["a", "b"], ["c", "d"]])
+    assert results == [[[1.0], [1.0]], [[1.0], [1.0]]]
+    assert batcher.encode(["a", "b", "c", "d", "e"]) == [[1.0]] * 5
+    assert time.monotonic() - started < 2
+    assert [len(c) for c in encoder.calls] == [1, 4, 5]
+
+
+def test_encoder_errors_reach_every_waiter():
+    batcher = MicroBatcher(RecordingEncoder(fail=True), max_wait_s=0.001)
+    with pytest.raises(RuntimeError, match="encoder down"):
+        batcher.encode(["a"])
+    assert batcher.encode([]) == []
+
+
+def test_get_embedder_wraps_the_encoder(monkeypatch):
+    inner = semantic_matcher._Embedder(_hashed_bag_of_words, 64)
+    monkeypatch.setattr(semantic_matcher, "_embedder", None)
+    monkeypatch.setattr(semantic_matcher, "_get_embedder", lambda: inner)
+    monkeypatch.setattr(settings, "embedding_batch_wait_ms", 1.0)
+    emb = semantic_matcher.get_embedder()
+    assert isinstance(emb, BatchingEmbedder) and emb.inner is inner
+    assert emb.dimension == 64
+    assert emb.embed_query("python developer") == pytest.approx(_hashed_bag_of_words("python developer"))
+
+    monkeypatch.setattr(semantic_matcher, "_embedder", None)
+    monkeypatch.setattr(settings, "embedding_batch_wait_ms", 0)
+    assert semantic_matcher.get_embedder() is inner
@@ -0,0 +1,97 @@
+"""Tests for the shared embedding sidecar (Unix socket + shared memory) and its client fallback."""
+import threading
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services import semantic_matcher
+from app.services.embedding_sidecar import EmbeddingSidecarServer, SidecarEmbedder
+from app.services.semantic_matcher import _windows_from_offsets
+from tests.conftest import _hashed_bag_of_words
+
+
+def _model():
+    def split(text):
+        words = text.split()
+        offsets, pos = [], 0
+        for w in words:
+            start = text.index(w, pos)
+            offsets.append((start, start + len(w)))
+            pos = start + len(w)
+        return _windows_from_offsets(text, offsets, 3)
+
+    return semantic_matcher._Embedder(_hashed_bag_of_words, 64, None, split)
+
+
+@pytest.fixture
+def sidecar(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "embedding_batch_wait_ms", 1.0)
+    monkeypatch.setattr(settings, "embedding_sidecar_retry_s", 0.0)
+    monkeypatch.setattr(settings, "embedding_window_overlap_tokens", 1)
+    path = str(tmp_path / "embed.sock")
+    server = EmbeddingSidecarServer(path, _model())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield path
+    server.shutdown()
+    server.server_close()
+
+
+def _failing_local():
+    raise AssertionError("local model must not load while the sidecar is up")
+
+
+def test_vectors_come_back_through_shared_memory(sidecar):
+    client = SidecarEmbedder(sidecar, _failing_local)
+    assert client.dimension == 64
+    texts = ["python developer", "", "docker kubernetes"]
+    got = np.array(client.embed_documents(texts))
+    np.testing.assert_allclose(got, [_hashed_bag_of_words(t) for t in texts], atol=1e-6)
+    # A batch larger than the initial buffer forces a new, bigger segment.
+    many = [f"skill{i} engineer" for i in range(5000)]
+    assert len(client.embed_documents(many)) == 5000
+    assert client.embed_query("python developer") == pytest.approx(_hashed_bag_of_words("python developer"), abs=1e-6)
+    assert client.split_windows("a b c d e") == ["a b c", "c d e"]
+
+
+def test_concurrent_clients_threads_share_the_server(sidecar):
+    client = SidecarEmbedder(sidecar, _failing_local)
+    results = {}
+
+    def work(i):
+        results[i] = client.embed_documents([f"text {i}", f"other {i}"])
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert all(results[i][0] == pytest.approx(_hashed_bag_of_words(f"text {i}"), abs=1e-6) for i in range(8))
+
+
+def test_falls_back_to_local_model_while_sidecar_is_down(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "embedding_sidecar_retry_s", 0.0)
+    monkeypatch.setattr(settings, "embedding_window_overlap_tokens", 1)
+    monkeypatch.setattr(settings, "embedding_batch_wait_ms", 1.0)
+    path = str(tmp_path / "embed.sock")
+    loads = []
+
+    def local():
+        loads.append(1)
+        return _model()
+
+    client = SidecarEmbedder(path, local)
+    assert client.embed_query("python") == pytest.approx(_hashed_bag_of_words("python"))
+    assert client.split_windows("a b c d") == ["a b c", "c d"]
+    assert loads == [1]
+
+    server = EmbeddingSidecarServer(path, semantic_matcher._Embedder(lambda t: [1.0] * 64, 64))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        # Retried after embedding_sidecar_retry_s: back on the sidecar.
+        assert client.embed_query("python") == [1.0] * 64
+        assert loads == [1]
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,98 @@
+"""Tests for streamed extraction parsing and early abort."""
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from app.services.cv_analyzer import CVAnalyzer
+from app.utils.incremental_json import IncrementalJSONObjectParser
+
+
+def _feed_in_pieces(parser, text, size=3):
+    closed = []
+    for i in range(0, len(text), size):
+        closed.extend(parser.feed(text[i : i + size]))
+    return closed
+
+
+def test_parser_reports_fields_as_they_close():
+    doc = {"skills": ["Python", "a \"quoted\", {tricky} one"], "analysis": {"summary": "ok"}, "match_score": None}
+    parser = IncrementalJSONObjectParser()
+    closed = _feed_in_pieces(parser, json.dumps(doc))
+    assert [k for k, _ in closed] == ["skills", "analysis", "match_score"]
+    assert parser.done and parser.error is None
+    assert parser.fields == doc
+
+
+def test_parser_skips_code_fence_and_flags_garbage():
+    parser = IncrementalJSONObjectParser()
+    parser.feed('```json\n{"skills": []}')
+    assert parser.done and parser.fields == {"skills": []}
+
+    bad = IncrementalJSONObjectParser(max_preamble_chars=10)
+    bad.feed("Sorry, I cannot help with that request.")
+    assert bad.error
+
+    broken = IncrementalJSONObjectParser()
+    broken.feed('{"skills": [1, 2,], "x": 1}')
+    assert broken.error
+
+
+class _FakeStream:
+    def __init__(self, pieces):
+        self._pieces = list(pieces)
+        self.emitted = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._pieces:
+            raise StopAsyncIteration
+        self.emitted += 1
+        return AIMessageChunk(content=self._pieces.pop(0))
+
+    async def aclose(self):
+        self.closed = True
+
+
+def _analyzer_with_stream(stream):
+    analyzer = CVAnalyzer()
+    bound = MagicMock()
+    bound.astream.return_value = stream
+    analyzer._ollama_llm = MagicMock()
+    analyzer._ollama_llm.bind.return_value = bound
+    return analyzer
+
+
+async def test_stream_aborts_once_extraction_fields_are_empty():
+    empty = '{"skills": [], "experience": [], "certificates": [], "education": [], "projects": [], "analysis": {}, '
+    tail = ['"recommendations": ["a"', ', "b"]}'] * 50
+    stream = _FakeStream([empty] + tail)
+    result = await _analyzer_with_stream(stream)._stream_structured_extraction([])
+    assert result is None
+    assert stream.emitted == 1
+    assert stream.closed
+
+
+async def test_stream_returns_output_and_forwards_fields():
+    doc = {"skills": ["Python"], "experience": [], "recommendations": ["Додайте проєкти."]}
+    text = json.dumps(doc, ensure_ascii=False)
+    stream = _FakeStream([text[i : i + 5] for i in range(0, len(text), 5)])
+    seen = []
+
+    async def on_stage(stage, payload):
+        seen.append((stage, payload["field"]))
+
+    result = await _analyzer_with_stream(stream)._stream_structured_extraction([], on_stage)
+    assert result is not None
+    assert result.skills == ["Python"]
+    assert seen[0] == ("extraction_field", "skills")
+
+
+@pytest.mark.parametrize("pieces", [["not json at all " * 30], ['{"skills": ["Py']])
+async def test_stream_malformed_or_truncated_returns_none(pieces):
+    result = await _analyzer_with_stream(_FakeStream(pieces))._stream_structured_extraction([])
+    assert result is None
@@ -0,0 +1,92 @@
+"""Tests for the no-LLM lite analysis mode (rule-based CV segmentation)."""
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.models import CVAnalysisRequest
+from app.services.cv_analyzer import CVAnalyzer
+from app.services.cv_segmenter import lite_extraction, segment_cv
+from tests.test_analyze import MINIMAL_PDF
+
+CV_UK = """Іван Петренко
+Python Developer
+
+Досвід роботи
+Senior Python Developer — SoftServe
+Січень 2021 – дотепер
+- Розробив мікросервіси на FastAPI для 2 млн користувачів
+2018 – 2020
+Розробник у EPAM Systems
+
+Освіта
+Київський політехнічний інститут, магістр, 2012 – 2018
+
+Навички: Python, FastAPI, Docker"""
+
+CV_EN = """EXPERIENCE
+GlobalLogic | Frontend Engineer | Mar 2020 - Present
+• Built a design system in React
+
+CERTIFICATIONS
+Meta Front-End Developer Certificate - Coursera - 2021
+
+PROJECTS
+Weather Widget: React widget with offline cache (github.com/jane/weather)"""
+
+
+def test_sections_split_on_uk_and_en_headings():
+    sections = segment_cv(CV_UK)
+    assert sections.found() == ["experience", "education", "skills"]
+    assert sections.skills == ["Python, FastAPI, Docker"]
+    assert sections.other == ["Іван Петренко", "Python Developer"]
+
+
+def test_ukrainian_cv_fields():
+    out = lite_extraction(CV_UK)
+    assert [(e.title, e.employer, e.duration) for e in out["experience"]] == [
+        ("Senior Python Developer", "SoftServe", "Січень 2021 – дотепер"),
+        ("Розробник", "EPAM Systems", "2018 – 2020"),
+    ]
+    edu = out["education"][0]
+    assert (edu.institution, edu.degree, edu.year) == ("Київський політехнічний інститут", "магістр", "2012 – 2018")
+    assert out["skills"][:3] == ["Python", "Microservices", "FastAPI"]
+    assert any("проєкти" in r for r in out["recommendations"])
+
+
+def test_english_cv_fields():
+    out = lite_extraction(CV_EN)
+    assert (out["experience"][0].title, out["experience"][0].employer) == ("Frontend Engineer", "GlobalLogic")
+    cert = out["certificates"][0]
+    assert (cert.name, cert.institution, cert.year) == ("Meta Front-End Developer Certificate", "Coursera", "2021")
+    project = out["projects"][0]
+    assert (project.name, project.link) == ("Weather Widget", "github.com/jane/weather")
+
+
+async def test_lite_mode_skips_the_llm_and_runs_semantic_match(fake_embedder):
+    request = CVAnalysisRequest(job_description="Python FastAPI Docker developer", analysis_mode="lite")
+    with patch.object(CVAnalyzer, "_run_structured_chain", side_effect=AssertionError("LLM called")):
+        started = time.monotonic()
+        resp = await CVAnalyzer().analyze_cv(CV_UK, request)
+    assert time.monotonic() - started < 1
+    assert resp.success
+    assert resp.analysis["mode"] == "lite"
+    assert resp.match_score is not None and resp.semantic_breakdown
+    assert resp.requirement_coverage
+
+
+@pytest.mark.asyncio
+async def test_analyze_endpoint_passes_analysis_mode(client):
+    lite = await CVAnalyzer().analyze_cv(CV_UK, CVAnalysisRequest(analysis_mode="lite"))
+    with patch("app.routers.cv_router.CVParser") as MockParser, patch(
+        "app.routers.cv_router.CVAnalyzer.analyze_cv", new_callable=AsyncMock, return_value=lite
+    ) as analyze:
+        MockParser.return_value.parse_file = AsyncMock(return_value=CV_UK)
+        response = await client.post(
+            "/api/v1/analyze",
+            files={"file": ("cv.pdf", MINIMAL_PDF, "application/pdf")},
+            data={"analysis_mode": "lite"},
+        )
+    assert response.status_code == 200
+    assert analyze.call_args.args[1].analysis_mode == "lite"
+    assert response.json()["experience"][0]["employer"] == "SoftServe"
@@ -0,0 +1,146 @@
+"""Tests for latency-aware LLM routing and hedged requests (unit + local stand-in Ollama servers)."""
+import asyncio
+import time
+
+import pytest
+
+from app.config import settings
+from app.services import cv_analyzer, llm_router
+from app.services.cv_analyzer import CVAnalyzer
+from app.services.llm_router import LLMRoute, LLMRouter
+from tests.standin_llm import StandinOllama
+
+SMALL = LLMRoute(name="small", backend="ollama", model="small:3b", max_prompt_chars=8000)
+LARGE = LLMRoute(name="large", backend="ollama", model="large:8b")
+
+REPLY = {
+    "skills": ["Python", "FastAPI"],
+    "experience": [{"employer": "Acme", "title": "Backend Developer", "duration": "2021-2024"}],
+    "certificates": [],
+    "education": [],
+    "projects": [],
+    "analysis": {"summary": "Backend engineer"},
+    "recommendations": ["Додайте метрики результатів"],
+    "matched_competencies": [],
+    "missing_competencies": [],
+}
+
+
+def _primed(router, route, latency_s, n=10):
+    for _ in range(n):
+        router.stats(route).record(latency_s, True)
+
+
+def test_plan_routes_by_prompt_length_and_health():
+    router = LLMRouter([LARGE, SMALL], min_samples=4)
+    assert router.plan(1000)[0] is SMALL
+    assert router.plan(50000) == [LARGE, SMALL]
+
+    for _ in range(4):
+        router.stats(SMALL).record(1.0, False)
+    assert router.plan(1000)[0] is LARGE
+
+
+def test_same_capacity_routes_ordered_by_latency():
+    fast = LLMRoute(name="fast", backend="ollama", model="a", max_prompt_chars=8000)
+    slow = LLMRoute(name="slow", backend="gemini", model="b", max_prompt_chars=8000)
+    router = LLMRouter([slow, fast])
+    _primed(router, slow, 2.0)
+    _primed(router, fast, 0.5)
+    assert router.plan(100)[:2] == [fast, slow]
+
+
+@pytest.mark.asyncio
+async def test_hedge_fires_after_p95_and_cancels_loser():
+    router = LLMRouter([SMALL, LARGE], hedge=True)
+    _primed(router, SMALL, 0.02)
+    cancelled = []
+
+    async def call(route):
+        if route is SMALL:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(route.name)
+                raise
+        return route.name
+
+    started = time.monotonic()
+    route, result = await router.run(router.plan(100), call)
+    assert (route, result) == (LARGE, "large")
+    assert time.monotonic() - started < 1
+    assert cancelled == ["small"]
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_enough_samples_but_fail_over_on_error():
+    router = LLMRouter([SMALL, LARGE], hedge=True)
+    calls = []
+
+    async def call(route):
+        calls.append(route.name)
+        if route is SMALL:
+            raise RuntimeError("backend down")
+        return "ok"
+
+    route, result = await router.run(router.plan(100), call)
+    assert (route.name, result, calls) == ("large", "ok", ["small", "large"])
+    assert router.stats(SMALL).error_rate() == 1.0
+
+    async def always_fails(route):
+        raise RuntimeError(route.name)
+
+    with pytest.raises(RuntimeError, match="small"):
+        await router.run(router.plan(100), always_fails)
+
+
+@pytest.fixture
+def routed(monkeypatch, fake_embedder):
+    monkeypatch.setattr(settings, "use_match_explainers", False)
+    monkeypatch.setattr(settings, "use_llm_semantic_narrative", False)
+    monkeypatch.setattr(settings, "ollama_stream_extraction", True)
+    monkeypatch.setattr(settings, "ollama_speculative_fallback", "off")
+    monkeypatch.setattr(cv_analyzer, "_llm_clients", {})
+    monkeypatch.setattr(llm_router, "_router", None)
+
+    def configure(small: StandinOllama, large: StandinOllama, hedge: bool = False):
+        monkeypatch.setattr(
+            settings,
+            "llm_routes",
+            [
+                SMALL.model_copy(update={"base_url": small.base_url}).model_dump(),
+                LARGE.model_copy(update={"base_url": large.base_url}).model_dump(),
+            ],
+        )
+        monkeypatch.setattr(settings, "llm_hedge_enabled", hedge)
+        return llm_router.get_llm_router()
+
+    return configure
+
+
+@pytest.mark.asyncio
+async def test_short_and_long_cvs_go_to_different_models(routed):
+    with StandinOllama(REPLY) as small, StandinOllama(REPLY) as large:
+        routed(small, large)
+        short = await CVAnalyzer().analyze_cv("Backend developer. Python, FastAPI.")
+        long = await CVAnalyzer().analyze_cv("Backend developer with Python. " * 400)
+
+    assert short.success and long.success
+    assert short.skills == ["Python", "FastAPI"]
+    assert [r["model"] for r in small.requests] == ["small:3b"]
+    assert [r["model"] for r in large.requests] == ["large:8b"]
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_to_second_server(routed):
+    with StandinOllama(REPLY, delay_s=3.0) as small, StandinOllama(REPLY) as large:
+        router = routed(small, large, hedge=True)
+        _primed(router, router.routes[0], 0.05)
+        started = time.monotonic()
+        resp = await CVAnalyzer().analyze_cv("Backend developer. Python, FastAPI.")
+        elapsed = time.monotonic() - started
+
+    assert resp.success
+    assert elapsed < 2.5
+    assert len(small.requests) == 1 and len(large.requests) == 1
+    assert router.stats(router.routes[1]).count == 1
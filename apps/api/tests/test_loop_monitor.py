@@ -0,0 +1,101 @@
+"""Tests for the event-loop lag monitor and that /analyze keeps blocking work off the loop."""
+import asyncio
+import logging
+import time
+
+import pytest
+
+from app.config import settings
+from app.main import preload_optional_modules
+from app.routers import cv_router
+from app.services import cv_analyzer, cv_parser, llm_router, semantic_matcher
+from app.services.llm_router import LLMRoute
+from app.utils import loop_monitor
+from app.utils.loop_monitor import LoopLagMonitor, measure_loop_blocking
+from tests.conftest import _hashed_bag_of_words
+from tests.standin_llm import StandinOllama
+from tests.test_analyze import MINIMAL_PDF
+from tests.test_llm_router import REPLY
+from tests.test_lite_analysis import CV_UK
+
+MAX_BLOCK_S = 0.1
+
+
+def _hog_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_measure_loop_blocking_catches_a_blocking_call():
+    async with measure_loop_blocking() as blocking:
+        await asyncio.sleep(0.02)
+        _hog_the_loop(0.2)
+        await asyncio.sleep(0.02)
+    assert blocking.max_block_s >= 0.15
+    assert any("_hog_the_loop" in s for s in blocking.stacks)
+
+    async with measure_loop_blocking() as idle:
+        await asyncio.to_thread(_hog_the_loop, 0.2)
+    assert idle.max_block_s < MAX_BLOCK_S
+
+
+@pytest.mark.asyncio
+async def test_monitor_records_lag_and_logs_stack_of_stall(caplog):
+    stalls = loop_monitor._STALLS.value()
+    lag_samples = loop_monitor._LAG.count()
+    monitor = LoopLagMonitor(interval_s=0.01, block_threshold_s=0.05)
+    monitor.start()
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.utils.loop_monitor"):
+            await asyncio.sleep(0.03)
+            _hog_the_loop(0.2)
+            await asyncio.sleep(0.03)
+    finally:
+        await monitor.stop()
+    assert monitor.max_lag_s >= 0.15
+    assert loop_monitor._LAG.count() > lag_samples
+    assert loop_monitor._STALLS.value() == stalls + 1
+    assert "_hog_the_loop" in caplog.text
+
+
+@pytest.fixture
+def slow_pipeline(monkeypatch):
+    """Real route with parse, embeddings, explainers and PDF render each taking a noticeable CPU-like pause."""
+
+    def slow_parse(_path):
+        time.sleep(0.15)
+        return CV_UK
+
+    def slow_embed(text):
+        time.sleep(0.002)
+        return _hashed_bag_of_words(text)
+
+    def slow_render(_result):
+        time.sleep(0.15)
+        return MINIMAL_PDF
+
+    monkeypatch.setattr(cv_parser.CVParser, "_parse_pdf_sync", staticmethod(slow_parse))
+    monkeypatch.setattr(semantic_matcher, "_embedder", semantic_matcher._Embedder(slow_embed, 64))
+    monkeypatch.setattr(cv_router, "render_analysis_pdf", slow_render)
+    monkeypatch.setattr(settings, "use_llm_semantic_narrative", False)
+    monkeypatch.setattr(settings, "ollama_speculative_fallback", "off")
+    monkeypatch.setattr(cv_analyzer, "_llm_clients", {})
+    monkeypatch.setattr(llm_router, "_router", None)
+
+
+@pytest.mark.asyncio
+async def test_analyze_never_blocks_the_event_loop(client, slow_pipeline, monkeypatch):
+    with StandinOllama(REPLY, delay_s=0.05) as ollama:
+        route = LLMRoute(name="local", backend="ollama", model="standin:7b", base_url=ollama.base_url)
+        monkeypatch.setattr(settings, "llm_routes", [route.model_dump()])
+        # The lifespan (skipped by the test client) preloads SHAP, LIME and the LLM client libraries.
+        await asyncio.to_thread(preload_optional_modules)
+        async with measure_loop_blocking() as blocking:
+            response = await client.post(
+                "/api/v1/analyze",
+                files={"file": ("cv.pdf", MINIMAL_PDF, "application/pdf")},
+                data={"job_description": "Python FastAPI Docker developer", "return_pdf": "true"},
+            )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/pdf"
+    assert blocking.max_block_s < MAX_BLOCK_S, "\n".join(blocking.stacks)
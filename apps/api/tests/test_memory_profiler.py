@@ -0,0 +1,67 @@
+"""Tests for opt-in per-stage memory accounting and GET /admin/memory."""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.config import settings
+from app.utils import memory_profiler
+from app.utils.stage_metrics import stage
+from tests.test_analyze import MINIMAL_PDF
+from tests.test_lite_analysis import CV_UK
+
+ADMIN = {"X-Admin-Token": "secret"}
+
+
+@pytest.fixture
+def accounting(monkeypatch):
+    monkeypatch.setattr(settings, "memory_profiling", True)
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    monkeypatch.setattr(memory_profiler, "_accounting", None)
+    acc = memory_profiler.get_memory_accounting()
+    yield acc
+    acc.stop()
+
+
+def test_outer_stage_keeps_peak_reached_before_a_nested_stage(accounting):
+    kept = []
+    with stage("outer"):
+        spike = bytearray(8 << 20)
+        del spike
+        with stage("inner"):
+            kept.append(bytearray(1 << 20))
+    stats = accounting.report(top=5)["stages"]
+    assert stats["outer"]["peak_max_bytes"] >= 8 << 20
+    assert stats["inner"]["peak_max_bytes"] < 8 << 20
+    assert stats["inner"]["traced_delta_total_bytes"] >= 1 << 20
+    assert stats["outer"]["traced_delta_total_bytes"] >= 1 << 20
+
+
+@pytest.mark.asyncio
+async def test_admin_memory_report_after_analyze(client, fake_embedder, accounting):
+    with patch("app.routers.cv_router.CVParser") as MockParser:
+        MockParser.return_value.parse_file = AsyncMock(return_value=CV_UK)
+        response = await client.post(
+            "/api/v1/analyze",
+            files={"file": ("cv.pdf", MINIMAL_PDF, "application/pdf")},
+            data={"analysis_mode": "lite"},
+        )
+    assert response.status_code == 200
+
+    assert (await client.get("/api/v1/admin/memory")).status_code == 403
+    report = (await client.get("/api/v1/admin/memory", params={"top": 5}, headers=ADMIN)).json()
+    assert report["enabled"]
+    assert {"validate", "parse", "lite_extraction", "embeddings"} <= set(report["stages"])
+    assert report["recent_requests"][-1]["path"] == "/api/v1/analyze"
+    assert len(report["top_allocation_sites"]) <= 5
+
+    assert (await client.post("/api/v1/admin/memory/reset", headers=ADMIN)).status_code == 204
+    assert (await client.get("/api/v1/admin/memory", headers=ADMIN)).json()["stages"] == {}
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoints_hidden_without_token_and_409_when_disabled(client, monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "")
+    assert (await client.get("/api/v1/admin/memory", headers=ADMIN)).status_code == 404
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    monkeypatch.setattr(settings, "memory_profiling", False)
+    assert (await client.get("/api/v1/admin/memory", headers=ADMIN)).status_code == 409
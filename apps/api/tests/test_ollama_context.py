@@ -0,0 +1,55 @@
+"""Tests for Ollama context-tier selection from the prompt token estimate."""
+import pytest
+
+from app.config import settings
+from app.services import cv_analyzer
+from app.services.cv_analyzer import CVAnalyzer, _ollama_num_ctx_for
+
+
+@pytest.fixture
+def tiers(monkeypatch):
+    monkeypatch.setattr(settings, "ollama_num_ctx", 24576)
+    monkeypatch.setattr(settings, "ollama_num_ctx_tiers", [16384, 4096, 8192])
+    monkeypatch.setattr(settings, "ollama_chars_per_token", 2.0)
+    monkeypatch.setattr(settings, "ollama_output_tokens", 1000)
+    monkeypatch.setattr(cv_analyzer, "_llm_clients", {})
+
+
+def test_smallest_fitting_tier_is_chosen(tiers):
+    assert _ollama_num_ctx_for(2000) == 4096
+    assert _ollama_num_ctx_for(2 * (4096 - 1000)) == 4096
+    assert _ollama_num_ctx_for(2 * (4096 - 1000) + 1) == 8192
+    assert _ollama_num_ctx_for(20000) == 16384
+    assert _ollama_num_ctx_for(100000) == 24576
+
+
+def test_empty_ladder_uses_ollama_num_ctx(tiers, monkeypatch):
+    monkeypatch.setattr(settings, "ollama_num_ctx_tiers", [])
+    assert _ollama_num_ctx_for(10) == 24576
+
+
+class _FakeChatOllama:
+    def __init__(self, model, temperature, num_ctx):
+        self.num_ctx = num_ctx
+
+
+@pytest.mark.asyncio
+async def test_clients_are_cached_per_tier(tiers, monkeypatch):
+    pytest.importorskip("langchain_ollama")
+    monkeypatch.setattr("langchain_ollama.ChatOllama", _FakeChatOllama)
+    seen = []
+
+    async def fake_chain(self, cv_text, cv_text_for_prompt, job_description, structured_llm, raw_llm, *a, **kw):
+        seen.append(raw_llm)
+
+    monkeypatch.setattr(CVAnalyzer, "_run_structured_chain", fake_chain)
+    monkeypatch.setattr(_FakeChatOllama, "with_structured_output", lambda self, schema: self, raising=False)
+
+    await CVAnalyzer()._analyze_with_ollama("Python developer")
+    await CVAnalyzer()._analyze_with_ollama("Go developer")
+    await CVAnalyzer()._analyze_with_ollama("x" * 60000)
+
+    assert seen[0] is seen[1]
+    assert seen[0].num_ctx == 4096
+    assert seen[2].num_ctx == 24576
+    assert sorted(c.num_ctx for c in cv_analyzer._llm_clients.values()) == [4096, 24576]
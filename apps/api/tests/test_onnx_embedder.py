@@ -0,0 +1,47 @@
+"""Tests for the ONNX Runtime embedding backend (pooling and provider fallback)."""
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services import semantic_matcher
+from app.services.onnx_embedder import mean_pool
+from tests.conftest import _hashed_bag_of_words
+
+
+def test_mean_pool_ignores_padding_and_normalizes():
+    hidden = np.array(
+        [
+            [[1.0, 0.0], [3.0, 0.0], [100.0, 100.0]],
+            [[0.0, 2.0], [0.0, 0.0], [0.0, 0.0]],
+        ],
+        dtype=np.float32,
+    )
+    mask = np.array([[1, 1, 0], [1, 0, 0]])
+    pooled = mean_pool(hidden, mask)
+    np.testing.assert_allclose(pooled, [[1.0, 0.0], [0.0, 1.0]], atol=1e-6)
+    assert not np.isnan(mean_pool(np.zeros((1, 2, 2)), np.array([[1, 1]]))).any()
+
+
+def test_onnx_provider_falls_back_when_model_is_missing(monkeypatch, tmp_path):
+    fallback = semantic_matcher._Embedder(_hashed_bag_of_words, 64)
+    monkeypatch.setattr(settings, "embedding_provider", "onnx")
+    monkeypatch.setattr(settings, "onnx_model_dir", str(tmp_path / "missing"))
+    monkeypatch.setattr(semantic_matcher, "_get_sentence_transformers_embedder", lambda: fallback)
+    assert semantic_matcher._get_embedder() is fallback
+
+
+def test_onnx_encoder_matches_exported_model(monkeypatch):
+    """Runs only where onnxruntime and an exported model are available (ONNX_MODEL_DIR)."""
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("tokenizers")
+    from pathlib import Path
+
+    from app.services.onnx_embedder import ONNX_INT8_FILE, OnnxEncoder
+
+    if not (Path(settings.onnx_model_dir) / ONNX_INT8_FILE).is_file():
+        pytest.skip("no exported ONNX model")
+    enc = OnnxEncoder(settings.onnx_model_dir, quantized=True)
+    vecs = enc.encode(["Python developer", "", "Python розробник"])
+    assert np.allclose(np.linalg.norm(vecs[[0, 2]], axis=1), 1.0, atol=1e-4)
+    assert not vecs[1].any()
+    assert float(vecs[0] @ vecs[2]) > 0.5
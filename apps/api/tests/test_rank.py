@@ -0,0 +1,96 @@
+"""Tests for batched semantic scoring and POST /api/v1/rank."""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.models import CVAnalysisResponse
+from app.services.semantic_matcher import SemanticBlocks, compute_semantic_match, semantic_match_matrix
+
+MINIMAL_PDF = b"%PDF-1.4\n1 0 obj\n<<>>\nendobj\nxref\n0 2\ntrailer\n<<>>\nstartxref\n10\n%%EOF"
+
+CVS = [
+    SemanticBlocks(skills=["Python", "FastAPI"], experience_text="Backend developer at Acme", full_text="Python FastAPI backend developer"),
+    SemanticBlocks(skills=[], experience_text="Chef at a restaurant", full_text="Cooking and pastry chef"),
+]
+JOBS = ["Python backend developer with FastAPI", ""]
+
+
+def test_matrix_matches_single_pair_scoring(fake_embedder):
+    matrix = semantic_match_matrix(CVS, JOBS)
+    for i, cv in enumerate(CVS):
+        for j, job in enumerate(JOBS):
+            single = compute_semantic_match(cv.skills, cv.experience_text, cv.full_text, job, job)
+            assert matrix[i][j].score == pytest.approx(single.score, abs=1e-5)
+            assert matrix[i][j].skills_similarity == pytest.approx(single.skills_similarity, abs=1e-5)
+            assert matrix[i][j].overall_similarity == pytest.approx(single.overall_similarity, abs=1e-5)
+
+
+async def test_rank_orders_cvs_and_enriches_only_top_k(client, fake_embedder):
+    texts = {
+        b"good": "Python FastAPI backend developer with SQL",
+        b"bad": "Pastry chef and restaurant cook",
+    }
+
+    async def parse(path, file_type):
+        with open(path, "rb") as f:
+            return texts[f.read().rsplit(b"%", 1)[-1]]
+    enriched = CVAnalysisResponse(success=True, match_score=0.91, semantic_breakdown={"skills_similarity": 0.9})
+
+    with (
+        patch("app.routers.cv_router.CVParser") as MockParser,
+        patch("app.services.cv_ranker.CVAnalyzer") as MockAnalyzer,
+    ):
+        MockParser.return_value.parse_file = AsyncMock(side_effect=parse)
+        MockAnalyzer.return_value.analyze_cv = AsyncMock(return_value=enriched)
+        response = await client.post(
+            "/api/v1/rank",
+            files=[
+                ("files", ("bad.pdf", MINIMAL_PDF + b"\n%bad", "application/pdf")),
+                ("files", ("good.pdf", MINIMAL_PDF + b"\n%good", "application/pdf")),
+                ("files", ("broken.pdf", b"not a pdf", "application/pdf")),
+            ],
+            data={"job_description": "Python FastAPI backend developer", "top_k": "1"},
+        )
+
+    assert response.status_code == 200
+    ranked = response.json()["candidates"]
+    assert [c["candidate_id"] for c in ranked] == ["good.pdf", "bad.pdf", "broken.pdf"]
+    assert [c["rank"] for c in ranked] == [1, 2, 3]
+    assert ranked[0]["match_score"] == 0.91
+    assert ranked[0]["analysis"]["success"] is True
+    assert ranked[1]["analysis"] is None
+    assert ranked[2]["error"]
+    assert MockAnalyzer.return_value.analyze_cv.await_count == 1
+
+
+async def test_rank_requires_job_description(client):
+    response = await client.post(
+        "/api/v1/rank",
+        files=[("files", ("cv.pdf", MINIMAL_PDF, "application/pdf"))],
+    )
+    assert response.status_code == 400
+
+
+async def test_match_jobs_extracts_cv_once_and_ranks_jobs(client, fake_embedder):
+    extraction = CVAnalysisResponse(success=True, skills=["Python", "FastAPI"], experience=[])
+
+    with (
+        patch("app.routers.cv_router.CVParser") as MockParser,
+        patch("app.services.cv_ranker.CVAnalyzer") as MockAnalyzer,
+    ):
+        MockParser.return_value.parse_file = AsyncMock(return_value="Python FastAPI backend developer")
+        MockAnalyzer.return_value.analyze_cv = AsyncMock(return_value=extraction)
+        response = await client.post(
+            "/api/v1/match-jobs",
+            files={"file": ("cv.pdf", MINIMAL_PDF, "application/pdf")},
+            data={"job_descriptions": ["Pastry chef", "Python FastAPI backend developer", "Truck driver"]},
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert MockAnalyzer.return_value.analyze_cv.await_count == 1
+    assert body["cv_analysis"]["skills"] == ["Python", "FastAPI"]
+    assert [j["job_id"] for j in body["jobs"]][0] == "job-2"
+    scores = [j["match_score"] for j in body["jobs"]]
+    assert scores == sorted(scores, reverse=True)
+    assert set(body["jobs"][0]["semantic_breakdown"]) == {"skills_similarity", "experience_similarity", "overall_similarity"}
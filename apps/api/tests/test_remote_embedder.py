@@ -0,0 +1,114 @@
+"""Tests for the batched, retrying remote embedding provider against a local stand-in API."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import remote_embedder
+from app.services.remote_embedder import RemoteEmbedder, RemoteEmbeddingError, estimate_tokens
+
+
+class StandinEmbeddingsAPI:
+    """OpenAI-style POST /v1/embeddings; fails the first requests with the queued status codes."""
+
+    def __init__(self, failures=(), delay_s=0.0):
+        self.failures = list(failures)
+        self.delay_s = delay_s
+        self.batches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        lock = threading.Lock()
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with lock:
+                    status = api.failures.pop(0) if api.failures else 200
+                    api.in_flight += 1
+                    api.max_in_flight = max(api.max_in_flight, api.in_flight)
+                time.sleep(api.delay_s)
+                with lock:
+                    api.in_flight -= 1
+                if status != 200:
+                    payload = b'{"error": "busy"}'
+                    self.send_response(status)
+                    self.send_header("Retry-After", "0")
+                else:
+                    api.batches.append(body["input"])
+                    data = [{"index": i, "embedding": [float(len(t)), 1.0]} for i, t in enumerate(body["input"])]
+                    payload = json.dumps({"data": list(reversed(data))}).encode()
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _client(api, **kwargs):
+    kwargs.setdefault("backoff_s", 0.001)
+    return RemoteEmbedder(api.base_url, "sk-test", "text-embedding-3-small", **kwargs)
+
+
+def test_inputs_are_batched_and_order_is_preserved():
+    texts = [f"text {'x' * i}" for i in range(10)]
+    with StandinEmbeddingsAPI() as api:
+        vectors = _client(api, batch_inputs=4).embed_documents(texts)
+    assert sorted(len(b) for b in api.batches) == [2, 4, 4]
+    assert [v[0] for v in vectors] == [float(len(t)) for t in texts]
+
+
+def test_batches_run_concurrently_within_the_token_cap():
+    texts = ["word " * 40] * 8
+    per_batch = 2 * estimate_tokens(texts[0])
+    with StandinEmbeddingsAPI(delay_s=0.05) as api:
+        _client(api, batch_inputs=2, concurrency=4).embed_documents(texts)
+        assert api.max_in_flight >= 2
+    with StandinEmbeddingsAPI(delay_s=0.05) as api:
+        _client(api, batch_inputs=2, concurrency=4, max_inflight_tokens=per_batch).embed_documents(texts)
+        assert api.max_in_flight == 1
+
+
+def test_retries_429_and_5xx_then_succeeds():
+    retried = remote_embedder._RETRIES.value(reason="429")
+    with StandinEmbeddingsAPI(failures=[429, 503]) as api:
+        assert _client(api).embed_query("python") == [6.0, 1.0]
+    assert remote_embedder._RETRIES.value(reason="429") == retried + 1
+
+
+def test_gives_up_after_max_retries_and_does_not_retry_client_errors():
+    with StandinEmbeddingsAPI(failures=[500, 500, 500]) as api:
+        with pytest.raises(RemoteEmbeddingError, match="after 3 attempts"):
+            _client(api, max_retries=2).embed_query("python")
+    with StandinEmbeddingsAPI(failures=[401]) as api:
+        with pytest.raises(RemoteEmbeddingError, match="401"):
+            _client(api).embed_query("python")
+        assert api.failures == []
+
+
+def test_backoff_is_jittered_and_bounded():
+    emb = RemoteEmbedder("http://localhost", "", "m", backoff_s=1.0, max_backoff_s=5.0)
+    delays = {round(emb._backoff(10, None), 6) for _ in range(20)}
+    assert len(delays) > 1 and all(0 <= d <= 5.0 for d in delays)
+    assert emb._backoff(0, "2") == 2.0
@@ -0,0 +1,81 @@
+"""Tests for on-demand request profiling and the admin profile endpoints."""
+import asyncio
+import pstats
+import time
+
+import pytest
+
+from app.config import settings
+from app.services import cv_parser
+from tests.test_analyze import MINIMAL_PDF
+from tests.test_lite_analysis import CV_UK
+
+ADMIN = {"X-Admin-Token": "secret"}
+
+
+def _slow_parse(_path):
+    time.sleep(0.1)
+    return CV_UK
+
+
+@pytest.fixture
+def profiling(monkeypatch, tmp_path, fake_embedder):
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "profile_sample_interval_ms", 1.0)
+    monkeypatch.setattr(settings, "profile_max_concurrent", 1)
+    monkeypatch.setattr(cv_parser.CVParser, "_parse_pdf_sync", staticmethod(_slow_parse))
+    return tmp_path
+
+
+async def _analyze(client, headers=None, params=None):
+    return await client.post(
+        "/api/v1/analyze",
+        files={"file": ("cv.pdf", MINIMAL_PDF, "application/pdf")},
+        data={"analysis_mode": "lite"},
+        headers=headers,
+        params=params,
+    )
+
+
+@pytest.mark.asyncio
+async def test_unflagged_requests_are_not_profiled_and_flag_needs_admin(client, profiling):
+    response = await _analyze(client)
+    assert response.status_code == 200 and "x-profile-id" not in response.headers
+    assert (await _analyze(client, params={"profile": "sample"})).status_code == 403
+    assert (await _analyze(client, headers={**ADMIN, "X-Profile": "perf"})).status_code == 400
+    assert list(profiling.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_sampled_profile_covers_worker_threads(client, profiling):
+    response = await _analyze(client, headers=ADMIN, params={"profile": "sample"})
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+
+    listed = (await client.get("/api/v1/admin/profiles", headers=ADMIN)).json()
+    assert [(p["id"], p["mode"]) for p in listed] == [(profile_id, "sample")]
+    collapsed = (await client.get(f"/api/v1/admin/profiles/{profile_id}", headers=ADMIN)).text
+    assert "test_request_profiler._slow_parse" in collapsed
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed.splitlines())
+
+
+@pytest.mark.asyncio
+async def test_cprofile_profile_is_a_pstats_file(client, profiling):
+    response = await _analyze(client, headers={**ADMIN, "X-Profile": "cprofile"})
+    profile_id = response.headers["x-profile-id"]
+    download = await client.get(f"/api/v1/admin/profiles/{profile_id}", headers=ADMIN)
+    assert download.status_code == 200
+    path = profiling / f"{profile_id}.pstats"
+    functions = {name for _file, _line, name in pstats.Stats(str(path)).stats}
+    assert "analyze_cv" in functions
+    assert (await client.get("/api/v1/admin/profiles/" + "0" * 32, headers=ADMIN)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_concurrent_profiling_is_limited(client, profiling):
+    responses = await asyncio.gather(
+        *(_analyze(client, headers={**ADMIN, "X-Profile": "sample"}) for _ in range(3))
+    )
+    assert sorted(r.status_code for r in responses) == [200, 429, 429]
+    assert len(list(profiling.iterdir())) == 1
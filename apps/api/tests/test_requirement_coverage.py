@@ -0,0 +1,59 @@
+"""Tests for per-requirement coverage and the no-LLM competencies fallback."""
+from app.config import settings
+from app.models import ExperienceItem
+from app.services.cv_analyzer import CVAnalysisOutput, _build_success_response
+from app.services.requirement_coverage import compute_requirement_coverage, split_requirement_lines
+
+JOB = """Вимоги:
+- Python backend development
+• PostgreSQL database design
+3) Kubernetes cluster operations
+Досвід з Python backend development; знання англійської мови"""
+
+
+def test_requirement_lines_are_split_cleaned_and_deduped():
+    assert split_requirement_lines(JOB) == [
+        "Python backend development",
+        "PostgreSQL database design",
+        "Kubernetes cluster operations",
+        "Досвід з Python backend development",
+        "знання англійської мови",
+    ]
+    assert len(split_requirement_lines(JOB, max_lines=2)) == 2
+
+
+def test_coverage_statuses_and_best_matches(fake_embedder, monkeypatch):
+    monkeypatch.setattr(settings, "coverage_match_threshold", 0.9)
+    monkeypatch.setattr(settings, "coverage_partial_threshold", 0.3)
+    coverage = compute_requirement_coverage(
+        JOB, ["Python backend development", "PostgreSQL"], ["Backend Developer — Acme — 2020-2024"]
+    )
+    by_req = {i.requirement: i for i in coverage.items}
+    assert by_req["Python backend development"].status == "covered"
+    assert by_req["Python backend development"].best_match == "Python backend development"
+    assert by_req["PostgreSQL database design"].status == "partial"
+    assert by_req["Kubernetes cluster operations"].status == "missing"
+    assert by_req["Kubernetes cluster operations"].best_match is None
+    assert "Kubernetes cluster operations" in coverage.missing
+    assert coverage.matched == ["Python backend development"]
+
+
+def test_fills_competencies_when_llm_left_them_empty(fake_embedder, monkeypatch):
+    monkeypatch.setattr(settings, "use_semantic_matching", False)
+    monkeypatch.setattr(settings, "coverage_match_threshold", 0.9)
+    result = CVAnalysisOutput(
+        skills=["Python backend development"],
+        experience=[ExperienceItem(employer="Acme", title="Backend Developer")],
+        recommendations=["Додайте метрики"],
+        matched_competencies=[],
+        missing_competencies=[],
+    )
+    resp, _ = _build_success_response("CV text", result, JOB)
+    assert resp.matched_competencies == ["Python backend development"]
+    assert "Kubernetes cluster operations" in resp.missing_competencies
+    assert len(resp.requirement_coverage) == 5
+
+    llm = result.model_copy(update={"matched_competencies": ["Python"], "missing_competencies": []})
+    resp, _ = _build_success_response("CV text", llm, JOB)
+    assert resp.matched_competencies == ["Python"]
+    assert resp.missing_competencies == []
@@ -0,0 +1,80 @@
+"""Tests for token-window embeddings and window pooling in semantic_matcher."""
+import pytest
+
+from app.config import settings
+from app.services import semantic_matcher
+from app.services.semantic_matcher import _windows_from_offsets, compute_semantic_match, embed_windows
+from tests.conftest import _hashed_bag_of_words
+
+NOISE = " ".join(f"filler{i}" for i in range(60))
+JOB = "python fastapi backend"
+
+
+def _word_offsets(text):
+    offsets, pos = [], 0
+    for word in text.split():
+        start = text.index(word, pos)
+        offsets.append((start, start + len(word)))
+        pos = start + len(word)
+    return offsets
+
+
+@pytest.fixture
+def windowed_embedder(monkeypatch):
+    """Fake embedder with a whitespace "tokenizer" and 5-token windows; counts batch calls."""
+    calls = []
+
+    def batch(texts):
+        calls.append(list(texts))
+        return [_hashed_bag_of_words(t) for t in texts]
+
+    def split(text):
+        return _windows_from_offsets(text, _word_offsets(text), 5)
+
+    emb = semantic_matcher._Embedder(_hashed_bag_of_words, 64, batch, split)
+    monkeypatch.setattr(semantic_matcher, "_embedder", emb)
+    monkeypatch.setattr(semantic_matcher, "_window_cache", semantic_matcher.OrderedDict())
+    monkeypatch.setattr(settings, "embedding_window_tokens", 0)
+    monkeypatch.setattr(settings, "embedding_window_overlap_tokens", 1)
+    monkeypatch.setattr(settings, "embedding_max_windows", 32)
+    return calls
+
+
+def test_windows_overlap_and_are_capped(monkeypatch):
+    text = " ".join(f"w{i}" for i in range(20))
+    monkeypatch.setattr(settings, "embedding_window_overlap_tokens", 1)
+    monkeypatch.setattr(settings, "embedding_max_windows", 32)
+    windows = _windows_from_offsets(text, _word_offsets(text), 5)
+    assert windows[0] == "w0 w1 w2 w3 w4"
+    assert windows[1].startswith("w4 ")
+    assert windows[-1].endswith("w19")
+
+    monkeypatch.setattr(settings, "embedding_max_windows", 2)
+    assert len(_windows_from_offsets(text, _word_offsets(text), 5)) == 2
+    assert _windows_from_offsets("a b", _word_offsets("a b"), 5) == ["a b"]
+
+
+def test_all_block_windows_are_encoded_in_one_batch_and_cached(windowed_embedder):
+    cv_full = f"{NOISE} {JOB}"
+    compute_semantic_match(["Python"], "Backend developer", cv_full, JOB, JOB)
+    assert len(windowed_embedder) == 1
+    mats = embed_windows([cv_full], [12000])
+    assert len(mats[0]) > 10
+    assert len(windowed_embedder) == 1
+
+
+def test_tail_of_long_cv_counts_and_attention_focuses_on_it(windowed_embedder, monkeypatch):
+    cv_full = f"{NOISE} {JOB}"
+    scores = {}
+    for pooling in ("mean", "max", "attention"):
+        monkeypatch.setattr(settings, "embedding_pooling", pooling)
+        scores[pooling] = compute_semantic_match([], "", cv_full, JOB, JOB).overall_similarity
+    assert scores["attention"] > scores["mean"]
+    assert scores["attention"] == pytest.approx(1.0, abs=0.05)
+
+    # With windowing off the block is one (truncated) text, as before.
+    monkeypatch.setattr(settings, "embedding_window_tokens", -1)
+    monkeypatch.setattr(settings, "embedding_pooling", "attention")
+    single = compute_semantic_match([], "", cv_full, JOB, JOB).overall_similarity
+    expected = semantic_matcher._cosine_similarity(_hashed_bag_of_words(cv_full), _hashed_bag_of_words(JOB))
+    assert single == pytest.approx(expected, abs=1e-5)
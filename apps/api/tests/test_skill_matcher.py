@@ -0,0 +1,85 @@
+"""Tests for the Aho-Corasick skill taxonomy matcher."""
+import json
+import time
+
+import pytest
+
+from app.config import settings
+from app.services import cv_ranker
+from app.services.cv_analyzer import CVAnalysisOutput, CVAnalyzer
+from app.services.cv_ranker import RankCandidate
+from app.utils import skill_matcher
+from app.utils.skill_matcher import SkillMatcher, load_taxonomy
+
+
+@pytest.fixture
+def matcher():
+    return SkillMatcher(load_taxonomy(""))
+
+
+def test_aliases_map_to_canonical_names(matcher):
+    text = "Стек: JS, ReactJS, Postgres, k8s; досвід з докер та машинне навчання. Англійська B2."
+    assert matcher.extract(text) == [
+        "JavaScript",
+        "React",
+        "PostgreSQL",
+        "Kubernetes",
+        "Docker",
+        "Machine Learning",
+        "English",
+    ]
+
+
+def test_word_boundaries_and_symbols(matcher):
+    assert matcher.extract("JavaScript and Java, C++ / C#") == ["JavaScript", "Java", "C++", "C#"]
+    assert matcher.extract("Javanese pythonic scalable") == []
+
+
+def test_short_forms_are_case_sensitive(matcher):
+    assert "Go" not in matcher.extract("ready to go abroad")
+    assert matcher.extract("Go, R and ML") == ["Go", "R", "Machine Learning"]
+
+
+def test_leftmost_longest_match_wins(matcher):
+    mentions = matcher.find("React Native and Spring Boot")
+    assert [m.skill for m in mentions] == ["React Native", "Spring Boot"]
+    assert mentions[0].text == "React Native"
+
+
+def test_taxonomy_file_extends_defaults(tmp_path, monkeypatch):
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps({"Odoo": ["OpenERP"], "Python": ["py"]}), encoding="utf-8")
+    monkeypatch.setattr(settings, "skill_taxonomy_path", str(path))
+    monkeypatch.setattr(skill_matcher, "_matcher", None)
+    assert skill_matcher.extract_skills("OpenERP modules in py, Docker") == ["Odoo", "Python", "Docker"]
+
+
+def test_large_taxonomy_is_one_linear_pass():
+    taxonomy = {f"Skill{i}": [f"alias number {i}"] for i in range(10_000)}
+    big = SkillMatcher(taxonomy)
+    text = " ".join(f"word{i} alias number {i} filler" for i in range(0, 10_000, 7)) * 2
+    started = time.monotonic()
+    found = big.extract(text)
+    assert len(found) == len(range(0, 10_000, 7))
+    assert time.monotonic() - started < 2
+
+
+async def test_empty_llm_skills_are_filled_from_the_dictionary(monkeypatch):
+    monkeypatch.setattr(settings, "use_llm_semantic_narrative", False)
+    output = CVAnalysisOutput(skills=[], recommendations=["Додайте проєкти."])
+    resp = await CVAnalyzer()._finish_success("Python, FastAPI, Docker", "", output, None, raw_llm=None)
+    assert resp.skills == ["Python", "FastAPI", "Docker"]
+
+
+async def test_ranking_uses_dictionary_skills(fake_embedder, monkeypatch):
+    seen = []
+    original = cv_ranker.semantic_match_matrix
+
+    def spy(blocks, jobs):
+        seen.extend(b.skills for b in blocks)
+        return original(blocks, jobs)
+
+    monkeypatch.setattr(cv_ranker, "semantic_match_matrix", spy)
+    candidate = RankCandidate(candidate_id="a", cv_text="Senior engineer: Golang, Kafka")
+    await cv_ranker.rank_candidates([candidate], "Go developer")
+    assert seen == [["Go", "Kafka"]]
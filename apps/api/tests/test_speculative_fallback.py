@@ -0,0 +1,120 @@
+"""Tests for racing the structured Ollama call against the raw-JSON fallback."""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.services import admission as admission_module
+from app.services import cv_analyzer
+from app.services.admission import AdmissionLimiter
+from app.services.cv_analyzer import (
+    CVAnalysisOutput,
+    CVAnalyzer,
+    _ollama_model_class,
+    _speculate_raw_json,
+)
+
+GOOD = CVAnalysisOutput(skills=["Python"], recommendations=["Додайте метрики"])
+EMPTY = CVAnalysisOutput(skills=[], recommendations=["Додайте метрики"])
+
+
+def test_model_classes_and_speculation_modes(monkeypatch):
+    assert _ollama_model_class("llama3.2:3b") == "small"
+    assert _ollama_model_class("llama3:8b") == "llama3_8b"
+    assert _ollama_model_class("qwen2.5:14b") == "other"
+
+    monkeypatch.setattr(settings, "ollama_speculative_fallback", "auto")
+    monkeypatch.setattr(settings, "ollama_speculative_skip_models", ["llama3:8b"])
+    assert _speculate_raw_json("llama3.2:3b")
+    assert not _speculate_raw_json("llama3:8b")
+    assert not _speculate_raw_json("qwen2.5:14b")
+
+    monkeypatch.setattr(settings, "ollama_speculative_fallback", "always")
+    assert _speculate_raw_json("qwen2.5:14b")
+    monkeypatch.setattr(settings, "ollama_speculative_fallback", "off")
+    assert not _speculate_raw_json("llama3.2:3b")
+
+
+def _analyzer(monkeypatch, structured, raw):
+    """Analyzer whose streamed structured call and raw-JSON call (unless None) are replaced by (delay, result) fakes."""
+    calls = {"structured": 0, "raw_json": 0, "cancelled": []}
+
+    def fake(name, delay, result):
+        async def call(self, *args, **kwargs):
+            calls[name] += 1
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                calls["cancelled"].append(name)
+                raise
+            return result
+
+        return call
+
+    monkeypatch.setattr(settings, "ollama_stream_extraction", True)
+    monkeypatch.setattr(settings, "ollama_speculative_fallback", "auto")
+    monkeypatch.setattr(settings, "ollama_speculative_skip_models", [])
+    monkeypatch.setattr(CVAnalyzer, "_stream_structured_extraction", fake("structured", *structured))
+    if raw is not None:
+        monkeypatch.setattr(CVAnalyzer, "_ollama_raw_json_fallback", fake("raw_json", *raw))
+    analyzer = CVAnalyzer()
+    analyzer._llm_stage = "ollama"
+    return analyzer, calls
+
+
+async def _extract(analyzer, model):
+    return await analyzer._extract_structured(
+        "CV", "", None, SimpleNamespace(model=model), ollama_json_fallback=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_raw_json_wins_race_and_structured_is_cancelled(monkeypatch):
+    analyzer, calls = _analyzer(monkeypatch, structured=(5, GOOD), raw=(0.01, GOOD))
+    won = cv_analyzer._EXTRACTION_PATH.value(model="llama3.2:3b", mode="speculative", path="raw_json")
+
+    started = time.monotonic()
+    result = await _extract(analyzer, "llama3.2:3b")
+
+    assert result.skills == ["Python"]
+    assert time.monotonic() - started < 1
+    assert calls["cancelled"] == ["structured"]
+    assert cv_analyzer._EXTRACTION_PATH.value(model="llama3.2:3b", mode="speculative", path="raw_json") == won + 1
+
+
+@pytest.mark.asyncio
+async def test_empty_structured_result_does_not_win(monkeypatch):
+    analyzer, calls = _analyzer(monkeypatch, structured=(0, EMPTY), raw=(0.05, GOOD))
+    result = await _extract(analyzer, "llama3:8b")
+    assert result.skills == ["Python"]
+    assert calls["cancelled"] == []
+
+
+@pytest.mark.asyncio
+async def test_reliable_model_stays_sequential(monkeypatch):
+    analyzer, calls = _analyzer(monkeypatch, structured=(0, GOOD), raw=(0, GOOD))
+    result = await _extract(analyzer, "qwen2.5:14b")
+    assert result.skills == ["Python"]
+    assert (calls["structured"], calls["raw_json"]) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_race_shares_one_admission_slot(monkeypatch):
+    analyzer, calls = _analyzer(monkeypatch, structured=(5, GOOD), raw=None)
+    limiter = AdmissionLimiter("ollama", max_concurrency=1, max_waiting=0, wait_timeout_s=0.01)
+    monkeypatch.setitem(admission_module._limiters, "ollama", limiter)
+    peak = 0
+
+    async def ainvoke(_messages):
+        nonlocal peak
+        peak = max(peak, limiter.active)
+        return SimpleNamespace(content='{"skills": ["Python"], "recommendations": ["Додайте метрики"]}')
+
+    raw_llm = SimpleNamespace(model="llama3.2:3b", ainvoke=ainvoke)
+    result = await analyzer._extract_structured("CV", "", None, raw_llm, ollama_json_fallback=True)
+
+    assert result.skills == ["Python"]
+    assert calls["cancelled"] == ["structured"]
+    assert peak == 1 and limiter.active == 0
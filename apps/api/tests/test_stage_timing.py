@@ -0,0 +1,72 @@
+"""Tests for per-stage timing (Server-Timing header and stage histograms)."""
+import asyncio
+import re
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.utils import stage_metrics
+from app.utils.stage_metrics import RequestStages, set_stage_labels, stage
+from tests.test_analyze import MINIMAL_PDF
+from tests.test_lite_analysis import CV_UK
+
+
+async def test_stages_reach_the_request_record_from_worker_threads():
+    record = RequestStages()
+    token = stage_metrics._current.set(record)
+    try:
+
+        def work():
+            with stage("embeddings"):
+                time.sleep(0.01)
+
+        await asyncio.gather(asyncio.to_thread(work), asyncio.to_thread(work))
+        with stage("parse"):
+            pass
+        set_stage_labels(backend="Ollama", model="qwen2.5:7b")
+    finally:
+        stage_metrics._current.reset(token)
+
+    totals = record.totals()
+    assert list(totals) == ["embeddings", "parse"]
+    assert totals["embeddings"] >= 0.02
+    assert record.labels == {"backend": "ollama", "model": "qwen2.5:7b"}
+    assert re.fullmatch(r"embeddings;dur=[\d.]+, parse;dur=[\d.]+, total;dur=[\d.]+", record.server_timing())
+
+
+def test_stage_outside_a_request_is_observed_immediately():
+    before = stage_metrics.STAGE_SECONDS.count(stage="standalone", backend="", model="")
+    with stage("standalone"):
+        pass
+    assert stage_metrics.STAGE_SECONDS.count(stage="standalone", backend="", model="") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_analyze_reports_server_timing_and_metrics(client, fake_embedder):
+    with patch("app.routers.cv_router.CVParser") as MockParser:
+        MockParser.return_value.parse_file = AsyncMock(return_value=CV_UK)
+        response = await client.post(
+            "/api/v1/analyze",
+            files={"file": ("cv.pdf", MINIMAL_PDF, "application/pdf")},
+            data={"analysis_mode": "lite", "job_description": "Python FastAPI developer"},
+        )
+    assert response.status_code == 200
+    names = [part.split(";")[0] for part in response.headers["server-timing"].split(", ")]
+    assert names == ["validate", "parse", "lite_extraction", "embeddings", "total"]
+
+    metrics = (await client.get("/metrics")).text
+    assert 'cv_stage_duration_seconds_count{stage="parse",backend="lite",model="rules"}' in metrics
+    assert 'cv_request_duration_seconds_count{path="/api/v1/analyze",backend="lite",model="rules"}' in metrics
+    assert "server-timing" not in (await client.get("/health")).headers
+
+
+@pytest.mark.asyncio
+async def test_request_metrics_are_labelled_by_route_template(client):
+    assert (await client.get("/api/v1/analyses/3f2a9c")).status_code == 404
+    assert (await client.get("/api/v1/no-such-endpoint")).status_code == 404
+
+    metrics = (await client.get("/metrics")).text
+    assert 'cv_request_duration_seconds_count{path="/api/v1/analyses/{job_id}",backend="",model=""}' in metrics
+    assert 'cv_request_duration_seconds_count{path="unmatched",backend="",model=""}' in metrics
+    assert "3f2a9c" not in metrics and "no-such-endpoint" not in metrics
@@ -0,0 +1,159 @@
+"""Tests for the stand-in Ollama / Gemini server used by load tests (benchmarks/standin_llm_server.py)."""
+import json
+
+import httpx
+import pytest
+
+from app.services.cv_analyzer import CVAnalysisOutput
+from benchmarks.standin_llm_server import StandinConfig, StandinLLMServer, _fill_schema, parse_latency
+
+CV_TEXT = "Іван Петренко\nPython developer\nНавички: Python, FastAPI, PostgreSQL\nДосвід: Acme, 2021-2024"
+GEMINI_PATH = "/v1beta/models/gemini-standin"
+
+
+def _chat(server, stream=True, fmt="json", timeout=5.0):
+    body = {"model": "standin:7b", "messages": [{"role": "user", "content": CV_TEXT}], "stream": stream, "format": fmt}
+    return httpx.post(f"{server.base_url}/api/chat", json=body, timeout=timeout)
+
+
+def _ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines() if line.strip()]
+
+
+def _sse(response):
+    return [json.loads(event[len("data: ") :]) for event in response.text.split("\r\n\r\n") if event.startswith("data: ")]
+
+
+def _gemini_body(**extra):
+    return {"contents": [{"role": "user", "parts": [{"text": CV_TEXT}]}], **extra}
+
+
+def test_parse_latency_rejects_bad_specs():
+    assert parse_latency("fixed:0.5") == ("fixed", (0.5,))
+    assert parse_latency("lognormal:1.0,0.4") == ("lognormal", (1.0, 0.4))
+    for spec in ("fixed", "uniform:1", "gamma:1,2"):
+        with pytest.raises(ValueError):
+            parse_latency(spec)
+
+
+def test_fill_schema_builds_a_valid_minimal_instance():
+    schema = {
+        "type": "object",
+        "properties": {
+            "score": {"type": "number", "minimum": 0, "maximum": 10},
+            "tags": {"type": "array", "items": {"$ref": "#/$defs/Tag"}, "minItems": 2},
+            "note": {"anyOf": [{"type": "null"}, {"type": "string"}]},
+            "optional": {"type": "string"},
+        },
+        "required": ["score", "tags", "note"],
+        "$defs": {"Tag": {"type": "object", "properties": {"name": {"type": "string"}}, "required": ["name"]}},
+    }
+    assert _fill_schema(schema) == {"score": 5.0, "tags": [{"name": "x" * 10}] * 2, "note": "x" * 10}
+
+
+def test_ollama_stream_is_ndjson_ending_with_a_done_chunk():
+    with StandinLLMServer(StandinConfig(stream_chunks=4)) as server:
+        response = _chat(server)
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = _ndjson(response)
+    assert [line["done"] for line in lines] == [False] * (len(lines) - 1) + [True]
+    assert lines[-1]["done_reason"] == "stop" and lines[-1]["message"]["content"] == ""
+    assert all(line["model"] == "standin:7b" for line in lines)
+    content = "".join(line["message"]["content"] for line in lines)
+    CVAnalysisOutput(**json.loads(content))
+
+
+def test_ollama_non_stream_and_narrative_replies():
+    with StandinLLMServer(StandinConfig()) as server:
+        structured = _chat(server, stream=False).json()
+        narrative = _chat(server, stream=False, fmt="").json()
+    assert structured["done"] is True
+    CVAnalysisOutput(**json.loads(structured["message"]["content"]))
+    with pytest.raises(ValueError):
+        json.loads(narrative["message"]["content"])
+
+
+def test_fixed_reply_is_served_and_requests_are_recorded():
+    reply = {"skills": ["Python"]}
+    with StandinLLMServer(StandinConfig(reply=reply)) as server:
+        content = _chat(server, stream=False).json()["message"]["content"]
+    assert json.loads(content) == reply
+    assert [r["model"] for r in server.requests] == ["standin:7b"]
+
+
+def test_empty_failure_streams_no_content():
+    with StandinLLMServer(StandinConfig(fail_empty=1.0)) as server:
+        lines = _ndjson(_chat(server))
+    assert "".join(line["message"]["content"] for line in lines) == ""
+    assert lines[-1]["done"] is True
+    assert server.stats.by_outcome == {"empty": 1}
+
+
+def test_malformed_failure_is_invalid_json():
+    with StandinLLMServer(StandinConfig(fail_malformed=1.0)) as server:
+        content = _chat(server, stream=False).json()["message"]["content"]
+    assert content.endswith(' "oops')
+    with pytest.raises(ValueError):
+        json.loads(content)
+    assert server.stats.by_outcome == {"malformed": 1}
+
+
+def test_error_failure_returns_500():
+    with StandinLLMServer(StandinConfig(fail_error=1.0)) as server:
+        response = _chat(server)
+    assert response.status_code == 500
+    assert response.json() == {"error": "injected failure"}
+
+
+def test_timeout_failure_hangs_past_the_client_timeout():
+    with StandinLLMServer(StandinConfig(fail_timeout=1.0, timeout_hang_s=1.0)) as server:
+        with pytest.raises(httpx.TimeoutException):
+            _chat(server, timeout=0.2)
+    assert server.stats.by_outcome == {"timeout": 1}
+
+
+def test_failures_are_drawn_by_probability():
+    config = StandinConfig(fail_empty=0.25, fail_error=0.25, seed=7)
+    server = StandinLLMServer(config)
+    try:
+        outcomes = [server.draw()[1] for _ in range(400)]
+    finally:
+        server._server.server_close()
+    assert set(outcomes) == {"ok", "empty", "error"}
+    assert 60 < outcomes.count("empty") < 140 and 60 < outcomes.count("error") < 140
+
+
+def test_gemini_generate_content_format():
+    schema = {"type": "object", "properties": {"summary": {"type": "string"}}, "required": ["summary"]}
+    with StandinLLMServer(StandinConfig()) as server:
+        body = _gemini_body(generationConfig={"responseMimeType": "application/json", "responseSchema": schema})
+        response = httpx.post(f"{server.base_url}{GEMINI_PATH}:generateContent", json=body, timeout=5.0)
+    data = response.json()
+    candidate = data["candidates"][0]
+    assert candidate["finishReason"] == "STOP" and candidate["content"]["role"] == "model"
+    assert json.loads(candidate["content"]["parts"][0]["text"]) == {"summary": "x" * 10}
+    assert data["usageMetadata"]["totalTokenCount"] == 2
+
+
+def test_gemini_stream_is_sse_with_finish_reason_on_the_last_event():
+    with StandinLLMServer(StandinConfig(stream_chunks=3)) as server:
+        response = httpx.post(f"{server.base_url}{GEMINI_PATH}:streamGenerateContent?alt=sse", json=_gemini_body(), timeout=5.0)
+    assert response.headers["content-type"] == "text/event-stream"
+    events = _sse(response)
+    assert len(events) == 3
+    assert ["finishReason" in e["candidates"][0] for e in events] == [False, False, True]
+    text = "".join(e["candidates"][0]["content"]["parts"][0]["text"] for e in events)
+    assert text and not text.lstrip().startswith("{")
+
+
+def test_gemini_function_declaration_returns_a_function_call():
+    declaration = {
+        "name": "CVAnalysisOutput",
+        "parameters": {"type": "object", "properties": {"recommendations": {"type": "array"}}},
+    }
+    with StandinLLMServer(StandinConfig()) as server:
+        body = _gemini_body(tools=[{"functionDeclarations": [declaration]}])
+        response = httpx.post(f"{server.base_url}{GEMINI_PATH}:generateContent", json=body, timeout=5.0)
+    call = response.json()["candidates"][0]["content"]["parts"][0]["functionCall"]
+    assert call["name"] == "CVAnalysisOutput"
+    CVAnalysisOutput(**call["args"])